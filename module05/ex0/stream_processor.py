@@ -10,11 +10,19 @@ Classes:
     DataProcessor:
         Define the processing interface.
     NumericProcessor:
-        Process a list of numbers (count, sum, average).
+        Process a batch of numbers (count, sum, mean, min, max, variance).
+    TextStats:
+        Count characters, words, lines and bytes of streamed text.
     TextProcessor:
         Process a string (character count, word count).
+    LogClassifier:
+        Classify log lines by level prefix in bulk.
     LogProcessor:
         Process a log line and tag severity (INFO/ERROR).
+    ProcessorRegistry:
+        Resolve processor names to shared instances and run batches.
+    ProcessorRouter:
+        Choose the processor of each input from its type and prefix.
 
 Functions:
     data_processor_foundation:
@@ -25,8 +33,50 @@ Functions:
         Serve as entry point for demo execution.
 """
 
+import array
+import re
+import sys
 from abc import ABC, abstractmethod
-from typing import Any
+from functools import lru_cache
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import (Any, Callable, Dict, Iterable, Iterator, List,
+                    Optional, Sequence, Tuple, Type, Union)
+
+NUMERIC_FORMATS = frozenset("bBhHiIlLqQnNefd")
+NUMERIC_CONTAINERS = (list, tuple, range, set, frozenset, array.array,
+                      memoryview)
+TEXT_CHUNK_SIZE = 1 << 20
+LOG_LEVELS = {
+    "DEBUG": "DEBUG",
+    "INFO": "INFO",
+    "WARNING": "WARNING",
+    "WARN": "WARNING",
+    "ERROR": "ERROR",
+    "CRITICAL": "CRITICAL",
+    "FATAL": "CRITICAL"
+}
+LOG_UNCLASSIFIED = "OTHER"
+LOG_TAGS = {
+    "ERROR": "[ALERT] ERROR level detected",
+    "INFO": "[INFO] INFO level detected"
+}
+_TAGGED_PREFIXES = tuple(prefix for prefix, level in LOG_LEVELS.items()
+                         if level in LOG_TAGS)
+_PREFIX_TAGS = tuple((prefix, LOG_TAGS.get(level)) for prefix, level
+                     in sorted(LOG_LEVELS.items(),
+                               key=lambda item: -len(item[0]))
+                     if prefix.startswith(_TAGGED_PREFIXES))
+
+
+@lru_cache(maxsize=None)
+def _numpy() -> Any:
+    """Return the numpy module, or None when it is not installed."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
 
 
 class DataProcessor(ABC):
@@ -80,30 +130,190 @@ class DataProcessor(ABC):
 
 
 class NumericProcessor(DataProcessor):
-    """Process numeric lists."""
+    """Process numeric batches.
+
+    Lists, tuples, ranges and other sequences are aggregated with
+    C-level builtins (`sum`, `min`, `max`); one-shot iterables such as
+    generators are read once in a single pass that tracks count, sum,
+    min, max and the sum of squares at once. Either way an arithmetic
+    TypeError doubles as validation, so no separate validation loop
+    runs. The variance is computed on values shifted by
+    the first one, which avoids cancellation for large values with a
+    small spread. `array.array`, `memoryview` and NumPy arrays are read
+    in place through the buffer protocol, vectorized with NumPy when it
+    is installed.
+    """
+
+    def summarize(self, data: Any) -> Optional[Dict[str, Union[int, float]]]:
+        """Validate and aggregate a numeric batch in one go.
+
+        Args:
+            data: Iterable of numbers, array.array, memoryview or NumPy
+                array.
+
+        Returns:
+            Dictionary with count, sum, mean, min, max and (population)
+            variance, or None if `data` is not a non-empty batch of
+            numbers.
+        """
+        np = _numpy()
+        if np is not None and isinstance(data, np.ndarray):
+            return self._summarize_array(np, data)
+        if isinstance(data, (memoryview, bytearray, array.array)):
+            view = memoryview(data)
+            if view.format not in NUMERIC_FORMATS or not view.ndim:
+                return None
+            if np is not None:
+                return self._summarize_array(np, np.asarray(view))
+            if view.ndim > 1:
+                if not view.c_contiguous:
+                    return None
+                view = view.cast("B").cast(view.format)
+            data = view
+        if isinstance(data, Sequence):
+            return self._summarize_sequence(data)
+        count = 0
+        total = squares = 0
+        low = high = shift = None
+        try:
+            for value in data:
+                if count:
+                    if value < low:
+                        low = value
+                    elif value > high:
+                        high = value
+                    diff = value - shift
+                    squares += diff * diff
+                else:
+                    low = high = shift = value
+                total += value
+                count += 1
+            if not count:
+                return None
+            offset = (total - shift * count) / count
+            variance = max(0.0, squares / count - offset * offset)
+        except TypeError:
+            return None
+        return {
+            "count": count,
+            "sum": total,
+            "mean": total / count,
+            "min": low,
+            "max": high,
+            "variance": variance
+        }
+
+    @staticmethod
+    def _summarize_sequence(data: Sequence[Any]
+                            ) -> Optional[Dict[str, Union[int, float]]]:
+        """Aggregate a sequence with C-level builtin reductions.
+
+        Args:
+            data: Sequence supporting `len`, e.g. a list or a memoryview.
+
+        Returns:
+            The same dictionary as `summarize`, or None.
+        """
+        count = len(data)
+        if not count:
+            return None
+        try:
+            total = sum(data)
+            low, high = min(data), max(data)
+            shift = data[0]
+            squares = 0
+            for value in data:
+                diff = value - shift
+                squares += diff * diff
+            offset = (total - shift * count) / count
+            variance = max(0.0, squares / count - offset * offset)
+        except TypeError:
+            return None
+        return {
+            "count": count,
+            "sum": total,
+            "mean": total / count,
+            "min": low,
+            "max": high,
+            "variance": variance
+        }
+
+    @staticmethod
+    def _summarize_array(np: Any, data: Any
+                         ) -> Optional[Dict[str, Union[int, float]]]:
+        """Aggregate a NumPy array with vectorized reductions.
+
+        Args:
+            np: The numpy module.
+            data: Array to aggregate, without copying.
+
+        Returns:
+            The same dictionary as `summarize`, or None.
+        """
+        if data.dtype.kind not in "biuf" or not data.size:
+            return None
+        total = data.sum()
+        return {
+            "count": int(data.size),
+            "sum": total.item(),
+            "mean": total.item() / data.size,
+            "min": data.min().item(),
+            "max": data.max().item(),
+            "variance": float(data.var())
+        }
 
     def process(self, data: Any) -> str:
         """Process the data and return the result string.
 
         Args:
-            data: A list of numbers.
+            data: A batch of numbers.
 
         Returns:
             (str) The result string including...
             - The number of processed numeric values
             - Sum of the numbers
             - Average of the numbers
-            If `data` is not a list of numbers, return an error message.
+            If `data` is not a batch of numbers, return an error message.
         """
-        if not self.validate(data):
+        totals = self._totals(data)
+        if totals is None:
             return "[ERROR] Validation failed: expected a list of numbers"
-        total = sum(data)
-        length = len(data)
-        average = total / length
-        return f"{length} numeric values, sum={total}, avg={average:.1f}"
+        count, total = totals
+        return (f"{count} numeric values, sum={total}, "
+                f"avg={total / count:.1f}")
+
+    def _totals(self, data: Any) -> Optional[Tuple[int, Union[int, float]]]:
+        """Return the count and sum of a batch, the only figures reported.
+
+        Sequences use C-level `len` and `sum`; as in `summarize`, complex
+        numbers are rejected since they have no order. Buffers and
+        one-shot iterables go through `summarize`.
+
+        Args:
+            data: A batch of numbers.
+
+        Returns:
+            Count and sum, or None if `data` is not a non-empty batch of
+            numbers.
+        """
+        if isinstance(data, Sequence) and not isinstance(data, memoryview):
+            count = len(data)
+            if not count:
+                return None
+            try:
+                total = sum(data)
+            except TypeError:
+                return None
+            if isinstance(total, complex):
+                return None
+            return count, total
+        summary = self.summarize(data)
+        if summary is None:
+            return None
+        return summary["count"], summary["sum"]
 
     def validate(self, data: Any) -> bool:
-        """Check whether `data` is numeric.
+        """Check whether `data` is a non-empty batch of numbers.
 
         Args:
             data: Any input to be processed.
@@ -111,26 +321,124 @@ class NumericProcessor(DataProcessor):
         Returns:
             Return True if `data` is numeric, otherwise False.
         """
-        try:
-            total = 0
-            length = 0
-            for i in data:
-                total += i
-                length += 1
-            if length == 0:
-                return False
-            return True
-        except TypeError:
-            return False
+        return self._totals(data) is not None
 
     def format_output(self, result: str) -> str:
         """Use the base formatting rule for numeric results."""
         return super().format_output(result)
 
 
+class TextStats:
+    """Count characters, words, lines and bytes of streamed text.
+
+    Every chunk is measured with C-level string methods (`len`, `count`,
+    `split`). A word split across two chunks is counted once: the first
+    word of a chunk continues the previous one when neither side of the
+    edge is whitespace.
+
+    Attributes:
+        chars: Number of characters.
+        words: Number of whitespace-separated words.
+        newlines: Number of newline characters.
+        bytes: Size of the text encoded as UTF-8.
+    """
+
+    __slots__ = ("chars", "words", "newlines", "bytes", "_in_word",
+                 "_open_line")
+
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        self.chars = 0
+        self.words = 0
+        self.newlines = 0
+        self.bytes = 0
+        self._in_word = False
+        self._open_line = False
+
+    @property
+    def lines(self) -> int:
+        """Return the number of lines, counting an unterminated last one."""
+        return self.newlines + self._open_line
+
+    def update(self, chunk: str) -> "TextStats":
+        """Add the next chunk of text.
+
+        Args:
+            chunk: Text following the previous chunk.
+
+        Returns:
+            The statistics themselves.
+        """
+        if not chunk:
+            return self
+        self.chars += len(chunk)
+        self.bytes += (len(chunk) if chunk.isascii()
+                       else len(chunk.encode("utf-8", "surrogatepass")))
+        self.newlines += chunk.count("\n")
+        words = len(chunk.split())
+        if words and self._in_word and not chunk[0].isspace():
+            words -= 1
+        self.words += words
+        self._in_word = not chunk[-1].isspace()
+        self._open_line = chunk[-1] != "\n"
+        return self
+
+    def as_dict(self) -> Dict[str, int]:
+        """Return chars, words, lines and bytes as a dictionary."""
+        return {
+            "chars": self.chars,
+            "words": self.words,
+            "lines": self.lines,
+            "bytes": self.bytes
+        }
+
+
 class TextProcessor(DataProcessor):
     """Process plain text strings."""
 
+    def summarize(self, data: Any) -> Optional[Dict[str, int]]:
+        """Count characters, words, lines and bytes of a string.
+
+        Args:
+            data: A string.
+
+        Returns:
+            Dictionary of counts, or None if `data` is not a string.
+        """
+        if not self.validate(data):
+            return None
+        return TextStats().update(data).as_dict()
+
+    def summarize_stream(self, chunks: Iterable[str]) -> Dict[str, int]:
+        """Count text delivered in chunks of any size.
+
+        Args:
+            chunks: Consecutive pieces of one text.
+
+        Returns:
+            Dictionary of counts.
+        """
+        stats = TextStats()
+        for chunk in chunks:
+            stats.update(chunk)
+        return stats.as_dict()
+
+    def summarize_file(self, path: str, encoding: str = "utf-8",
+                       chunk_size: int = TEXT_CHUNK_SIZE) -> Dict[str, int]:
+        """Count a text file in bounded memory.
+
+        Args:
+            path: File to read.
+            encoding: Text encoding of the file.
+            chunk_size: Characters read at a time.
+
+        Returns:
+            Dictionary of counts.
+        """
+        with open(path, "r", encoding=encoding, newline="") as f:
+            return self.summarize_stream(iter(lambda: f.read(chunk_size),
+                                              ""))
+
     def process(self, data: Any) -> str:
         """Process the data and return the result string.
 
@@ -143,43 +451,185 @@ class TextProcessor(DataProcessor):
             - The number of words
             If `data` is not a string, return an error message.
         """
-        if not self.validate(data):
+        summary = self.summarize(data)
+        if summary is None:
             return "[ERROR] Validation failed: expected a string"
-        total = 0
-        words = 0
-        countable = True
-        for i in data:
-            total += 1
-            if i == " ":
-                countable = True
-            elif countable:
-                words += 1
-                countable = False
-        return f"text: {total} characters, {words} words"
+        return (f"text: {summary['chars']} characters, "
+                f"{summary['words']} words")
 
     def validate(self, data: Any) -> bool:
-        """Validate that input behaves like a string.
+        """Validate that input is a string.
 
         Args:
             data: Any value.
 
         Returns:
-            Return True if `data` can be concatenated with a string,
-            otherwise False.
+            Return True if `data` is a string, otherwise False.
         """
-        try:
-            _ = data + "a"
-            return True
-        except TypeError:
-            return False
+        return isinstance(data, str)
 
     def format_output(self, result: str) -> str:
         """Use the base formatting rule for text results."""
         return super().format_output(result)
 
 
+class LogClassifier:
+    """Classify log lines by level prefix in bulk.
+
+    Every level prefix, custom ones first, is compiled into a single regex
+    alternation, so a line is classified by one anchored match whatever
+    the number of levels. Lines matching no prefix are `LOG_UNCLASSIFIED`.
+
+    Attributes:
+        levels: Level names, in matching order.
+        custom: Prefix regex per custom level.
+    """
+
+    def __init__(self, custom: Optional[Dict[str, str]] = None) -> None:
+        """Initialize LogClassifier.
+
+        Args:
+            custom: Extra levels mapped to a regex matching their prefix,
+                e.g. {"AUDIT": r"AUDIT|SECURITY"}; they take precedence
+                over the standard levels.
+        """
+        self.custom = dict(custom or {})
+        patterns = list(self.custom.items())
+        patterns += [(level, re.escape(prefix)) for prefix, level
+                     in sorted(LOG_LEVELS.items(),
+                               key=lambda item: -len(item[0]))]
+        self._groups = [LOG_UNCLASSIFIED]
+        for level, pattern in patterns:
+            inner = re.compile(pattern).groups
+            self._groups += [level] * (1 + inner)
+        self._match = re.compile("|".join(f"({pattern})"
+                                          for _, pattern in patterns)).match
+        self.levels = list(dict.fromkeys(level for level, _ in patterns))
+
+    def split(self, line: str) -> Tuple[str, int]:
+        """Return the level of a line and the end of its prefix.
+
+        Args:
+            line: A log line.
+
+        Returns:
+            Level and prefix length; (LOG_UNCLASSIFIED, 0) if no prefix
+            matches.
+        """
+        found = self._match(line)
+        if found is None:
+            return LOG_UNCLASSIFIED, 0
+        return self._groups[found.lastindex], found.end()
+
+    def classify(self, line: str) -> str:
+        """Return the level of a line.
+
+        Args:
+            line: A log line.
+
+        Returns:
+            Level name, or LOG_UNCLASSIFIED.
+        """
+        found = self._match(line)
+        return self._groups[found.lastindex if found else 0]
+
+    def iter_classify(self, lines: Iterable[str]
+                      ) -> Iterator[Tuple[str, str]]:
+        """Classify lines as they are read.
+
+        Args:
+            lines: Log lines, e.g. an open file.
+
+        Yields:
+            (level, line) pairs, in input order.
+        """
+        match, groups = self._match, self._groups
+        for line in lines:
+            found = match(line)
+            yield groups[found.lastindex if found else 0], line
+
+    def counts(self, lines: Iterable[str]) -> Dict[str, int]:
+        """Count lines per level.
+
+        Args:
+            lines: Log lines, e.g. an open file.
+
+        Returns:
+            Number of lines per level, for levels that occur.
+        """
+        tally = Counter(found.lastindex if found else 0
+                        for found in map(self._match, lines))
+        counts: Dict[str, int] = {}
+        for index, count in tally.items():
+            level = self._groups[index]
+            counts[level] = counts.get(level, 0) + count
+        return counts
+
+    def route(self, lines: Iterable[str]) -> Dict[str, List[str]]:
+        """Group lines by level.
+
+        Args:
+            lines: Log lines, e.g. an open file.
+
+        Returns:
+            Lines per level, each list in input order.
+        """
+        routes: Dict[str, List[str]] = {}
+        for level, line in self.iter_classify(lines):
+            bucket = routes.get(level)
+            if bucket is None:
+                bucket = routes[level] = []
+            bucket.append(line)
+        return routes
+
+    def counts_file(self, path: str,
+                    encoding: str = "utf-8") -> Dict[str, int]:
+        """Count the lines of a log file per level, line by line.
+
+        Args:
+            path: Log file to read.
+            encoding: Text encoding of the file.
+
+        Returns:
+            Number of lines per level, for levels that occur.
+        """
+        with open(path, "r", encoding=encoding, errors="replace") as f:
+            return self.counts(f)
+
+
 class LogProcessor(DataProcessor):
-    """Process log messages."""
+    """Process log messages.
+
+    Attributes:
+        classifier: Classifier deciding the level of each line.
+    """
+
+    def __init__(self, classifier: Optional[LogClassifier] = None) -> None:
+        """Initialize LogProcessor.
+
+        Args:
+            classifier: Classifier to use; defaults to the standard
+                levels.
+        """
+        self.classifier = classifier or LogClassifier()
+
+    def _tag(self, line: str) -> str:
+        """Return a line with its level prefix replaced by a tag.
+
+        Standard prefixes are checked with `str.startswith`, longest
+        first; the classifier regex is only used when custom levels may
+        take precedence.
+        """
+        if self.classifier.custom:
+            level, end = self.classifier.split(line)
+            tag = LOG_TAGS.get(level)
+            return line if tag is None else tag + line[end:]
+        if not line.startswith(_TAGGED_PREFIXES):
+            return line
+        for prefix, tag in _PREFIX_TAGS:
+            if line.startswith(prefix):
+                return line if tag is None else tag + line[len(prefix):]
+        return line
 
     def process(self, data: Any) -> str:
         """Process the data and return the result string.
@@ -193,71 +643,323 @@ class LogProcessor(DataProcessor):
         """
         if not self.validate(data):
             return "[ERROR] Validation failed: expected a string"
-        if data[:5] == "ERROR":
-            return "[ALERT] ERROR level detected" + data[5:]
-        elif data[:4] == "INFO":
-            return "[INFO] INFO level detected" + data[4:]
-        else:
-            return data
+        return self._tag(data)
+
+    def process_lines(self, lines: Iterable[str]) -> Iterator[str]:
+        """Tag many log lines, yielding results as they are produced.
+
+        Args:
+            lines: Log lines, e.g. an open file.
+
+        Yields:
+            Tagged lines, in input order.
+        """
+        return map(self._tag, lines)
 
     def validate(self, data: Any) -> bool:
-        """Validate that input behaves like a string.
+        """Validate that input is a string.
 
         Args:
             data: Any value.
 
         Returns:
-            Return True if `data` can be concatenated with a string,
-            otherwise False.
+            Return True if `data` is a string, otherwise False.
         """
-        try:
-            _ = data + "a"
-            return True
-        except TypeError:
-            return False
+        return isinstance(data, str)
 
     def format_output(self, result: str) -> str:
         """Return log results unchanged (no base prefixing)."""
         return result
 
 
-def data_processor_foundation(name: str, data: Any) -> None:
+class ProcessorRegistry:
+    """Resolve processor names to shared, long-lived processor instances.
+
+    Each name is bound to one processor instance on first use and that
+    instance is reused afterwards, so callers never rebuild processors.
+
+    Attributes:
+        processor_types: Processor class per name.
+        processors: Cached processor instance per name.
+    """
+
+    def __init__(self,
+                 processor_types: Optional[
+                     Dict[str, Type[DataProcessor]]] = None) -> None:
+        """Initialize ProcessorRegistry.
+
+        Args:
+            processor_types: Processor class per name; defaults to the
+                numeric, text and log processors.
+        """
+        if processor_types is None:
+            processor_types = {
+                "Numeric": NumericProcessor,
+                "Text": TextProcessor,
+                "Log": LogProcessor
+            }
+        self.processor_types: Dict[str, Type[DataProcessor]] = dict(
+            processor_types)
+        self.processors: Dict[str, DataProcessor] = {}
+
+    def register_type(self, name: str,
+                      processor_class: Type[DataProcessor]) -> None:
+        """Map a name to a processor class.
+
+        Args:
+            name: Processor name, e.g. "Numeric".
+            processor_class: DataProcessor subclass handling that name.
+        """
+        self.processor_types[name] = processor_class
+        self.processors.pop(name, None)
+
+    def get(self, name: str) -> Optional[DataProcessor]:
+        """Return the processor bound to `name`, creating it once.
+
+        Args:
+            name: Processor name.
+
+        Returns:
+            Cached processor instance, or None for an unknown name.
+        """
+        processor = self.processors.get(name)
+        if processor is None:
+            processor_class = self.processor_types.get(name)
+            if processor_class is None:
+                return None
+            processor = processor_class()
+            self.processors[name] = processor
+        return processor
+
+    @staticmethod
+    def _run_group(processor: DataProcessor,
+                   items: List[Any]) -> List[str]:
+        """Process and format every item of one group."""
+        return list(map(processor.format_output,
+                        map(processor.process, items)))
+
+    def process_many(self, jobs: Iterable[Tuple[str, Any]],
+                     workers: int = 0) -> List[str]:
+        """Process a mixed batch of (name, data) jobs.
+
+        Jobs are grouped by processor name and each group runs in bulk on
+        its processor; with `workers`, groups run on a thread pool.
+
+        Args:
+            jobs: (processor name, data) pairs.
+            workers: Number of threads; 0 or 1 runs groups in the
+                calling thread.
+
+        Returns:
+            Formatted output per job, in input order; unknown names
+            yield an "[ERROR] Unknown processor name" result.
+        """
+        groups: Dict[str, Tuple[List[int], List[Any]]] = {}
+        count = 0
+        for name, data in jobs:
+            group = groups.get(name)
+            if group is None:
+                group = groups[name] = ([], [])
+            group[0].append(count)
+            group[1].append(data)
+            count += 1
+
+        results: List[str] = [""] * count
+        tasks = []
+        for name, (indexes, items) in groups.items():
+            processor = self.get(name)
+            if processor is None:
+                for index in indexes:
+                    results[index] = f"[ERROR] Unknown processor name: {name}"
+            else:
+                tasks.append((indexes, processor, items))
+
+        if workers > 1 and len(tasks) > 1:
+            with ThreadPoolExecutor(min(workers, len(tasks))) as pool:
+                outputs = list(pool.map(self._run_group,
+                                        [task[1] for task in tasks],
+                                        [task[2] for task in tasks]))
+        else:
+            outputs = [self._run_group(processor, items)
+                       for _, processor, items in tasks]
+        for (indexes, _, _), output in zip(tasks, outputs):
+            for index, result in zip(indexes, output):
+                results[index] = result
+        return results
+
+
+PROCESSOR_REGISTRY = ProcessorRegistry()
+
+
+Route = Tuple[str, Any]
+
+
+class ProcessorRouter:
+    """Choose the processor of each input from its type and prefix.
+
+    The route of a concrete type is resolved once with `issubclass`
+    checks and cached: strings are sniffed for a log level prefix ("Log")
+    or treated as "Text"; bytes and bytearrays are decoded as UTF-8 and
+    sniffed the same way; `NUMERIC_CONTAINERS` and NumPy arrays go to
+    "Numeric"; anything else, such as dicts, scalars and generators, has
+    no route. Inputs are never probed by attempting an operation and
+    catching the error.
+
+    Attributes:
+        registry: Registry resolving the chosen processors.
+        classifier: Classifier recognizing log lines.
+    """
+
+    def __init__(self, registry: Optional[ProcessorRegistry] = None,
+                 classifier: Optional[LogClassifier] = None) -> None:
+        """Initialize ProcessorRouter.
+
+        Args:
+            registry: Registry resolving the processors; defaults to
+                `PROCESSOR_REGISTRY`.
+            classifier: Classifier recognizing log lines; defaults to
+                the standard levels.
+        """
+        self.registry = (registry if registry is not None
+                         else PROCESSOR_REGISTRY)
+        self.classifier = (classifier if classifier is not None
+                           else LogClassifier())
+        self._routes: Dict[type, Callable[[Any], Optional[Route]]] = {}
+
+    def _sniff_text(self, data: str) -> Route:
+        """Route a string to "Log" if it has a level prefix, else "Text"."""
+        if self.classifier.classify(data) == LOG_UNCLASSIFIED:
+            return "Text", data
+        return "Log", data
+
+    def _sniff_bytes(self, data: Union[bytes, bytearray]) -> Route:
+        """Decode bytes as UTF-8 and route the text."""
+        return self._sniff_text(data.decode("utf-8", "replace"))
+
+    @staticmethod
+    def _numeric(data: Any) -> Route:
+        """Route a numeric container to "Numeric"."""
+        return "Numeric", data
+
+    @staticmethod
+    def _unrouted(data: Any) -> None:
+        """Route nothing."""
+        return None
+
+    def _resolve(self, kind: type) -> Callable[[Any], Optional[Route]]:
+        """Return the route function of a concrete type."""
+        if issubclass(kind, str):
+            return self._sniff_text
+        if issubclass(kind, (bytes, bytearray)):
+            return self._sniff_bytes
+        if issubclass(kind, NUMERIC_CONTAINERS):
+            return self._numeric
+        np = sys.modules.get("numpy")
+        if np is not None and issubclass(kind, np.ndarray):
+            return self._numeric
+        return self._unrouted
+
+    def _dispatch(self, data: Any) -> Optional[Route]:
+        """Return the processor name and the payload it receives."""
+        kind = type(data)
+        handler = self._routes.get(kind)
+        if handler is None:
+            handler = self._routes[kind] = self._resolve(kind)
+        return handler(data)
+
+    def route(self, data: Any) -> Optional[str]:
+        """Return the name of the processor for `data`.
+
+        Args:
+            data: Any input.
+
+        Returns:
+            Processor name, or None if no processor handles the type.
+        """
+        routed = self._dispatch(data)
+        return routed[0] if routed is not None else None
+
+    def process(self, data: Any) -> str:
+        """Route one input and return its formatted output.
+
+        Args:
+            data: Any input.
+
+        Returns:
+            Formatted output of the chosen processor, or an error string
+            if no processor handles the input.
+        """
+        return self.process_many((data,))[0]
+
+    def process_many(self, items: Iterable[Any],
+                     workers: int = 0) -> List[str]:
+        """Route a mixed batch and process it grouped by processor.
+
+        Args:
+            items: Inputs of any type.
+            workers: Number of threads passed to
+                `ProcessorRegistry.process_many`.
+
+        Returns:
+            Formatted output per input, in input order.
+        """
+        jobs = []
+        unrouted: Dict[int, str] = {}
+        for index, data in enumerate(items):
+            routed = self._dispatch(data)
+            if routed is None:
+                unrouted[index] = (f"[ERROR] No processor for type "
+                                   f"{type(data).__name__}")
+            else:
+                jobs.append(routed)
+        outputs = iter(self.registry.process_many(jobs, workers))
+        return [unrouted[index] if index in unrouted else next(outputs)
+                for index in range(len(jobs) + len(unrouted))]
+
+
+def data_processor_foundation(name: str, data: Any,
+                              registry: Optional[ProcessorRegistry] = None
+                              ) -> None:
     """Run a single processor by name and print the full demo output.
 
     Args:
         name: Processor name ("Numeric", "Text", or "Log").
         data: Input data for that processor.
+        registry: Registry resolving the processor; defaults to
+            `PROCESSOR_REGISTRY`.
     """
-
-    processors = {
-        "Numeric": NumericProcessor,
-        "Text": TextProcessor,
-        "Log": LogProcessor
-    }
-    try:
-        prcs = processors[name]()
-    except KeyError:
+    if registry is None:
+        registry = PROCESSOR_REGISTRY
+    prcs = registry.get(name)
+    if prcs is None:
         print(f"[ERROR] Unknown processor name: {name}")
         return
 
     print(f"Initializing {name} Processor...")
     shown = f"{data}" if name == "Numeric" else f"\"{data}\""
     print(f"Processing data: {shown}")
+    result = prcs.process(data)
+    verified = result[:7] != "[ERROR]"
     print(f"Validation: {name} data "
-          f"{'verified' if prcs.validate(data) else 'not verified'}")
+          f"{'verified' if verified else 'not verified'}")
 
-    output = prcs.format_output(prcs.process(data))
+    output = prcs.format_output(result)
     print(f"Output: {output}\n")
 
 
-def polymorphic_demo() -> None:
-    """Demonstrate polymorphism by running different processors."""
-    processors = [NumericProcessor, TextProcessor, LogProcessor]
-    data = [[1, 2, 3], "Hello  World", "INFO: System ready"]
-    for i in range(3):
-        prcs = processors[i]()
-        output = prcs.format_output(prcs.process(data[i]))
-        print(f"Result {i + 1}: {output}")
+def polymorphic_demo(registry: Optional[ProcessorRegistry] = None) -> None:
+    """Demonstrate polymorphism by running different processors.
+
+    Args:
+        registry: Registry resolving the processors; defaults to
+            `PROCESSOR_REGISTRY`.
+    """
+    if registry is None:
+        registry = PROCESSOR_REGISTRY
+    jobs = [("Numeric", [1, 2, 3]), ("Text", "Hello  World"),
+            ("Log", "INFO: System ready")]
+    for i, output in enumerate(registry.process_many(jobs), 1):
+        print(f"Result {i}: {output}")
 
 
 def main() -> None:
@@ -0,0 +1,298 @@
+"""Tests for the data processors, their registry and the router."""
+
+import statistics
+from array import array
+
+import pytest
+
+import stream_processor
+from stream_processor import (LOG_UNCLASSIFIED, LogClassifier,
+                              LogProcessor, NumericProcessor,
+                              ProcessorRegistry, TextProcessor, TextStats)
+
+
+@pytest.fixture
+def numeric():
+    return NumericProcessor()
+
+
+@pytest.mark.parametrize("data", [
+    [1, 2, 3, 4, 5],
+    (2.5, -1.0, 7.25),
+    range(10),
+    array("d", [1.0, 2.0, 4.0]),
+    array("i", [7, 7, 7]),
+    [10 ** 9 + 1, 10 ** 9 + 2, 10 ** 9 + 3],
+])
+def test_numeric_summary_matches_statistics(numeric, data):
+    values = list(data)
+    summary = numeric.summarize(data)
+    assert summary["count"] == len(values)
+    assert summary["sum"] == sum(values)
+    assert summary["mean"] == pytest.approx(statistics.fmean(values))
+    assert summary["min"] == min(values)
+    assert summary["max"] == max(values)
+    assert summary["variance"] == pytest.approx(statistics.pvariance(values))
+
+
+def test_numeric_summarizes_generators_in_one_pass(numeric):
+    summary = numeric.summarize(value for value in (3, 1, 2))
+    assert (summary["count"], summary["min"], summary["max"]) == (3, 1, 3)
+
+
+def test_numeric_reads_multidimensional_buffers(numeric):
+    view = memoryview(array("i", [1, 2, 3, 4])).cast("B").cast("i", [2, 2])
+    assert numeric.summarize(view)["sum"] == 10
+
+
+@pytest.mark.parametrize("data", [
+    [], [1, "a"], "abc", 5, None, [1j], [1, 2j], [[1], [2]],
+    memoryview(b"").cast("c"),
+])
+def test_numeric_rejects_invalid_batches(numeric, data):
+    assert numeric.summarize(data) is None
+    assert numeric.validate(data) is False
+    assert numeric.process(data).startswith("[ERROR]")
+
+
+def test_numeric_ignores_lookalike_array_classes(numeric):
+    class array:
+        typecode = "d"
+
+    assert numeric.summarize(array()) is None
+
+
+def test_numeric_process_output(numeric):
+    assert numeric.format_output(numeric.process([1, 2, 3])) == (
+        "Processed 3 numeric values, sum=6, avg=2.0")
+
+
+def test_process_reduces_sequences_without_full_summary(numeric,
+                                                        monkeypatch):
+    calls = []
+    original = NumericProcessor.summarize
+
+    def counting(self, data):
+        calls.append(data)
+        return original(self, data)
+
+    monkeypatch.setattr(NumericProcessor, "summarize", counting)
+    assert numeric.process((1.5, 2.5)) == "2 numeric values, sum=4.0, avg=2.0"
+    assert numeric.validate(range(1, 4))
+    assert not calls
+    assert numeric.process(value for value in (1, 2)) == (
+        "2 numeric values, sum=3, avg=1.5")
+    assert len(calls) == 1
+
+
+def test_demo_summarizes_each_batch_once(monkeypatch, capsys):
+    calls = []
+    original = NumericProcessor._totals
+
+    def counting(self, data):
+        calls.append(data)
+        return original(self, data)
+
+    monkeypatch.setattr(NumericProcessor, "_totals", counting)
+    stream_processor.data_processor_foundation("Numeric", [1, 2, 3])
+    out = capsys.readouterr().out
+    assert "Validation: Numeric data verified" in out
+    assert len(calls) == 1
+
+
+TEXT = "Héllo  wörld\nsecond line\n\n  trailing words"
+
+
+def test_text_stats_match_whole_text_counts():
+    stats = TextStats().update(TEXT).as_dict()
+    assert stats == {"chars": len(TEXT), "words": len(TEXT.split()),
+                     "lines": 4, "bytes": len(TEXT.encode("utf-8"))}
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 8])
+def test_text_stats_do_not_depend_on_chunk_boundaries(size):
+    chunks = [TEXT[i:i + size] for i in range(0, len(TEXT), size)]
+    assert TextProcessor().summarize_stream(chunks) == (
+        TextStats().update(TEXT).as_dict())
+
+
+def test_text_lines_count_unterminated_last_line():
+    assert TextStats().update("a\nb").lines == 2
+    assert TextStats().update("a\nb\n").lines == 2
+    assert TextStats().update("").lines == 0
+
+
+def test_text_file_is_read_in_chunks(tmp_path):
+    path = tmp_path / "text.txt"
+    path.write_text(TEXT, encoding="utf-8")
+    assert TextProcessor().summarize_file(str(path), chunk_size=4) == (
+        TextStats().update(TEXT).as_dict())
+
+
+def test_text_process_output_and_validation():
+    text = TextProcessor()
+    assert text.process("Hello Nexus World") == (
+        "text: 17 characters, 3 words")
+    assert text.summarize(42) is None
+    assert text.process(42).startswith("[ERROR]")
+
+
+LOG_LINES = ["ERROR: disk full", "WARN low memory", "WARNING: hot",
+             "FATAL crash", "INFO: ready", "plain text", "DEBUG trace"]
+
+
+@pytest.mark.parametrize("line, level, end", [
+    ("ERROR: disk full", "ERROR", 5),
+    ("WARN low memory", "WARNING", 4),
+    ("WARNING: hot", "WARNING", 7),
+    ("FATAL crash", "CRITICAL", 5),
+    ("plain text", LOG_UNCLASSIFIED, 0),
+    (" ERROR indented", LOG_UNCLASSIFIED, 0),
+])
+def test_log_classifier_splits_level_prefix(line, level, end):
+    assert LogClassifier().split(line) == (level, end)
+    assert LogClassifier().classify(line) == level
+
+
+def test_custom_levels_with_groups_take_precedence():
+    classifier = LogClassifier({"AUDIT": r"AUDIT|SEC(URITY)?",
+                                "ERROR": r"E\d{3}"})
+    assert classifier.split("SECURITY breach") == ("AUDIT", 8)
+    assert classifier.split("SEC breach") == ("AUDIT", 3)
+    assert classifier.classify("E404 missing") == "ERROR"
+    assert classifier.classify("FATAL crash") == "CRITICAL"
+    assert classifier.levels[:2] == ["AUDIT", "ERROR"]
+
+
+def test_log_counts_and_routes_keep_order(tmp_path):
+    classifier = LogClassifier()
+    assert classifier.counts(LOG_LINES) == {
+        "ERROR": 1, "WARNING": 2, "CRITICAL": 1, "INFO": 1,
+        LOG_UNCLASSIFIED: 1, "DEBUG": 1}
+    routes = classifier.route(iter(LOG_LINES))
+    assert routes["WARNING"] == ["WARN low memory", "WARNING: hot"]
+    assert list(classifier.iter_classify(LOG_LINES[:2])) == [
+        ("ERROR", "ERROR: disk full"), ("WARNING", "WARN low memory")]
+    path = tmp_path / "app.log"
+    path.write_text("\n".join(LOG_LINES) + "\n", encoding="utf-8")
+    assert classifier.counts_file(str(path)) == (
+        classifier.counts(LOG_LINES))
+
+
+def test_log_processor_tags_lines():
+    processor = LogProcessor()
+    assert processor.process("ERROR: disk full") == (
+        "[ALERT] ERROR level detected: disk full")
+    assert processor.process("DEBUG trace") == "DEBUG trace"
+    assert list(processor.process_lines(["INFO: ready", "plain"])) == [
+        "[INFO] INFO level detected: ready", "plain"]
+    assert processor.process(7).startswith("[ERROR]")
+
+
+def test_log_processor_tags_custom_levels_with_the_classifier():
+    processor = LogProcessor(LogClassifier({"AUDIT": r"ERROR_AUDIT",
+                                            "ERROR": r"E\d{3}"}))
+    assert processor.process("ERROR_AUDIT login") == "ERROR_AUDIT login"
+    assert processor.process("E404 missing") == (
+        "[ALERT] ERROR level detected missing")
+    assert processor.process("INFO: ready") == (
+        "[INFO] INFO level detected: ready")
+
+
+def test_registry_reuses_processor_per_name():
+    registry = ProcessorRegistry()
+    numeric = registry.get("Numeric")
+    assert isinstance(numeric, NumericProcessor)
+    assert registry.get("Numeric") is numeric
+    assert registry.get("Missing") is None
+    assert "Missing" not in registry.processors
+
+
+def test_registering_a_type_replaces_cached_instance():
+    registry = ProcessorRegistry()
+    registry.get("Log")
+    registry.register_type("Log", TextProcessor)
+    assert isinstance(registry.get("Log"), TextProcessor)
+
+
+@pytest.mark.parametrize("workers", [0, 4])
+def test_process_many_keeps_input_order(workers):
+    registry = ProcessorRegistry()
+    jobs = [("Numeric", [1, 2, 3]), ("Text", "Hello World"),
+            ("Log", "ERROR: disk full"), ("Missing", 1),
+            ("Numeric", "oops"), ("Text", "again")] * 3
+    expected = []
+    for name, data in jobs:
+        processor = registry.get(name)
+        expected.append(
+            processor.format_output(processor.process(data))
+            if processor else f"[ERROR] Unknown processor name: {name}")
+    assert registry.process_many(jobs, workers=workers) == expected
+    assert registry.process_many([]) == []
+
+
+@pytest.fixture
+def router():
+    return stream_processor.ProcessorRouter(
+        stream_processor.ProcessorRegistry())
+
+
+@pytest.mark.parametrize("data, name", [
+    ([1, 2, 3], "Numeric"),
+    ((1.5, 2.5), "Numeric"),
+    (range(3), "Numeric"),
+    (array("d", [1.0]), "Numeric"),
+    (memoryview(array("i", [1])), "Numeric"),
+    ("Hello World", "Text"),
+    ("ERROR: disk full", "Log"),
+    ("WARN low memory", "Log"),
+    (b"INFO ready", "Log"),
+    (bytearray(b"plain words"), "Text"),
+    ({"a": 1}, None),
+    (5, None),
+    (None, None),
+    ((value for value in [1, 2]), None),
+])
+def test_router_picks_processor_by_type_and_prefix(router, data, name):
+    assert router.route(data) == name
+
+
+def test_router_decodes_bytes_before_processing(router):
+    assert router.process(b"INFO x") == "[INFO] INFO level detected x"
+    assert router.process(b"two words") == (
+        "Processed text: 9 characters, 2 words")
+
+
+def test_router_keeps_input_order_and_reports_unrouted(router):
+    items = [[1, 2], {"a": 1}, "ERROR: x", "a b", 3.5]
+    assert router.process_many(items) == [
+        "Processed 2 numeric values, sum=3, avg=1.5",
+        "[ERROR] No processor for type dict",
+        "[ALERT] ERROR level detected: x",
+        "Processed text: 3 characters, 2 words",
+        "[ERROR] No processor for type float",
+    ]
+    assert router.process_many(items, workers=3) == router.process_many(
+        items)
+
+
+def test_router_caches_routes_per_type(router):
+    router.route("a")
+    router.route("ERROR b")
+    router.route([1])
+    assert set(router._routes) == {str, list}
+
+
+def test_router_does_not_import_numpy(router, monkeypatch):
+    monkeypatch.delitem(stream_processor.sys.modules, "numpy",
+                        raising=False)
+    router.route([1])
+    router.route(object())
+    assert "numpy" not in stream_processor.sys.modules
+
+
+def test_router_honours_explicit_registry():
+    empty = stream_processor.ProcessorRegistry({})
+    router = stream_processor.ProcessorRouter(empty)
+    assert router.registry is empty
+    assert router.process("text") == "[ERROR] Unknown processor name: Text"
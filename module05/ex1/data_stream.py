@@ -5,17 +5,35 @@ EX1: Polymorphic Streams
 Implement a sophisticated data streaming system that demonstrates advanced
 polymorphic behavior.
 
+Sensor channels and transaction sizes also keep mergeable quantile
+sketches (see `stream_sketches`), so p50/p95/p99 are reported in bounded
+memory with a configurable rank error; events keep top-k and
+distinct-count sketches. Batches may also arrive in the compact binary
+format of `stream_wire` and are then processed from packed arrays.
+
 Classes:
+    StreamStats:
+        Collect cumulative per-thread statistics of a stream.
     DataStream:
         Define the common stream interface.
+    ChannelStats:
+        Aggregate the readings of one sensor channel.
+    SensorSummary:
+        Aggregate sensor readings per channel in one scan.
     SensorStream:
         Handle sensor readings (e.g., temperature/pressure dicts).
+    TransactionSummary:
+        Aggregate buy/sell flows, counts and extremes in one scan.
     TransactionStream:
         Handle buy/sell operations and flow metrics.
+    EventSummary:
+        Aggregate event counts, frequencies and cardinality in one scan.
     EventStream:
         Handle string events and detect errors.
+    StreamRegistry:
+        Resolve stream ids to cached stream instances.
     StreamProcessor:
-        Select a concrete stream class from a stream_id.
+        Select a concrete stream from a stream_id.
 
 Functions:
     polymorphic_stream_system:
@@ -26,8 +44,297 @@ Functions:
         Serve as entry point for demo execution.
 """
 
+import re
+import threading
+from collections import Counter
 from abc import ABC, abstractmethod
-from typing import Any, List, Dict, Union, Optional
+from functools import lru_cache, partial
+from itertools import compress, islice
+from operator import eq, lt
+from typing import (Any, List, Dict, Union, Optional, Type, Iterable,
+                    Iterator, Sequence, Callable, Tuple)
+
+from stream_sketches import (QuantileSketch, CountMinSketch, SpaceSaving,
+                             HyperLogLog, hash64)
+from stream_wire import PackedBatch, decode_batch
+from stream_anomaly import AnomalyMonitor
+from stream_filters import compile_filter
+
+CRITICAL_PRESSURE = 1020
+LARGE_TRANSACTION = 500
+SENSOR_CHANNELS = ("temp", "humidity", "pressure")
+QUANTILE_ERROR = 0.01
+TOP_EVENTS = 10
+TALLY_LIMIT = 4096
+CHUNK_SIZE = 1024
+BUY = 1
+SELL = -1
+_COMPARISON = re.compile(r"[=!<>]")
+
+
+@lru_cache(maxsize=None)
+def _numpy() -> Any:
+    """Return the numpy module, or None when it is not installed."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _is_reading(data: Any) -> bool:
+    """Return True for a single-key sensor reading dict."""
+    return isinstance(data, dict) and len(data) == 1
+
+
+def _is_record(data: Any) -> bool:
+    """Return True for a dict record, single-key or not."""
+    return isinstance(data, dict)
+
+
+def _is_critical_reading(data: Any) -> bool:
+    """Return True for a pressure reading above CRITICAL_PRESSURE."""
+    if not isinstance(data, dict) or len(data) != 1:
+        return False
+    value = data.get("pressure")
+    return isinstance(value, (int, float)) and value > CRITICAL_PRESSURE
+
+
+def _is_large_operation(data: Any) -> bool:
+    """Return True for a single-key operation above LARGE_TRANSACTION."""
+    if not isinstance(data, dict) or len(data) != 1:
+        return False
+    value = next(iter(data.values()))
+    return isinstance(value, int) and value > LARGE_TRANSACTION
+
+
+def _is_event(data: Any) -> bool:
+    """Return True for a string event."""
+    return isinstance(data, str)
+
+
+def _is_error_event(data: Any) -> bool:
+    """Return True for an "error" event."""
+    return isinstance(data, str) and data == "error"
+
+
+def _keep(data: Any) -> bool:
+    """Return True for every record."""
+    return True
+
+
+@lru_cache(maxsize=256)
+def _guarded(valid: Optional[Callable[[Any], bool]],
+             predicate: Callable[[Any], bool]) -> Callable[[Any], bool]:
+    """Return `predicate` restricted to records accepted by `valid`."""
+    if valid is None:
+        return predicate
+    return lambda data: valid(data) and predicate(data)
+
+
+def _iter_batch(data_batch: Any) -> Optional[Iterator[Any]]:
+    """Return an iterator over a batch, or None if it is not a batch.
+
+    Any iterable is a batch (lists, generators, files, deques...) except
+    strings, bytes and mappings, which are single records.
+    """
+    if isinstance(data_batch, (str, bytes, bytearray, dict)):
+        return None
+    try:
+        return iter(data_batch)
+    except TypeError:
+        return None
+
+
+def _chunks(records: Iterable[Any],
+            size: int = CHUNK_SIZE) -> Iterator[List[Any]]:
+    """Split records into lists of at most `size` items, lazily."""
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _collect(records: Iterable[Any], predicate: Callable[[Any], bool],
+             sink: List[Any]) -> Iterator[Any]:
+    """Yield every record, appending those matching `predicate` to `sink`.
+
+    Lets one scan feed a summary and build a filtered view at once.
+    """
+    append = sink.append
+    for record in records:
+        if predicate(record):
+            append(record)
+        yield record
+
+
+class _StatsShard:
+    """Hold the statistics written by a single thread since the last drain.
+    """
+
+    __slots__ = ("totals", "active", "lock")
+
+    def __init__(self, totals: Any) -> None:
+        """Initialize a shard around an empty summary."""
+        self.totals = totals
+        self.active: Any = None
+        self.lock = threading.Lock()
+
+
+class StreamStats:
+    """Collect cumulative statistics of a stream from many threads.
+
+    Each producer thread folds its batches into its own shard, so writers
+    never share counters and no update is lost. The lock of a shard is
+    only taken when a batch is committed and when statistics are read,
+    where the base, every shard and every in-flight batch are merged.
+
+    `drain` moves what the shards committed into the base and returns
+    it, which lets a single persistence layer (see `stream_state`) save
+    only what changed since its previous save.
+
+    Attributes:
+        factory: Callable returning an empty, mergeable summary.
+        version: Changes whenever the statistics may have changed, i.e.
+            when a batch begins or is committed.
+    """
+
+    def __init__(self, factory: Callable[[], Any]) -> None:
+        """Initialize StreamStats.
+
+        Args:
+            factory: Callable returning an empty, mergeable summary.
+        """
+        self.factory = factory
+        self.version = 0
+        self._local = threading.local()
+        self._shards: List[_StatsShard] = []
+        self._base: Optional[Any] = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle only the factory; copies start with empty statistics.
+
+        Statistics stay with the process that collected them and travel
+        back as summaries passed to `add`.
+        """
+        return {"factory": self.factory}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Rebuild empty statistics around the pickled factory."""
+        self.__init__(state["factory"])
+
+    def shard(self) -> _StatsShard:
+        """Return the shard of the calling thread, creating it once."""
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = _StatsShard(self.factory())
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+
+    def begin(self, summary: Any) -> _StatsShard:
+        """Publish an in-flight batch summary of the calling thread.
+
+        Args:
+            summary: Summary being filled by the caller.
+
+        Returns:
+            Shard to pass to `commit`.
+        """
+        shard = self.shard()
+        shard.active = summary
+        self.version += 1
+        return shard
+
+    def commit(self, shard: _StatsShard) -> None:
+        """Fold the in-flight summary of a shard into its totals.
+
+        Args:
+            shard: Shard returned by `begin`.
+        """
+        with shard.lock:
+            if shard.active is not None:
+                shard.totals.merge(shard.active)
+                shard.active = None
+        self.version += 1
+
+    def add(self, summary: Any) -> None:
+        """Fold a complete batch summary into the calling thread's totals.
+
+        Args:
+            summary: Summary of a processed batch.
+        """
+        self.commit(self.begin(summary))
+
+    def reset(self, summary: Optional[Any] = None) -> None:
+        """Drop every shard, optionally starting over from `summary`.
+
+        Args:
+            summary: Summary the statistics restart from; it becomes the
+                base, so it is not returned by the next `drain`.
+        """
+        with self._lock:
+            self._local = threading.local()
+            self._shards = []
+            self._base = summary
+        self.version += 1
+
+    def _drain(self) -> Any:
+        """Move committed shard totals into the base; hold the lock."""
+        delta = self.factory()
+        for shard in self._shards:
+            with shard.lock:
+                delta.merge(shard.totals)
+                shard.totals = self.factory()
+        if self._base is None:
+            self._base = self.factory()
+        self._base.merge(delta)
+        return delta
+
+    def drain(self) -> Any:
+        """Move the batches committed since the last drain into the base.
+
+        Batches still in flight are left for the next drain.
+
+        Returns:
+            Summary of the moved batches.
+        """
+        with self._lock:
+            return self._drain()
+
+    def base(self) -> Any:
+        """Drain, then return a copy of everything committed so far.
+
+        Returns:
+            Summary of every committed batch, so that later drains
+            continue exactly where it ends.
+        """
+        total = self.factory()
+        with self._lock:
+            self._drain()
+            total.merge(self._base)
+        return total
+
+    def merged(self) -> Any:
+        """Merge the base and every shard, including batches in flight.
+
+        Returns:
+            Summary of everything processed so far.
+        """
+        total = self.factory()
+        with self._lock:
+            if self._base is not None:
+                total.merge(self._base)
+            for shard in self._shards:
+                with shard.lock:
+                    total.merge(shard.totals)
+                    if shard.active is not None:
+                        total.merge(shard.active)
+        return total
 
 
 class DataStream(ABC):
@@ -36,10 +343,40 @@ class DataStream(ABC):
     Subclasses must implement:
         process_batch: Process a batch of data
 
+    Subclasses describe filtering declaratively: `record_predicate` keeps
+    well-formed records for any criteria, `expression_guard` restricts
+    filter expressions to the records the summaries accept (defaulting
+    to `record_predicate`), and `criteria_predicates` maps named
+    criteria (e.g. "High-priority") to predicates compiled once at
+    class creation.
+
+    Batches may be any iterable (lists, generators, files, deques...).
+    They are consumed incrementally, in chunks of CHUNK_SIZE records, so
+    unbounded feeds run in constant memory and `get_stats()` reflects the
+    progress of a batch still being processed.
+
+    Statistics are cumulative over every batch and may be fed by several
+    threads at once (see StreamStats).
+
+    Batches in the binary wire format (see `stream_wire`) are folded by
+    `process_packed` straight from their packed arrays, and
+    `aprocess_batch`/`afilter_data` consume asyncio queues and async
+    iterators (see `stream_async`).
+
+    `snapshot` and `restore` convert the cumulative statistics to and
+    from JSON-serializable dictionaries (see `stream_state`).
+
     Attributes:
         stream_id: Identifier for the data stream.
+        stats: Cumulative statistics of the stream.
+        summary_type: Summary class with `to_dict` and `from_dict`.
     """
 
+    summary_type: Optional[Type[Any]] = None
+    record_predicate: Optional[Callable[[Any], bool]] = None
+    expression_guard: Optional[Callable[[Any], bool]] = None
+    criteria_predicates: Dict[str, Union[str, Callable[[Any], bool]]] = {}
+
     def __init__(self, stream_id: str) -> None:
         """Initialize DataStream.
 
@@ -47,9 +384,10 @@ class DataStream(ABC):
             stream_id: Identifier for the data stream.
         """
         self.stream_id = stream_id
+        self.stats = StreamStats(self.new_summary)
 
     @abstractmethod
-    def process_batch(self, data_batch: List[Any]) -> str:
+    def process_batch(self, data_batch: Iterable[Any]) -> str:
         """Process a data batch and return a result string.
 
         Args:
@@ -60,7 +398,41 @@ class DataStream(ABC):
         """
         raise NotImplementedError
 
-    def filter_data(self, data_batch: List[Any],
+    @classmethod
+    def compile_criteria(cls, criteria: Optional[str]
+                         ) -> Optional[Callable[[Any], bool]]:
+        """Return the predicate implementing `criteria`.
+
+        Named criteria map to a predicate or to a filter expression.
+        Any other criteria containing a comparison is compiled as an
+        expression (see `stream_filters`), e.g.
+        "pressure > 1020 and temp < 30"; criteria without one are
+        legacy labels and keep every well-formed record. Expressions
+        only match records accepted by `expression_guard`, so e.g.
+        "not temp < 30" does not keep malformed ones.
+
+        Args:
+            criteria: Optional filtering rule.
+
+        Returns:
+            Predicate selecting matching records, or None to keep all.
+
+        Raises:
+            FilterSyntaxError: `criteria` contains a comparison but is
+                not a valid expression.
+        """
+        if not criteria:
+            return None
+        predicate = cls.criteria_predicates.get(criteria)
+        if callable(predicate):
+            return predicate
+        if predicate is None and not _COMPARISON.search(criteria):
+            return cls.record_predicate
+        compiled = compile_filter(predicate or criteria)
+        return _guarded(cls.expression_guard or cls.record_predicate,
+                        compiled)
+
+    def filter_data(self, data_batch: Iterable[Any],
                     criteria: Optional[str] = None) -> List[Any]:
         """Apply base filtering to a data batch.
 
@@ -71,9 +443,161 @@ class DataStream(ABC):
         Returns:
             Filtered list based on criteria.
         """
-        if not isinstance(data_batch, list):
-            return list()
-        return data_batch
+        if isinstance(data_batch, list) and not criteria:
+            return data_batch
+        return list(self.iter_filter(data_batch, criteria))
+
+    def iter_filter(self, data_batch: Iterable[Any],
+                    criteria: Optional[str] = None) -> Iterator[Any]:
+        """Lazily yield the records of a batch matching `criteria`.
+
+        Args:
+            data_batch: Raw batch to inspect.
+            criteria: Optional filtering rule.
+
+        Returns:
+            Iterator over matching records.
+        """
+        records = _iter_batch(data_batch)
+        if records is None:
+            return iter(())
+        predicate = self.compile_criteria(criteria)
+        if predicate is None:
+            return records
+        return filter(predicate, records)
+
+    def process_and_filter(self, data_batch: Iterable[Any],
+                           criteria: Optional[str] = None
+                           ) -> Tuple[str, List[Any]]:
+        """Process a batch and filter it in a single scan.
+
+        Args:
+            data_batch: Collection of raw stream records.
+            criteria: Optional filtering rule.
+
+        Returns:
+            The `process_batch` summary and the `filter_data` result.
+        """
+        records = _iter_batch(data_batch)
+        if records is None:
+            return self.process_batch(data_batch), list()
+        predicate = self.compile_criteria(criteria)
+        if predicate is None:
+            if isinstance(data_batch, list):
+                return self.process_batch(data_batch), data_batch
+            predicate = _keep
+        filtered: List[Any] = []
+        result = self.process_batch(_collect(records, predicate, filtered))
+        return result, filtered
+
+    async def aprocess_batch(self, source: Any) -> str:
+        """Process records from an asyncio.Queue or async iterator.
+
+        A queue is read until `stream_async.STREAM_END`. The batch is
+        published to the statistics once complete, since coroutines of
+        one thread share a StreamStats shard.
+
+        Args:
+            source: asyncio.Queue, async iterable or plain iterable.
+
+        Returns:
+            Summary string of the batch.
+        """
+        from stream_async import achunks
+
+        summary = self.new_summary()
+        async for chunk in achunks(source):
+            summary.update(chunk)
+        self.stats.add(summary)
+        return self._summarize(summary)
+
+    async def afilter_data(self, source: Any,
+                           criteria: Optional[str] = None) -> List[Any]:
+        """Filter records from an asyncio.Queue or async iterator.
+
+        Args:
+            source: asyncio.Queue, async iterable or plain iterable.
+            criteria: Optional filtering rule.
+
+        Returns:
+            Filtered list based on criteria.
+        """
+        from stream_async import achunks
+
+        predicate = self.compile_criteria(criteria)
+        filtered: List[Any] = []
+        async for chunk in achunks(source):
+            filtered.extend(chunk if predicate is None
+                            else filter(predicate, chunk))
+        return filtered
+
+    def _scan(self, data_batch: Iterable[Any]) -> Any:
+        """Fold a batch into a fresh summary, publishing its progress.
+
+        Args:
+            data_batch: Collection of raw stream records.
+
+        Returns:
+            The batch summary, or None if the batch is invalid or empty.
+        """
+        records = _iter_batch(data_batch)
+        if records is None:
+            return None
+        summary = self.new_summary()
+        shard = self.stats.begin(summary)
+        try:
+            summary.update(records)
+        finally:
+            self.stats.commit(shard)
+        return summary if summary.count else None
+
+    def process_packed(self, batch: Union[PackedBatch, bytes]) -> str:
+        """Process a batch in the binary wire format.
+
+        Args:
+            batch: PackedBatch, or bytes produced by `encode_batch`.
+
+        Returns:
+            Summary string of the batch.
+        """
+        if not isinstance(batch, PackedBatch):
+            batch = decode_batch(batch)
+        summary = self.new_summary()
+        summary.update_packed(batch)
+        self.stats.add(summary)
+        return self._summarize(summary)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the cumulative statistics as a JSON-serializable dict."""
+        return self.stats.merged().to_dict()
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        """Replace the cumulative statistics with a snapshot.
+
+        Args:
+            state: Dictionary produced by `snapshot`.
+        """
+        self.stats.reset(self.summary_type.from_dict(state))
+
+    @property
+    def processed(self) -> int:
+        """Return the number of records processed so far."""
+        return self.stats.merged().count
+
+    def new_summary(self) -> Any:
+        """Return an empty summary with `update` and `merge` methods."""
+        raise NotImplementedError
+
+    def _summarize(self, summary: Any) -> str:
+        """Render a batch summary.
+
+        Args:
+            summary: Aggregate of the processed batch.
+
+        Returns:
+            A human-readable summary of the processed batch.
+        """
+        raise NotImplementedError
 
     def get_stats(self) -> Dict[str, Union[str, int, float]]:
         """Report basic stream metadata.
@@ -86,26 +610,321 @@ class DataStream(ABC):
         }
 
 
+class ChannelStats:
+    """Aggregate the readings of one sensor channel.
+
+    Readings are buffered in `pending` during a scan and folded in by
+    `flush`, which lets C-level builtins compute sum, min and max.
+
+    Attributes:
+        count: Number of readings.
+        total: Sum of readings.
+        minimum: Smallest reading, or None.
+        maximum: Largest reading, or None.
+        sketch: Quantile sketch of the readings.
+        pending: Readings not yet folded in.
+    """
+
+    __slots__ = ("count", "total", "minimum", "maximum", "sketch",
+                 "pending")
+
+    def __init__(self, quantile_k: int = 200) -> None:
+        """Initialize empty channel statistics.
+
+        Args:
+            quantile_k: Size parameter of the quantile sketch.
+        """
+        self.count = 0
+        self.total: Union[int, float] = 0
+        self.minimum: Optional[Union[int, float]] = None
+        self.maximum: Optional[Union[int, float]] = None
+        self.sketch = QuantileSketch(quantile_k)
+        self.pending: List[Union[int, float]] = []
+
+    @property
+    def mean(self) -> Optional[float]:
+        """Return the mean reading, or None without readings."""
+        if not self.count:
+            return None
+        return self.total / self.count
+
+    def flush(self) -> None:
+        """Fold pending readings into the aggregates."""
+        values = self.pending
+        if not values:
+            return
+        self.count += len(values)
+        self.total += sum(values)
+        low = min(values)
+        high = max(values)
+        if self.minimum is None or low < self.minimum:
+            self.minimum = low
+        if self.maximum is None or high > self.maximum:
+            self.maximum = high
+        self.sketch.update_many(values)
+        values.clear()
+
+    def merge(self, other: "ChannelStats") -> "ChannelStats":
+        """Add the readings of another channel aggregate.
+
+        Args:
+            other: Aggregate to fold in.
+
+        Returns:
+            The aggregate itself.
+        """
+        self.count += other.count
+        self.total += other.total
+        if other.minimum is not None and (self.minimum is None
+                                          or other.minimum < self.minimum):
+            self.minimum = other.minimum
+        if other.maximum is not None and (self.maximum is None
+                                          or other.maximum > self.maximum):
+            self.maximum = other.maximum
+        self.sketch.merge(other.sketch)
+        return self
+
+    def as_dict(self) -> Dict[str, Union[int, float, None]]:
+        """Return count, mean, min, max and percentiles."""
+        stats = {
+            "count": self.count,
+            "mean": self.mean,
+            "min": self.minimum,
+            "max": self.maximum
+        }
+        stats.update(self.sketch.percentiles())
+        return stats
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the aggregate as a JSON-serializable dictionary."""
+        self.flush()
+        return {"count": self.count, "total": self.total,
+                "min": self.minimum, "max": self.maximum,
+                "sketch": self.sketch.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ChannelStats":
+        """Rebuild an aggregate saved by `to_dict`.
+
+        Args:
+            data: Dictionary produced by `to_dict`.
+
+        Returns:
+            The restored aggregate.
+        """
+        channel = cls()
+        channel.count, channel.total = data["count"], data["total"]
+        channel.minimum, channel.maximum = data["min"], data["max"]
+        channel.sketch = QuantileSketch.from_dict(data["sketch"])
+        return channel
+
+
+class SensorSummary:
+    """Aggregate sensor readings per channel in a single scan.
+
+    Every key of a reading dict is looked up once in a dispatch table of
+    channel accumulators; keys without a channel are ignored and
+    non-numeric values are counted as rejected. When a monitor is given,
+    each chunk of channel readings is scored for anomalies before it is
+    folded in.
+
+    Attributes:
+        count: Number of records seen.
+        rejected: Number of non-numeric channel values.
+        channels: Accumulator per channel name.
+        quantile_k: Size parameter of the channel quantile sketches.
+        monitor: Optional anomaly monitor fed with the readings.
+    """
+
+    __slots__ = ("count", "rejected", "channels", "quantile_k", "monitor")
+
+    def __init__(self, channels: Iterable[str] = SENSOR_CHANNELS,
+                 quantile_k: int = 200,
+                 monitor: Optional[AnomalyMonitor] = None) -> None:
+        """Initialize an empty summary.
+
+        Args:
+            channels: Names of the channels to aggregate.
+            quantile_k: Size parameter of the channel quantile sketches.
+            monitor: Optional anomaly monitor fed with the readings.
+        """
+        self.count = 0
+        self.rejected = 0
+        self.quantile_k = quantile_k
+        self.monitor = monitor
+        self.channels: Dict[str, ChannelStats] = {
+            name: ChannelStats(quantile_k) for name in channels
+        }
+
+    @property
+    def avg(self) -> Optional[float]:
+        """Return the average temperature, or None if unavailable."""
+        temp = self.channels.get("temp")
+        return temp.mean if temp is not None else None
+
+    def update(self, records: Iterable[Any]) -> "SensorSummary":
+        """Fold records into the channel accumulators in one pass.
+
+        Args:
+            records: Sensor readings.
+
+        Returns:
+            The summary itself.
+        """
+        dispatch = {name: channel.pending.append
+                    for name, channel in self.channels.items()}.get
+        numeric = (int, float)
+        for chunk in _chunks(records):
+            rejected = self.rejected
+            for record in chunk:
+                if not isinstance(record, dict):
+                    continue
+                for key in record:
+                    add = dispatch(key)
+                    if add is None:
+                        continue
+                    value = record[key]
+                    if not isinstance(value, numeric):
+                        rejected += 1
+                        continue
+                    add(value)
+            self._flush()
+            self.count += len(chunk)
+            self.rejected = rejected
+        return self
+
+    def update_packed(self, batch: PackedBatch) -> "SensorSummary":
+        """Fold a packed batch into the channel accumulators.
+
+        Args:
+            batch: Packed sensor readings.
+
+        Returns:
+            The summary itself.
+        """
+        self.count += len(batch)
+        if batch.values is None:
+            return self
+        adders = [None if key not in self.channels
+                  else self.channels[key].pending.append
+                  for key in batch.keys]
+        for chunk in _chunks(zip(batch.codes, batch.values)):
+            for code, value in chunk:
+                add = adders[code]
+                if add is not None:
+                    add(value)
+            self._flush()
+        return self
+
+    def _flush(self) -> None:
+        """Score pending readings, then fold them into the channels."""
+        for name, channel in self.channels.items():
+            if self.monitor is not None and channel.pending:
+                self.monitor.observe_many(name, channel.pending)
+            channel.flush()
+
+    def merge(self, other: "SensorSummary") -> "SensorSummary":
+        """Add another summary, channel by channel.
+
+        Args:
+            other: Summary to fold in.
+
+        Returns:
+            The summary itself.
+        """
+        self.count += other.count
+        self.rejected += other.rejected
+        for name, channel in other.channels.items():
+            mine = self.channels.get(name)
+            if mine is None:
+                mine = self.channels[name] = ChannelStats(self.quantile_k)
+            mine.merge(channel)
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the summary as a JSON-serializable dictionary."""
+        return {"count": self.count, "rejected": self.rejected,
+                "quantile_k": self.quantile_k,
+                "channels": {name: channel.to_dict()
+                             for name, channel in self.channels.items()}}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SensorSummary":
+        """Rebuild a summary saved by `to_dict`.
+
+        Args:
+            data: Dictionary produced by `to_dict`.
+
+        Returns:
+            The restored summary.
+        """
+        summary = cls((), data["quantile_k"])
+        summary.count, summary.rejected = data["count"], data["rejected"]
+        summary.channels = {name: ChannelStats.from_dict(channel)
+                            for name, channel in data["channels"].items()}
+        return summary
+
+
 class SensorStream(DataStream):
     """Process environmental sensor readings.
 
     Attributes:
         stream_id: Identifier for the sensor stream.
-        processed: Number of processed data.
-        avg: Average of the temperature.
+        channels: Names of the aggregated channels.
+        quantile_k: Size parameter of the channel quantile sketches.
+        processed: Number of processed data over all batches.
+        avg: Average of the temperature over all batches.
+        anomalies: Optional monitor flagging anomalous readings.
     """
 
-    def __init__(self, stream_id: str) -> None:
+    summary_type = SensorSummary
+    record_predicate = staticmethod(_is_reading)
+    expression_guard = staticmethod(_is_record)
+    criteria_predicates = {"High-priority": _is_critical_reading}
+
+    def __init__(self, stream_id: str,
+                 channels: Iterable[str] = SENSOR_CHANNELS,
+                 quantile_error: float = QUANTILE_ERROR,
+                 anomalies: Optional[AnomalyMonitor] = None) -> None:
         """Initialize SensorStream.
 
         Args:
             stream_id: Identifier for the sensor stream.
+            channels: Names of the channels to aggregate.
+            quantile_error: Rank error of the channel percentiles.
+            anomalies: Optional monitor scoring every channel reading as
+                batches flow; its detectors set windows and thresholds.
         """
+        self.channels: List[str] = list(channels)
+        self.quantile_k = QuantileSketch.k_for_error(quantile_error)
+        self.anomalies = anomalies
         super().__init__(stream_id)
-        self.processed = 0
-        self.avg = None
 
-    def process_batch(self, data_batch: List[Any]) -> str:
+    def register_channel(self, name: str) -> None:
+        """Aggregate readings of an additional, user-defined channel.
+
+        Args:
+            name: Key of the readings, e.g. "co2".
+        """
+        if name not in self.channels:
+            self.channels.append(name)
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        """Replace the statistics with a snapshot, keeping its channels.
+
+        Args:
+            state: Dictionary produced by `snapshot`.
+        """
+        for name in state["channels"]:
+            self.register_channel(name)
+        super().restore(state)
+
+    @property
+    def avg(self) -> Optional[float]:
+        """Return the cumulative average temperature, if any."""
+        return self.stats.merged().avg
+
+    def process_batch(self, data_batch: Iterable[Any]) -> str:
         """Summarize sensor readings and compute average temperature.
 
         Args:
@@ -114,67 +933,268 @@ class SensorStream(DataStream):
         Returns:
             Summary string including count and optional average temperature.
         """
-        data_batch = self.filter_data(data_batch)
-        if not data_batch:
+        summary = self._scan(data_batch)
+        if summary is None:
             return "0 readings processed"
+        return self._summarize(summary)
 
-        length = len(data_batch)
-        res = f"{length} readings processed"
-        self.processed = length
-        avg = None
+    def new_summary(self) -> SensorSummary:
+        """Return an empty sensor summary over the current channels."""
+        return SensorSummary(self.channels, self.quantile_k, self.anomalies)
 
-        try:
-            temps = [temp for temp in data_batch
-                     if len(temp) == 1 and "temp" in temp.keys()]
-            if temps:
-                avg = sum(value for temp in temps
-                          for value in temp.values()) / len(temps)
-        except (AttributeError, TypeError):
-            pass
+    def _summarize(self, summary: SensorSummary) -> str:
+        """Render a batch summary.
+
+        Args:
+            summary: Aggregate of the processed batch.
 
+        Returns:
+            Summary string including count and optional average temperature.
+        """
+        res = f"{summary.count} readings processed"
+        avg = summary.avg
         if avg is not None:
             res += f", avg temp: {avg}°C"
-            self.avg = avg
         return res
 
-    def filter_data(self, data_batch: List[Any],
-                    criteria: Optional[str] = None) -> List[Any]:
-        """Filter sensor readings.
+    def get_stats(self) -> Dict[str, Union[str, int, float]]:
+        """Return cumulative processed count and average temperature.
+
+        Returns:
+            Dictionary with processed count and optional average temp.
+        """
+        stats = super().get_stats()
+        totals = self.stats.merged()
+        stats["processed"] = totals.count
+        avg = totals.avg
+        if avg is not None:
+            stats["average"] = avg
+        if self.anomalies is not None:
+            stats["anomalies"] = sum(self.anomalies.counts.values())
+        return stats
+
+    def channel_stats(self) -> Dict[str, Dict[str, Union[int, float, None]]]:
+        """Return cumulative count, mean, min, max and p50/p95/p99.
+
+        Returns:
+            Dictionary mapping channel name to its aggregates.
+        """
+        return {name: channel.as_dict()
+                for name, channel in self.stats.merged().channels.items()}
+
+
+class TransactionSummary:
+    """Aggregate transactions in a single scan.
+
+    Records are single-key dicts such as {"buy": 100}; "buy" and "sell"
+    amounts are totalled, other records are only counted. A non-numeric
+    amount marks the summary invalid and stops flow accumulation.
+
+    Attributes:
+        count: Number of records seen.
+        buy: Total bought amount.
+        sell: Total sold amount.
+        large: Number of buy/sell amounts above LARGE_TRANSACTION.
+        minimum: Smallest buy/sell amount, or None.
+        maximum: Largest buy/sell amount, or None.
+        invalid: True if a non-numeric amount was met.
+        sizes: Quantile sketch of buy/sell amounts.
+    """
+
+    __slots__ = ("count", "buy", "sell", "large", "minimum", "maximum",
+                 "invalid", "sizes")
+
+    def __init__(self, quantile_k: int = 200) -> None:
+        """Initialize an empty summary.
 
         Args:
-            data_batch: Raw batch to inspect.
-            criteria: Optional filtering rule.
+            quantile_k: Size parameter of the size quantile sketch.
+        """
+        self.sizes = QuantileSketch(quantile_k)
+        self.count = 0
+        self.buy: Union[int, float] = 0
+        self.sell: Union[int, float] = 0
+        self.large = 0
+        self.minimum: Optional[Union[int, float]] = None
+        self.maximum: Optional[Union[int, float]] = None
+        self.invalid = False
+
+    @property
+    def net(self) -> Union[int, float]:
+        """Return bought minus sold amount."""
+        return self.buy - self.sell
+
+    def update(self, records: Iterable[Any]) -> "TransactionSummary":
+        """Fold records into the summary in one pass.
+
+        Args:
+            records: Transaction records.
 
         Returns:
-            Filtered list based on criteria.
+            The summary itself.
         """
-        data_batch = super().filter_data(data_batch, criteria)
+        for chunk in _chunks(records):
+            count, buy, sell = self.count, self.buy, self.sell
+            large, low, high = self.large, self.minimum, self.maximum
+            invalid = self.invalid
+            sizes: List[Union[int, float]] = []
+            add_size = sizes.append
+            for record in chunk:
+                count += 1
+                if invalid or not isinstance(record, dict):
+                    continue
+                for key, amount in record.items():
+                    if key != "buy" and key != "sell":
+                        continue
+                    try:
+                        if key == "buy":
+                            buy += amount
+                        else:
+                            sell += amount
+                        if amount > LARGE_TRANSACTION:
+                            large += 1
+                        if low is None or amount < low:
+                            low = amount
+                        if high is None or amount > high:
+                            high = amount
+                    except TypeError:
+                        invalid = True
+                        break
+                    add_size(amount)
+            self.sizes.update_many(sizes)
+            self.count, self.buy, self.sell = count, buy, sell
+            self.large, self.minimum, self.maximum = large, low, high
+            self.invalid = invalid
+        return self
+
+    def merge(self, other: "TransactionSummary") -> "TransactionSummary":
+        """Add another summary; flows of invalid ones are skipped.
 
-        if not criteria:
-            return data_batch
+        Args:
+            other: Summary to fold in.
 
-        filtered = [data for data in data_batch
-                    if isinstance(data, dict) and len(data) == 1]
+        Returns:
+            The summary itself.
+        """
+        self.count += other.count
+        if other.invalid:
+            return self
+        self.buy += other.buy
+        self.sell += other.sell
+        self.large += other.large
+        if other.minimum is not None and (self.minimum is None
+                                          or other.minimum < self.minimum):
+            self.minimum = other.minimum
+        if other.maximum is not None and (self.maximum is None
+                                          or other.maximum > self.maximum):
+            self.maximum = other.maximum
+        self.sizes.merge(other.sizes)
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the summary as a JSON-serializable dictionary."""
+        return {"count": self.count, "buy": self.buy, "sell": self.sell,
+                "large": self.large, "min": self.minimum,
+                "max": self.maximum, "invalid": self.invalid,
+                "sizes": self.sizes.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TransactionSummary":
+        """Rebuild a summary saved by `to_dict`.
 
-        if criteria == "High-priority":
-            filtered = [data for data in filtered
-                        for key, value in data.items()
-                        if key == "pressure"
-                        and isinstance(value, (int, float))
-                        and value > 1020]
-        return filtered
+        Args:
+            data: Dictionary produced by `to_dict`.
 
-    def get_stats(self) -> Dict[str, Union[str, int, float]]:
-        """Return processed count and optional average temperature.
+        Returns:
+            The restored summary.
+        """
+        summary = cls()
+        summary.count, summary.large = data["count"], data["large"]
+        summary.buy, summary.sell = data["buy"], data["sell"]
+        summary.minimum, summary.maximum = data["min"], data["max"]
+        summary.invalid = data["invalid"]
+        summary.sizes = QuantileSketch.from_dict(data["sizes"])
+        return summary
+
+    def update_packed(self, batch: PackedBatch) -> "TransactionSummary":
+        """Fold a packed batch without building a dict per record.
+
+        Args:
+            batch: Packed transactions.
 
         Returns:
-            Dictionary with processed count and optional average temp.
+            The summary itself.
         """
-        stats = super().get_stats()
-        stats["processed"] = self.processed
-        if self.avg is not None:
-            stats["average"] = self.avg
-        return stats
+        if batch.values is None:
+            self.count += len(batch)
+            return self
+        sides = batch.lookup([BUY if key == "buy" else
+                              SELL if key == "sell" else 0
+                              for key in batch.keys])
+        return self.merge(self.from_columns(sides, batch.values,
+                                            self.sizes.k))
+
+    @classmethod
+    def from_columns(cls, sides: Sequence[int],
+                     amounts: Sequence[Union[int, float]],
+                     quantile_k: int = 200) -> "TransactionSummary":
+        """Aggregate a batch delivered as parallel arrays.
+
+        Uses vectorized NumPy reductions when NumPy is installed, and
+        chunked builtin reductions otherwise.
+
+        Args:
+            sides: BUY (1) or SELL (-1) per transaction; other values
+                are only counted.
+            amounts: Amount per transaction.
+            quantile_k: Size parameter of the size quantile sketch.
+
+        Returns:
+            Summary of the batch.
+        """
+        if len(sides) != len(amounts):
+            raise ValueError("sides and amounts differ in length")
+        summary = cls(quantile_k)
+        summary.count = len(sides)
+        np = _numpy()
+        if np is not None:
+            sides = np.asarray(sides)
+            amounts = np.asarray(amounts)
+            buy_mask = sides == BUY
+            sell_mask = sides == SELL
+            traded = amounts[buy_mask | sell_mask]
+            summary.buy = amounts[buy_mask].sum().item()
+            summary.sell = amounts[sell_mask].sum().item()
+            if traded.size:
+                summary.large = int(np.count_nonzero(
+                    traded > LARGE_TRANSACTION))
+                summary.minimum = traded.min().item()
+                summary.maximum = traded.max().item()
+                for start in range(0, traded.size, CHUNK_SIZE):
+                    summary.sizes.update_many(
+                        traded[start:start + CHUNK_SIZE].tolist())
+            return summary
+
+        is_buy, is_sell = partial(eq, BUY), partial(eq, SELL)
+        is_large = partial(lt, LARGE_TRANSACTION)
+        for start in range(0, len(sides), CHUNK_SIZE):
+            side_chunk = sides[start:start + CHUNK_SIZE]
+            amount_chunk = amounts[start:start + CHUNK_SIZE]
+            bought = list(compress(amount_chunk, map(is_buy, side_chunk)))
+            sold = list(compress(amount_chunk, map(is_sell, side_chunk)))
+            traded = bought + sold
+            if not traded:
+                continue
+            summary.buy += sum(bought)
+            summary.sell += sum(sold)
+            summary.large += sum(map(is_large, traded))
+            low, high = min(traded), max(traded)
+            if summary.minimum is None or low < summary.minimum:
+                summary.minimum = low
+            if summary.maximum is None or high > summary.maximum:
+                summary.maximum = high
+            summary.sizes.update_many(traded)
+        return summary
 
 
 class TransactionStream(DataStream):
@@ -182,25 +1202,47 @@ class TransactionStream(DataStream):
 
     Attributes:
         stream_id: Identifier for the transaction stream.
-        processed: Number of processed data.
-        net_flow: Net flows of transactions.
-        total_flow: Total flows of transactions.
-        large: Number of large transactions.
+        processed: Number of processed data over all batches.
+        net_flow: Bought minus sold amount over all batches.
+        total_flow: Bought plus sold amount over all batches.
+        large: Number of large transactions over all batches.
+        quantile_k: Size parameter of the size quantile sketch.
     """
 
-    def __init__(self, stream_id: str) -> None:
+    summary_type = TransactionSummary
+    record_predicate = staticmethod(_is_reading)
+    expression_guard = staticmethod(_is_record)
+    criteria_predicates = {"High-priority": _is_large_operation}
+
+    def __init__(self, stream_id: str,
+                 quantile_error: float = QUANTILE_ERROR) -> None:
         """Initialize TransactionStream.
 
         Args:
             stream_id: Identifier for the transaction stream.
+            quantile_error: Rank error of the transaction size
+                percentiles.
         """
         super().__init__(stream_id)
-        self.processed = 0
-        self.net_flow = 0
-        self.total_flow = 0
-        self.large = 0
+        self.quantile_k = QuantileSketch.k_for_error(quantile_error)
+
+    @property
+    def net_flow(self) -> Union[int, float]:
+        """Return bought minus sold amount over all batches."""
+        return self.stats.merged().net
 
-    def process_batch(self, data_batch: List[Any]) -> str:
+    @property
+    def total_flow(self) -> Union[int, float]:
+        """Return bought plus sold amount over all batches."""
+        totals = self.stats.merged()
+        return totals.buy + totals.sell
+
+    @property
+    def large(self) -> int:
+        """Return the number of large transactions over all batches."""
+        return self.stats.merged().large
+
+    def process_batch(self, data_batch: Iterable[Any]) -> str:
         """Compute net flow and count operations for a batch.
 
         Args:
@@ -209,76 +1251,249 @@ class TransactionStream(DataStream):
         Returns:
             Summary string including processed count and net flow.
         """
-        data_batch = self.filter_data(data_batch)
-        if not data_batch:
+        summary = self._scan(data_batch)
+        if summary is None:
             return "0 operations processed"
+        return self._summarize(summary)
 
-        self.net_flow = 0
-        length = len(data_batch)
-        res = f"{length} operations processed"
-        self.processed = length
+    def process_columns(self, sides: Sequence[int],
+                        amounts: Sequence[Union[int, float]]) -> str:
+        """Process a batch delivered as parallel side/amount arrays.
 
-        try:
-            self.net_flow += sum(value for data in data_batch
-                                 if isinstance(data, dict)
-                                 for key, value in data.items()
-                                 if key == "buy")
-            self.net_flow -= sum(value for data in data_batch
-                                 if isinstance(data, dict)
-                                 for key, value in data.items()
-                                 if key == "sell")
-            self.total_flow += self.net_flow
-        except (AttributeError, TypeError):
-            return res
+        Args:
+            sides: BUY (1) or SELL (-1) per transaction.
+            amounts: Amount per transaction.
 
-        if self.net_flow == 0:
+        Returns:
+            Summary string including processed count and net flow.
+        """
+        if not len(sides):
+            return "0 operations processed"
+        summary = TransactionSummary.from_columns(sides, amounts,
+                                                  self.quantile_k)
+        self.stats.add(summary)
+        return self._summarize(summary)
+
+    def new_summary(self) -> TransactionSummary:
+        """Return an empty transaction summary."""
+        return TransactionSummary(self.quantile_k)
+
+    def _summarize(self, summary: TransactionSummary) -> str:
+        """Render a batch summary.
+
+        Args:
+            summary: Aggregate of the processed batch.
+
+        Returns:
+            Summary string including processed count and net flow.
+        """
+        res = f"{summary.count} operations processed"
+        net_flow = summary.net
+        if summary.invalid or net_flow == 0:
             return res
 
         res += ", net flow: "
-        if self.net_flow > 0:
-            res += f"+{self.net_flow} units"
+        if net_flow > 0:
+            res += f"+{net_flow} units"
         else:
-            res += f"{self.net_flow} units"
+            res += f"{net_flow} units"
         return res
 
-    def filter_data(self, data_batch: List[Any],
-                    criteria: Optional[str] = None) -> List[Any]:
-        """Filter large transactions if criteria demands.
+    def get_stats(self) -> Dict[str, Union[str, int, float]]:
+        """Return cumulative counts, flows, large tally and size percentiles.
+
+        Returns:
+            Dictionary with counts, net and gross flows, large
+            transaction tally and p50/p95/p99 transaction sizes.
+        """
+        stats = super().get_stats()
+        totals = self.stats.merged()
+        stats["processed"] = totals.count
+        stats["net flow"] = totals.net
+        stats["total flow"] = totals.buy + totals.sell
+        if totals.large > 0:
+            stats["large"] = totals.large
+        if not totals.invalid and totals.sizes.n:
+            for name, value in totals.sizes.percentiles().items():
+                stats[f"size {name}"] = value
+        return stats
+
+
+class EventSummary:
+    """Aggregate events in a single scan.
+
+    Batches only tally exact occurrences per event with a `Counter`. The
+    Count-Min sketch of frequencies, the Space-Saving top-k and the
+    HyperLogLog distinct counter are built on first use and fed from the
+    tally, so a batch touches only the sketch cells of its own events and
+    an event type is hashed once per flush rather than once per message.
+    The tally is flushed into the sketches when they are read or once it
+    holds `TALLY_LIMIT` distinct events.
+
+    Attributes:
+        count: Number of records seen.
+        errors: Number of "error" events.
+        tally: Occurrences per event not yet fed into the sketches.
+        frequencies: Frequency estimate per event.
+        top: Most frequent events.
+        distinct: Distinct event counter.
+    """
+
+    __slots__ = ("count", "errors", "tally", "top_k", "width", "depth",
+                 "precision", "_sketches")
+
+    def __init__(self, top_k: int = TOP_EVENTS, width: int = 2048,
+                 depth: int = 4, precision: int = 12) -> None:
+        """Initialize an empty summary.
 
         Args:
-            data_batch: Raw batch to inspect.
-            criteria: Optional filtering rule.
+            top_k: Number of most frequent events tracked.
+            width: Counters per row of the frequency sketch.
+            depth: Rows of the frequency sketch.
+            precision: Register index bits of the distinct counter.
+        """
+        self.count = 0
+        self.errors = 0
+        self.tally: Counter = Counter()
+        self.top_k = top_k
+        self.width = width
+        self.depth = depth
+        self.precision = precision
+        self._sketches: Optional[
+            Tuple[CountMinSketch, SpaceSaving, HyperLogLog]] = None
+
+    def _sketched(self) -> Tuple[CountMinSketch, SpaceSaving, HyperLogLog]:
+        """Return the sketches, creating them once."""
+        if self._sketches is None:
+            self._sketches = (CountMinSketch(self.width, self.depth),
+                              SpaceSaving(self.top_k),
+                              HyperLogLog(self.precision))
+        return self._sketches
+
+    def _flush(self) -> Tuple[CountMinSketch, SpaceSaving, HyperLogLog]:
+        """Feed the pending tally into the sketches and return them."""
+        frequencies, top, distinct = sketches = self._sketched()
+        for event, occurrences in self.tally.items():
+            hashed = hash64(event)
+            frequencies.add_hash(hashed, occurrences)
+            distinct.add_hash(hashed)
+            top.add(event, occurrences)
+        self.tally = Counter()
+        return sketches
+
+    @property
+    def frequencies(self) -> CountMinSketch:
+        """Return the frequency sketch, including pending events."""
+        return self._flush()[0]
+
+    @property
+    def top(self) -> SpaceSaving:
+        """Return the top-k summary, including pending events."""
+        return self._flush()[1]
+
+    @property
+    def distinct(self) -> HyperLogLog:
+        """Return the distinct counter, including pending events."""
+        return self._flush()[2]
+
+    def update(self, records: Iterable[Any]) -> "EventSummary":
+        """Fold records into the summary in one pass.
+
+        Args:
+            records: Event messages.
 
         Returns:
-            Filtered list based on criteria.
+            The summary itself.
         """
-        data_batch = super().filter_data(data_batch, criteria)
+        for chunk in _chunks(records):
+            try:
+                counted = Counter(chunk)
+            except TypeError:
+                counted = Counter(event for event in chunk
+                                  if isinstance(event, str))
+            tally = self.tally
+            for event, occurrences in counted.items():
+                if isinstance(event, str):
+                    tally[event] += occurrences
+            self.errors += counted["error"]
+            self.count += len(chunk)
+            if len(tally) >= TALLY_LIMIT:
+                self._flush()
+        return self
+
+    def update_packed(self, batch: PackedBatch) -> "EventSummary":
+        """Fold a packed batch, tallying key codes instead of strings.
 
-        if not criteria:
-            return data_batch
+        Args:
+            batch: Packed events.
 
-        filtered = [data for data in data_batch
-                    if isinstance(data, dict) and len(data) == 1]
+        Returns:
+            The summary itself.
+        """
+        keys, tally = batch.keys, self.tally
+        errors = tally["error"]
+        for code, occurrences in Counter(batch.codes).items():
+            tally[keys[code]] += occurrences
+        self.errors += tally["error"] - errors
+        self.count += len(batch)
+        if len(tally) >= TALLY_LIMIT:
+            self._flush()
+        return self
+
+    def merge(self, other: "EventSummary") -> "EventSummary":
+        """Add another summary.
+
+        A summary without sketches, such as a batch, only adds its tally,
+        so merging it costs one step per distinct event of the batch.
 
-        if criteria == "High-priority":
-            filtered = [data for data in filtered for value in data.values()
-                        if isinstance(value, int) and value > 500]
-            self.large = len(filtered)
-        return filtered
+        Args:
+            other: Summary to fold in.
 
-    def get_stats(self) -> Dict[str, Union[str, int, float]]:
-        """Return processed totals and large transaction count.
+        Returns:
+            The summary itself.
+        """
+        self.count += other.count
+        self.errors += other.errors
+        if other._sketches is not None:
+            frequencies, top, distinct = self._sketched()
+            theirs = other._sketches
+            frequencies.merge(theirs[0])
+            top.merge(theirs[1])
+            distinct.merge(theirs[2])
+        tally = self.tally
+        for event, occurrences in other.tally.items():
+            tally[event] += occurrences
+        if len(tally) >= TALLY_LIMIT:
+            self._flush()
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the summary as a JSON-serializable dictionary."""
+        frequencies, top, distinct = self._flush()
+        return {"count": self.count, "errors": self.errors,
+                "frequencies": frequencies.to_dict(),
+                "top": top.to_dict(),
+                "distinct": distinct.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EventSummary":
+        """Rebuild a summary saved by `to_dict`.
+
+        Args:
+            data: Dictionary produced by `to_dict`.
 
         Returns:
-            Dictionary with counts, flows, and large transaction tally.
+            The restored summary.
         """
-        stats = super().get_stats()
-        stats["processed"] = self.processed
-        stats["net flow"] = self.net_flow
-        stats["total flow"] = self.total_flow
-        if self.large > 0:
-            stats["large"] = self.large
-        return stats
+        summary = cls()
+        summary.count, summary.errors = data["count"], data["errors"]
+        summary._sketches = (CountMinSketch.from_dict(data["frequencies"]),
+                             SpaceSaving.from_dict(data["top"]),
+                             HyperLogLog.from_dict(data["distinct"]))
+        frequencies, top, distinct = summary._sketches
+        summary.width, summary.depth = frequencies.width, frequencies.depth
+        summary.top_k, summary.precision = top.k, distinct.precision
+        return summary
 
 
 class EventStream(DataStream):
@@ -286,21 +1501,62 @@ class EventStream(DataStream):
 
     Attributes:
         stream_id: Identifier for the event stream.
-        processed: Number of processed data.
-        error: Number of errors
+        processed: Number of processed data over all batches.
+        error: Number of errors over all batches.
+        top_k: Number of most frequent events tracked.
+        precision: Register index bits of the distinct counter.
     """
 
-    def __init__(self, stream_id: str) -> None:
+    summary_type = EventSummary
+    record_predicate = staticmethod(_is_event)
+    criteria_predicates = {"High-priority": _is_error_event}
+
+    def __init__(self, stream_id: str, top_k: int = TOP_EVENTS,
+                 precision: int = 12) -> None:
         """Initialize EventStream.
 
         Args:
             stream_id: Identifier for the event stream.
+            top_k: Number of most frequent events tracked.
+            precision: Register index bits of the distinct counter
+                (relative error about 1.04 / sqrt(2 ** precision)).
         """
         super().__init__(stream_id)
-        self.processed = 0
-        self.error = 0
+        self.top_k = top_k
+        self.precision = precision
+
+    @property
+    def error(self) -> int:
+        """Return the number of error events over all batches."""
+        return self.stats.merged().errors
+
+    def top_events(self, n: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Return the most frequent events over all batches.
+
+        Args:
+            n: Number of events; `top_k` by default.
+
+        Returns:
+            (event, estimated count) pairs, most frequent first.
+        """
+        return self.stats.merged().top.top(n)
+
+    def event_frequency(self, event: str) -> int:
+        """Estimate how often an event occurred over all batches.
 
-    def process_batch(self, data_batch: List[Any]) -> str:
+        Args:
+            event: Event message.
+
+        Returns:
+            Estimated count, never lower than the true one.
+        """
+        return self.stats.merged().frequencies.estimate(event)
+
+    def distinct_events(self) -> int:
+        """Estimate the number of distinct events over all batches."""
+        return self.stats.merged().distinct.estimate()
+
+    def process_batch(self, data_batch: Iterable[Any]) -> str:
         """Count events and detect number of error entries.
 
         Args:
@@ -309,55 +1565,120 @@ class EventStream(DataStream):
         Returns:
             Summary string including event count and any errors.
         """
-        data_batch = self.filter_data(data_batch)
-        if not data_batch:
+        summary = self._scan(data_batch)
+        if summary is None:
             return "0 events processed"
+        return self._summarize(summary)
 
-        length = len(data_batch)
-        res = f"{length} events processed"
-        self.processed = length
+    def new_summary(self) -> EventSummary:
+        """Return an empty event summary."""
+        return EventSummary(self.top_k, precision=self.precision)
 
-        try:
-            self.error = len([data for data in data_batch if data == "error"])
-        except TypeError:
-            return res
+    def _summarize(self, summary: EventSummary) -> str:
+        """Render a batch summary.
+
+        Args:
+            summary: Aggregate of the processed batch.
 
-        if self.error > 0:
-            res += f", {self.error} error detected"
+        Returns:
+            Summary string including event count and any errors.
+        """
+        res = f"{summary.count} events processed"
+        if summary.errors > 0:
+            res += f", {summary.errors} error detected"
         return res
 
-    def filter_data(self, data_batch: List[Any],
-                    criteria: Optional[str] = None) -> List[Any]:
-        """Return only string events, optionally only errors.
+    def get_stats(self) -> Dict[str, Union[str, int, float]]:
+        """Return cumulative counts, distinct events and the top event.
+
+        Returns:
+            Dictionary with processed count, error total, distinct event
+            estimate and the most frequent event.
+        """
+        stats = super().get_stats()
+        totals = self.stats.merged()
+        stats["processed"] = totals.count
+        stats["error"] = totals.errors
+        if totals.top.counts:
+            stats["distinct"] = totals.distinct.estimate()
+            stats["top event"] = totals.top.top(1)[0][0]
+        return stats
+
+
+class StreamRegistry:
+    """Resolve stream ids to long-lived, cached stream instances.
+
+    The stream type is the part of the id before the first underscore
+    (e.g. "SENSOR" for "SENSOR_001" or "SENSOR_EU_0042"), so ids of any
+    length work. Each id is bound to one stream instance on first use and
+    that instance, with its accumulated state, is reused afterwards.
+
+    Attributes:
+        stream_types: Stream class per id prefix.
+        streams: Cached stream instance per stream id.
+    """
+
+    def __init__(self,
+                 stream_types: Optional[Dict[str, Type[DataStream]]] = None
+                 ) -> None:
+        """Initialize StreamRegistry.
 
         Args:
-            data_batch: Raw batch to inspect.
-            criteria: Optional filtering rule.
+            stream_types: Stream class per id prefix; defaults to the
+                sensor, transaction and event streams.
+        """
+        if stream_types is None:
+            stream_types = {
+                "SENSOR": SensorStream,
+                "TRANS": TransactionStream,
+                "EVENT": EventStream
+            }
+        self.stream_types: Dict[str, Type[DataStream]] = dict(stream_types)
+        self.streams: Dict[str, DataStream] = {}
+
+    @staticmethod
+    def parse_prefix(stream_id: str) -> str:
+        """Return the stream type prefix of a stream id.
+
+        Args:
+            stream_id: Identifier such as "SENSOR_001".
 
         Returns:
-            Filtered list based on criteria.
+            Prefix before the first underscore.
         """
-        data_batch = super().filter_data(data_batch, criteria)
+        return stream_id.partition("_")[0]
 
-        if not criteria:
-            return data_batch
+    def register_type(self, prefix: str,
+                      stream_class: Type[DataStream]) -> None:
+        """Map an id prefix to a stream class.
 
-        filtered = [data for data in data_batch if isinstance(data, str)]
+        Args:
+            prefix: Stream type prefix, e.g. "SENSOR".
+            stream_class: DataStream subclass handling that prefix.
+        """
+        self.stream_types[prefix] = stream_class
 
-        if criteria == "High-priority":
-            filtered = [data for data in filtered if data == "error"]
-        return filtered
+    def get(self, stream_id: str) -> Optional[DataStream]:
+        """Return the stream bound to `stream_id`, creating it once.
 
-    def get_stats(self) -> Dict[str, Union[str, int, float]]:
-        """Return processed count and error tally.
+        Args:
+            stream_id: Identifier of the stream.
 
         Returns:
-            Dictionary with processed count and error total.
+            Cached stream instance, or None for an unknown prefix.
         """
-        stats = super().get_stats()
-        stats["processed"] = self.processed
-        stats["error"] = self.error
-        return stats
+        stream = self.streams.get(stream_id)
+        if stream is None:
+            stream_class = self.stream_types.get(
+                self.parse_prefix(stream_id))
+            if stream_class is None:
+                return None
+            stream = stream_class(stream_id)
+            self.streams[stream_id] = stream
+        return stream
+
+
+STREAM_REGISTRY = StreamRegistry()
 
 
 class StreamProcessor:
@@ -365,28 +1686,29 @@ class StreamProcessor:
 
     Attributes:
         stream_id: Identifier for the event stream.
-        stream: Chosen DataStream
+        stream: Chosen DataStream, shared through the registry.
+        registry: Registry resolving the stream.
     """
 
-    def __init__(self, stream_id: str) -> None:
-        """Instantiate streams based on `stream_id` prefix.
+    ALERT_LABELS = {
+        "SENSOR": "{} critical sensor alerts",
+        "TRANS": "{} large transaction",
+        "EVENT": "{} errors"
+    }
+
+    def __init__(self, stream_id: str,
+                 registry: Optional[StreamRegistry] = None) -> None:
+        """Resolve the stream for `stream_id` through the registry.
 
         Args:
             stream_id: Identifier used to select concrete stream.
+            registry: Registry to use; defaults to `STREAM_REGISTRY`.
         """
         self.stream_id = stream_id
-        streams = {
-            "SENSOR": SensorStream,
-            "TRANS": TransactionStream,
-            "EVENT": EventStream
-        }
-        try:
-            stream = self.stream_id[:-4]
-            self.stream = streams[stream](self.stream_id)
-        except KeyError:
-            self.stream = None
+        self.registry = registry if registry is not None else STREAM_REGISTRY
+        self.stream = self.registry.get(stream_id)
 
-    def process_batch(self, data_batch: List[Any]) -> str:
+    def process_batch(self, data_batch: Iterable[Any]) -> str:
         """Process a batch through the selected stream, returning summary.
 
         Args:
@@ -399,7 +1721,7 @@ class StreamProcessor:
             return self.stream.process_batch(data_batch)
         return "ERROR: stream not found"
 
-    def filter_data(self, data_batch: List[Any],
+    def filter_data(self, data_batch: Iterable[Any],
                     criteria: Optional[str] = None) -> List[Any]:
         """Filter data batch using the stream-specific rules.
 
@@ -414,7 +1736,24 @@ class StreamProcessor:
             return self.stream.filter_data(data_batch, criteria)
         return list()
 
-    def filter_data_test(self, data_batch: List[Any],
+    def process_and_filter(self, data_batch: Iterable[Any],
+                           criteria: Optional[str] = None
+                           ) -> Tuple[str, List[Any]]:
+        """Process and filter a batch in one scan of the selected stream.
+
+        Args:
+            data_batch: Batch to process.
+            criteria: Optional filtering rule.
+
+        Returns:
+            Summary string and filtered data; an error message and an
+            empty list if stream not found.
+        """
+        if self.stream:
+            return self.stream.process_and_filter(data_batch, criteria)
+        return "ERROR: stream not found", list()
+
+    def filter_data_test(self, data_batch: Iterable[Any],
                          criteria: Optional[str] = None) -> str:
         """Test filter behavior and return formatted status.
 
@@ -425,20 +1764,26 @@ class StreamProcessor:
         Returns:
             Formatted status string describing filtered results.
         """
-        filtered = self.filter_data(data_batch, criteria)
+        return self.describe_filtered(self.filter_data(data_batch, criteria))
+
+    def describe_filtered(self, filtered: List[Any]) -> str:
+        """Describe filtered records with the stream-specific label.
+
+        Args:
+            filtered: Records kept by a filter.
+
+        Returns:
+            Formatted status string, empty if nothing was kept.
+        """
         length = len(filtered)
         if length < 1:
             return ""
-        results = {
-            "SENSOR": f"{length} critical sensor alerts",
-            "TRANS": f"{length} large transaction",
-            "EVENT": f"{length} errors"
-        }
-
         try:
-            return results[self.stream_id[:-4]]
+            label = self.ALERT_LABELS[self.registry.parse_prefix(
+                self.stream_id)]
         except KeyError:
             return "ERROR: Invalid Stream ID"
+        return label.format(length)
 
     def get_stats(self) -> Dict[str, Union[str, int, float]]:
         """Return stats from the underlying stream.
@@ -451,25 +1796,28 @@ class StreamProcessor:
         return dict()
 
 
-def polymorphic_stream_system(test_case: Dict) -> None:
+def polymorphic_stream_system(test_case: Dict,
+                              registry: Optional[StreamRegistry] = None
+                              ) -> None:
     """Run a single stream test case and print analysis output.
 
     Args:
         test_case: Dictionary describing the stream and batch to process.
+        registry: Registry resolving streams; defaults to
+            `STREAM_REGISTRY`.
     """
-    streams = {
-        "SENSOR": SensorStream,
-        "TRANS": TransactionStream,
-        "EVENT": EventStream
-    }
+    if registry is None:
+        registry = STREAM_REGISTRY
     try:
         stream = test_case["stream"]
         stream_id = test_case["stream_id"]
         stream_type = test_case["stream_type"]
         data_batch = test_case["batch"]
-        processor = streams[stream_id[:-4]](stream_id)
     except KeyError:
         return
+    processor = registry.get(stream_id)
+    if processor is None:
+        return
     processed_data = processor.process_batch(data_batch)
 
     data_batch_str = ""
@@ -483,14 +1831,23 @@ def polymorphic_stream_system(test_case: Dict) -> None:
           f"{stream} Analysis: {processed_data}\n")
 
 
-def polymorphic_stream_process(test_cases: List[Dict]) -> None:
+def polymorphic_stream_process(test_cases: List[Dict],
+                               registry: Optional[StreamRegistry] = None
+                               ) -> None:
     """Process multiple test cases through StreamProcessor.
 
+    Streams are resolved through the registry, so every stream keeps its
+    state across batches and filter passes.
+
     Args:
         test_cases: Collection of test case dictionaries to process.
+        registry: Registry resolving streams; defaults to
+            `STREAM_REGISTRY`.
     """
     print("Processing mixed stream types through unified interface...\n")
 
+    criteria = "High-priority"
+    alerts = []
     print("Batch 1 Results:")
     for test_case in test_cases:
         try:
@@ -499,27 +1856,17 @@ def polymorphic_stream_process(test_cases: List[Dict]) -> None:
             data_batch = test_case["batch"]
         except KeyError:
             continue
-        processor = StreamProcessor(stream_id)
-        processed_data = processor.process_batch(data_batch)
+        processor = StreamProcessor(stream_id, registry)
+        processed_data, filtered = processor.process_and_filter(data_batch,
+                                                                criteria)
         print(f"- {stream} data: {processed_data}")
+        alert = processor.describe_filtered(filtered)
+        if alert != "":
+            alerts.append(alert)
     print()
 
-    criteria = "High-priority"
     print(f"Stream filtering active: {criteria} data only")
-    results = ""
-    for test_case in test_cases:
-        try:
-            stream = test_case["stream"]
-            stream_id = test_case["stream_id"]
-            data_batch = test_case["batch"]
-        except KeyError:
-            continue
-        processor = StreamProcessor(stream_id)
-        res = processor.filter_data_test(data_batch, criteria)
-        if res != "" and results != "":
-            results += ", "
-        results += res
-    print(f"Filtered results: {results}\n")
+    print(f"Filtered results: {', '.join(alerts)}\n")
 
 
 def main() -> None:
@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+Stream Anomaly Detection
+
+Online, per-channel anomaly detection for sensor streams. Every reading
+is scored against the recent history of its channel and flagged when the
+score exceeds a threshold; detectors keep running statistics, so no
+history is ever rescanned.
+
+Classes:
+    Anomaly:
+        Describe a flagged reading.
+    EWMADetector:
+        Score readings against an exponentially weighted mean/stddev.
+    WindowDetector:
+        Score readings against a sliding window (z-score or MAD).
+    AnomalyMonitor:
+        Run one detector per channel and collect the alerts.
+
+Functions:
+    main():
+        Serve as entry point for demo execution.
+"""
+
+import math
+import random
+import threading
+from bisect import bisect_left, insort
+from collections import deque
+from functools import partial
+from typing import (Any, Callable, Deque, Dict, Iterable, Iterator, List,
+                    NamedTuple, Optional, Union)
+
+Number = Union[int, float]
+MAD_SCALE = 1.4826
+
+
+class Anomaly(NamedTuple):
+    """Describe a flagged reading.
+
+    Attributes:
+        channel: Channel of the reading, e.g. "temp".
+        index: Position of the reading within its channel.
+        value: The reading.
+        expected: Mean (or median) the reading was compared with.
+        score: Deviation from `expected` in standard deviations.
+    """
+
+    channel: str
+    index: int
+    value: Number
+    expected: float
+    score: float
+
+
+class EWMADetector:
+    """Score readings against an exponentially weighted mean and stddev.
+
+    Both moments are updated in O(1) per reading; `alpha` sets how fast
+    old readings are forgotten (about 2 / alpha - 1 readings of memory).
+
+    Attributes:
+        alpha: Smoothing factor between 0 and 1.
+        threshold: Score above which a reading is anomalous.
+        warmup: Readings observed before any reading is scored.
+        mean: Current weighted mean.
+        variance: Current weighted variance.
+        count: Number of readings observed.
+    """
+
+    def __init__(self, alpha: float = 0.05, threshold: float = 3.0,
+                 warmup: int = 30) -> None:
+        """Initialize EWMADetector.
+
+        Args:
+            alpha: Smoothing factor between 0 and 1.
+            threshold: Score above which a reading is anomalous.
+            warmup: Readings observed before any reading is scored.
+        """
+        if not 0 < alpha < 1:
+            raise ValueError("alpha must be between 0 and 1")
+        self.alpha = alpha
+        self.threshold = threshold
+        self.warmup = warmup
+        self.mean = 0.0
+        self.variance = 0.0
+        self.count = 0
+
+    @property
+    def expected(self) -> float:
+        """Return the value readings are compared with."""
+        return self.mean
+
+    def observe(self, value: Number) -> float:
+        """Score a reading, then fold it into the running moments.
+
+        Args:
+            value: Reading to score.
+
+        Returns:
+            Absolute z-score of the reading; 0.0 during warm-up.
+        """
+        self.count += 1
+        if self.count == 1:
+            self.mean = float(value)
+            return 0.0
+        diff = value - self.mean
+        score = 0.0
+        if self.count > self.warmup and self.variance > 0:
+            score = abs(diff) / math.sqrt(self.variance)
+        increment = self.alpha * diff
+        self.mean += increment
+        self.variance = (1 - self.alpha) * (self.variance + diff * increment)
+        return score
+
+
+class WindowDetector:
+    """Score readings against the last `window` readings of a channel.
+
+    "zscore" keeps a ring buffer with incrementally updated mean and sum
+    of squared deviations, so each reading costs O(1). "mad" keeps the
+    window sorted (binary search plus one memmove per reading) and scores
+    against the median and the median absolute deviation, which ignores
+    the outliers it is looking for. The deviations from the current
+    median form two sorted runs of the window (below and above the
+    median), so their median is found by binary search in O(log^2 n).
+
+    Attributes:
+        window: Number of readings in the window.
+        threshold: Score above which a reading is anomalous.
+        method: "zscore" or "mad".
+        count: Number of readings observed.
+    """
+
+    METHODS = ("zscore", "mad")
+
+    def __init__(self, window: int = 100, threshold: float = 3.0,
+                 method: str = "zscore") -> None:
+        """Initialize WindowDetector.
+
+        Args:
+            window: Number of readings in the window (at least 2).
+            threshold: Score above which a reading is anomalous.
+            method: "zscore" or "mad".
+        """
+        if window < 2:
+            raise ValueError("window must be at least 2")
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown method: {method}")
+        self.window = window
+        self.threshold = threshold
+        self.method = method
+        self.count = 0
+        self._ring: Deque[Number] = deque()
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._sorted: List[Number] = []
+        self._expected = 0.0
+
+    @property
+    def expected(self) -> float:
+        """Return the value the last reading was compared with."""
+        return self._expected
+
+    def _zscore(self, value: Number) -> float:
+        """Score against the window mean, then slide the window."""
+        n = len(self._ring)
+        self._expected = self._mean
+        score = 0.0
+        if n == self.window and self._m2 > 0:
+            score = abs(value - self._mean) / math.sqrt(self._m2 / (n - 1))
+        if n == self.window:
+            old = self._ring.popleft()
+            n -= 1
+            if n:
+                old_mean = self._mean
+                self._mean -= (old - old_mean) / n
+                self._m2 -= (old - old_mean) * (old - self._mean)
+            else:
+                self._mean = self._m2 = 0.0
+        self._ring.append(value)
+        n += 1
+        diff = value - self._mean
+        self._mean += diff / n
+        self._m2 = max(0.0, self._m2 + diff * (value - self._mean))
+        return score
+
+    def _median(self) -> float:
+        """Return the median of the window."""
+        values = self._sorted
+        half = len(values) // 2
+        if len(values) % 2:
+            return float(values[half])
+        return (values[half - 1] + values[half]) / 2
+
+    def _mad_spread(self, median: float) -> float:
+        """Return the median absolute deviation of the window.
+
+        Deviations of the values below `median`, read downwards, and of
+        the values from `median` up, read upwards, are two ascending
+        runs; the k-th smallest deviation is selected across them.
+        """
+        values = self._sorted
+        n = len(values)
+        split = bisect_left(values, median)
+
+        def below(i: int) -> float:
+            return median - values[split - 1 - i]
+
+        def above(j: int) -> float:
+            return values[split + j] - median
+
+        def kth(k: int) -> float:
+            lo, hi = max(0, k + 1 - (n - split)), min(k + 1, split)
+            while lo < hi:
+                i = (lo + hi) // 2
+                if below(i) < above(k - i):
+                    lo = i + 1
+                else:
+                    hi = i
+            j = k + 1 - lo
+            candidates = []
+            if lo:
+                candidates.append(below(lo - 1))
+            if j:
+                candidates.append(above(j - 1))
+            return max(candidates)
+
+        if n % 2:
+            return kth(n // 2)
+        return (kth(n // 2 - 1) + kth(n // 2)) / 2
+
+    def _mad(self, value: Number) -> float:
+        """Score against the window median, then slide the window."""
+        values = self._sorted
+        score = 0.0
+        median = self._median() if values else float(value)
+        self._expected = median
+        if len(values) == self.window:
+            spread = self._mad_spread(median)
+            if spread > 0:
+                score = abs(value - median) / (MAD_SCALE * spread)
+            old = self._ring.popleft()
+            del values[bisect_left(values, old)]
+        self._ring.append(value)
+        insort(values, value)
+        return score
+
+    def observe(self, value: Number) -> float:
+        """Score a reading, then add it to the window.
+
+        Args:
+            value: Reading to score.
+
+        Returns:
+            Deviation in standard deviations; 0.0 until the window fills.
+        """
+        self.count += 1
+        if self.method == "mad":
+            return self._mad(value)
+        return self._zscore(value)
+
+
+Detector = Union[EWMADetector, WindowDetector]
+
+
+class AnomalyMonitor:
+    """Run one detector per channel and collect the alerts.
+
+    Attributes:
+        factory: Callable returning a fresh detector for a channel.
+        detectors: Detector per channel.
+        alerts: Most recent anomalies, oldest first.
+        counts: Number of anomalies per channel.
+        on_alert: Optional callback invoked with every anomaly.
+    """
+
+    def __init__(self, factory: Callable[[], Detector] = EWMADetector,
+                 history: int = 100,
+                 on_alert: Optional[Callable[[Anomaly], Any]] = None
+                 ) -> None:
+        """Initialize AnomalyMonitor.
+
+        Args:
+            factory: Callable returning a fresh detector, e.g.
+                `partial(WindowDetector, window=50, method="mad")`.
+            history: Number of recent anomalies kept in `alerts`.
+            on_alert: Optional callback invoked with every anomaly.
+        """
+        self.factory = factory
+        self.detectors: Dict[str, Detector] = {}
+        self.alerts: Deque[Anomaly] = deque(maxlen=history)
+        self.counts: Dict[str, int] = {}
+        self.on_alert = on_alert
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle everything but the lock."""
+        state = dict(self.__dict__)
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore the state with a fresh lock."""
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def observe_many(self, channel: str,
+                     values: Iterable[Number]) -> List[Anomaly]:
+        """Score readings of one channel, in arrival order.
+
+        Args:
+            channel: Channel of the readings.
+            values: Readings to score.
+
+        Returns:
+            Anomalies found among the readings.
+        """
+        found = []
+        with self._lock:
+            detector = self.detectors.get(channel)
+            if detector is None:
+                detector = self.detectors[channel] = self.factory()
+            observe, threshold = detector.observe, detector.threshold
+            for value in values:
+                score = observe(value)
+                if score > threshold:
+                    found.append(Anomaly(channel, detector.count - 1, value,
+                                         detector.expected, score))
+            if found:
+                self.alerts.extend(found)
+                self.counts[channel] = (self.counts.get(channel, 0)
+                                        + len(found))
+        if self.on_alert is not None:
+            for anomaly in found:
+                self.on_alert(anomaly)
+        return found
+
+    def observe(self, channel: str, value: Number) -> Optional[Anomaly]:
+        """Score a single reading.
+
+        Args:
+            channel: Channel of the reading.
+            value: Reading to score.
+
+        Returns:
+            The anomaly, or None if the reading is normal.
+        """
+        found = self.observe_many(channel, (value,))
+        return found[0] if found else None
+
+    def feed(self, records: Iterable[Any]) -> Iterator[Anomaly]:
+        """Score readings as they flow and yield anomalies immediately.
+
+        Args:
+            records: Sensor readings such as {"temp": 22.5}.
+
+        Yields:
+            Anomalies, in arrival order.
+        """
+        for record in records:
+            if not isinstance(record, dict):
+                continue
+            for channel, value in record.items():
+                if isinstance(value, (int, float)):
+                    yield from self.observe_many(channel, (value,))
+
+    def drain(self) -> List[Anomaly]:
+        """Return and forget the recent anomalies."""
+        with self._lock:
+            alerts = list(self.alerts)
+            self.alerts.clear()
+        return alerts
+
+
+def main() -> None:
+    """Inject spikes into a noisy channel and report what is flagged."""
+    print("=== CODE NEXUS - SENSOR ANOMALY DETECTION ===\n")
+    rng = random.Random(7)
+    readings = [22.0 + rng.gauss(0, 0.5) for _ in range(2000)]
+    for index in (500, 1200, 1800):
+        readings[index] += 8.0
+    detectors = {
+        "EWMA": partial(EWMADetector, threshold=4.0),
+        "Window z-score": partial(WindowDetector, window=200),
+        "Window MAD": partial(WindowDetector, window=200, method="mad",
+                              threshold=5.0)
+    }
+    for name, factory in detectors.items():
+        monitor = AnomalyMonitor(factory)
+        flagged = monitor.observe_many("temp", readings)
+        print(f"{name}: flagged readings "
+              f"{[anomaly.index for anomaly in flagged]}")
+
+
+if __name__ == "__main__":
+    main()
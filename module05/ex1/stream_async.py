@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Stream Async Ingestion
+
+Feed streams from asyncio producers (sockets, message consumers...)
+through a bounded queue. When processing falls behind, the queue fills up
+and `put` suspends the producers, so memory stays bounded by the queue
+size instead of growing with the backlog.
+
+Classes:
+    StreamIngestor:
+        Bounded, instrumented queue between producers and a stream.
+
+Functions:
+    achunks:
+        Read records from a queue or (async) iterable in chunks.
+    main():
+        Serve as entry point for demo execution.
+"""
+
+import asyncio
+import random
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, List, Union
+
+from data_stream import (DataStream, SensorStream, TransactionStream,
+                         CHUNK_SIZE)
+
+STREAM_END = object()
+
+Source = Union[asyncio.Queue, AsyncIterator[Any], Iterable[Any]]
+
+
+async def achunks(source: Source,
+                  size: int = CHUNK_SIZE) -> AsyncIterator[List[Any]]:
+    """Read records in lists of at most `size` items.
+
+    A queue is read until STREAM_END is received; records already queued
+    are drained without suspending, so a chunk costs one await rather
+    than one per record.
+
+    Args:
+        source: asyncio.Queue, async iterable or plain iterable.
+        size: Maximum records per chunk.
+
+    Yields:
+        Chunks of records.
+    """
+    if isinstance(source, asyncio.Queue):
+        done = False
+        while not done:
+            chunk = []
+            item = await source.get()
+            while True:
+                source.task_done()
+                if item is STREAM_END:
+                    done = True
+                    break
+                chunk.append(item)
+                if len(chunk) == size or source.empty():
+                    break
+                item = source.get_nowait()
+            if chunk:
+                yield chunk
+    elif hasattr(source, "__aiter__"):
+        chunk = []
+        async for item in source:
+            chunk.append(item)
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    else:
+        chunk = []
+        for item in source:
+            chunk.append(item)
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+class StreamIngestor:
+    """Bounded, instrumented queue between async producers and a stream.
+
+    Each chunk drained from the queue is processed as one batch, so the
+    stream statistics follow the ingestion as it happens.
+
+    Attributes:
+        stream: Stream fed by the producers.
+        queue: Bounded queue of pending records.
+        put_waits: Number of puts suspended on a full queue.
+        put_wait_time: Total time producers spent suspended, in seconds.
+        max_depth: Highest queue depth observed.
+        consumed: Number of records processed.
+        batches: Number of batches processed.
+    """
+
+    def __init__(self, stream: DataStream, maxsize: int = CHUNK_SIZE,
+                 chunk_size: int = CHUNK_SIZE) -> None:
+        """Initialize StreamIngestor.
+
+        Args:
+            stream: Stream fed by the producers.
+            maxsize: Maximum number of queued records (at least 1).
+            chunk_size: Maximum records processed per batch.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.stream = stream
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.chunk_size = chunk_size
+        self.put_waits = 0
+        self.put_wait_time = 0.0
+        self.max_depth = 0
+        self.consumed = 0
+        self.batches = 0
+
+    async def put(self, record: Any) -> None:
+        """Queue a record, waiting while the queue is full.
+
+        Args:
+            record: Record for the stream.
+        """
+        queue = self.queue
+        if queue.full():
+            self.put_waits += 1
+            start = time.perf_counter()
+            await queue.put(record)
+            self.put_wait_time += time.perf_counter() - start
+        else:
+            queue.put_nowait(record)
+        depth = queue.qsize()
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    async def produce(self, source: Union[AsyncIterator[Any],
+                                          Iterable[Any]]) -> int:
+        """Queue every record of a producer.
+
+        Args:
+            source: Async iterable or plain iterable of records.
+
+        Returns:
+            Number of records queued.
+        """
+        count = 0
+        if hasattr(source, "__aiter__"):
+            async for record in source:
+                await self.put(record)
+                count += 1
+        else:
+            for record in source:
+                await self.put(record)
+                count += 1
+        return count
+
+    async def consume(self) -> int:
+        """Process queued records until the queue is closed.
+
+        Returns:
+            Number of records processed.
+        """
+        async for chunk in achunks(self.queue, self.chunk_size):
+            self.stream.process_batch(chunk)
+            self.consumed += len(chunk)
+            self.batches += 1
+            await asyncio.sleep(0)
+        return self.consumed
+
+    async def close(self) -> None:
+        """Tell the consumer that no more records will come."""
+        await self.queue.put(STREAM_END)
+
+    async def ingest(self, *sources: Union[AsyncIterator[Any],
+                                           Iterable[Any]]
+                     ) -> Dict[str, Any]:
+        """Run producers concurrently against one consumer.
+
+        Args:
+            sources: One async or plain iterable per producer.
+
+        Returns:
+            Statistics of the stream once every record is processed.
+        """
+        consumer = asyncio.ensure_future(self.consume())
+        try:
+            await asyncio.gather(*(self.produce(source)
+                                   for source in sources))
+            await self.close()
+            await consumer
+        finally:
+            consumer.cancel()
+        return self.stream.get_stats()
+
+    def metrics(self) -> Dict[str, Union[int, float]]:
+        """Report queue depth and backpressure counters.
+
+        Returns:
+            Dictionary of ingestion metrics.
+        """
+        return {
+            "depth": self.queue.qsize(),
+            "max_depth": self.max_depth,
+            "capacity": self.queue.maxsize,
+            "consumed": self.consumed,
+            "batches": self.batches,
+            "put_waits": self.put_waits,
+            "put_wait_ms": round(self.put_wait_time * 1000, 3)
+        }
+
+
+async def _socket(rng: random.Random, make: Any,
+                  count: int) -> AsyncIterator[Any]:
+    """Simulate a socket delivering `count` records in small bursts."""
+    for index in range(count):
+        if index % 100 == 0:
+            await asyncio.sleep(rng.random() * 0.001)
+        yield make()
+
+
+async def _demo() -> None:
+    """Feed two streams from many simulated sockets."""
+    rng = random.Random(5)
+    sensors = StreamIngestor(SensorStream("SENSOR_ASYNC"), maxsize=256)
+    trades = StreamIngestor(TransactionStream("TRANS_ASYNC"), maxsize=256)
+    await asyncio.gather(
+        sensors.ingest(*(_socket(rng, lambda: {"temp": rng.gauss(21, 1)},
+                                 5000) for _ in range(8))),
+        trades.ingest(*(_socket(rng, lambda: {rng.choice(("buy", "sell")):
+                                              rng.randint(1, 800)}, 5000)
+                        for _ in range(8)))
+    )
+    for ingestor in (sensors, trades):
+        metrics = ingestor.metrics()
+        print(f"{ingestor.stream.stream_id}: "
+              f"{metrics['consumed']} records in {metrics['batches']} "
+              f"batches, max depth {metrics['max_depth']}/"
+              f"{metrics['capacity']}, {metrics['put_waits']} throttled puts")
+
+
+def main() -> None:
+    """Run the async ingestion demo."""
+    print("=== CODE NEXUS - ASYNC STREAM INGESTION ===\n")
+    asyncio.run(_demo())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Stream Benchmarks
+
+Generate skewed, realistic workloads for the streams of `data_stream` and
+measure throughput and memory per stream class and per filter criterion.
+Results are printed as JSON; with --baseline, a drop in throughput beyond
+the tolerance exits non-zero so regressions are caught early.
+
+Workloads:
+    sensor:
+        Drifting, noisy temp/humidity/pressure readings with spikes and
+        a few malformed values.
+    transaction:
+        Pareto-sized buy/sell operations arriving in calm and bursty
+        phases.
+    event:
+        Event types drawn from a Zipf distribution.
+
+Functions:
+    sensor_load:
+        Yield noisy sensor readings.
+    transaction_load:
+        Yield bursty transactions.
+    event_load:
+        Yield Zipf-distributed events.
+    measure:
+        Return ops/sec and peak memory of one operation.
+    run_benchmarks:
+        Measure every stream class, criterion and StreamProcessor.
+    main:
+        Run the benchmarks and compare against a baseline.
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from itertools import accumulate
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from data_stream import (SensorStream, TransactionStream, EventStream,
+                         StreamProcessor, StreamRegistry, SENSOR_CHANNELS)
+from stream_wire import PackedBatch
+
+EVENT_TYPES = ("login", "logout", "view", "click", "search", "purchase",
+               "error", "timeout", "retry", "signup")
+CRITERIA = (None, "High-priority")
+
+
+def sensor_load(count: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """Yield noisy single-channel sensor readings.
+
+    Each channel drifts slowly around its baseline with Gaussian noise;
+    about 0.1% of readings are spikes and 0.05% are malformed.
+
+    Args:
+        count: Number of readings.
+        seed: Seed of the generator.
+
+    Yields:
+        Readings such as {"temp": 22.4}.
+    """
+    rng = random.Random(seed)
+    baselines = {"temp": 22.0, "humidity": 55.0, "pressure": 1013.0}
+    noise = {"temp": 0.4, "humidity": 2.0, "pressure": 3.0}
+    drift = dict.fromkeys(SENSOR_CHANNELS, 0.0)
+    for _ in range(count):
+        channel = rng.choice(SENSOR_CHANNELS)
+        drift[channel] += rng.gauss(0, noise[channel] * 0.01)
+        roll = rng.random()
+        if roll < 0.0005:
+            yield {channel: "n/a"}
+            continue
+        value = baselines[channel] + drift[channel]
+        value += rng.gauss(0, noise[channel])
+        if roll < 0.0015:
+            value += noise[channel] * rng.choice((-10, 10))
+        yield {channel: round(value, 2)}
+
+
+def transaction_load(count: int,
+                     seed: int = 0) -> Iterator[Dict[str, int]]:
+    """Yield buy/sell operations with calm and bursty phases.
+
+    Amounts follow a Pareto distribution; during bursts they are five
+    times larger and skewed towards one side.
+
+    Args:
+        count: Number of operations.
+        seed: Seed of the generator.
+
+    Yields:
+        Operations such as {"buy": 120}.
+    """
+    rng = random.Random(seed)
+    produced = 0
+    while produced < count:
+        burst = rng.random() < 0.2
+        length = min(count - produced, rng.randint(50, 500))
+        scale = 50 if not burst else 250
+        buy_share = 0.5 if not burst else rng.choice((0.1, 0.9))
+        for _ in range(length):
+            side = "buy" if rng.random() < buy_share else "sell"
+            yield {side: int(scale * rng.paretovariate(2.0))}
+        produced += length
+
+
+def event_load(count: int, seed: int = 0,
+               exponent: float = 1.1) -> Iterator[str]:
+    """Yield event types drawn from a Zipf distribution.
+
+    Args:
+        count: Number of events.
+        seed: Seed of the generator.
+        exponent: Skew of the distribution; larger is more skewed.
+
+    Yields:
+        Event messages such as "login".
+    """
+    rng = random.Random(seed)
+    weights = [1 / rank ** exponent
+               for rank in range(1, len(EVENT_TYPES) + 1)]
+    cumulative = list(accumulate(weights))
+    remaining = count
+    while remaining > 0:
+        size = min(remaining, 4096)
+        yield from rng.choices(EVENT_TYPES, cum_weights=cumulative, k=size)
+        remaining -= size
+
+
+def measure(operation: Callable[[], Any], records: int,
+            repeat: int = 3) -> Dict[str, float]:
+    """Measure throughput and peak memory of an operation.
+
+    Timing runs without tracing; peak memory is taken from one extra,
+    traced run so tracing overhead does not skew throughput.
+
+    Args:
+        operation: Callable processing `records` records.
+        records: Number of records handled per call.
+        repeat: Timed runs; the fastest one is reported.
+
+    Returns:
+        Dictionary with "ops_per_sec" and "peak_kib".
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        operation()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        operation()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "ops_per_sec": round(records / best),
+        "peak_kib": round(peak / 1024, 1)
+    }
+
+
+def run_benchmarks(records: int = 100000,
+                   repeat: int = 3) -> Dict[str, Dict[str, Any]]:
+    """Measure every stream class, filter criterion and StreamProcessor.
+
+    Args:
+        records: Records per workload.
+        repeat: Timed runs per measurement.
+
+    Returns:
+        Results keyed by stream class, then by operation.
+    """
+    workloads = {
+        "SensorStream": (SensorStream, "SENSOR_BENCH",
+                         list(sensor_load(records))),
+        "TransactionStream": (TransactionStream, "TRANS_BENCH",
+                              list(transaction_load(records))),
+        "EventStream": (EventStream, "EVENT_BENCH",
+                        list(event_load(records)))
+    }
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, (stream_class, stream_id, batch) in workloads.items():
+        stream = stream_class(stream_id)
+        section: Dict[str, Any] = {
+            "process_batch": measure(lambda: stream.process_batch(batch),
+                                     records, repeat),
+            "generator_feed": measure(
+                lambda: stream.process_batch(iter(batch)), records, repeat),
+            "summary.update": measure(
+                lambda: stream.new_summary().update(batch), records, repeat)
+        }
+        clean = [record for record in batch if not isinstance(record, dict)
+                 or all(isinstance(value, (int, float))
+                        for value in record.values())]
+        packed = PackedBatch.from_records(clean).encode()
+        section["process_packed"] = measure(
+            lambda: stream.process_packed(packed), len(clean), repeat)
+        for criteria in CRITERIA:
+            section[f"filter_data[{criteria}]"] = measure(
+                lambda: stream.filter_data(iter(batch), criteria), records,
+                repeat)
+
+        registry = StreamRegistry()
+        processor = StreamProcessor(stream_id, registry)
+        section["StreamProcessor.process_and_filter"] = measure(
+            lambda: processor.process_and_filter(batch, "High-priority"),
+            records, repeat)
+        results[name] = section
+    return results
+
+
+def _regressions(results: Dict[str, Dict[str, Any]],
+                 baseline: Dict[str, Dict[str, Any]],
+                 tolerance: float) -> List[str]:
+    """List operations whose throughput dropped beyond the tolerance.
+
+    Args:
+        results: Fresh benchmark results.
+        baseline: Earlier results to compare with.
+        tolerance: Allowed relative drop, e.g. 0.2 for 20%.
+
+    Returns:
+        Description of each regression.
+    """
+    found = []
+    for name, section in results.items():
+        for operation, metrics in section.items():
+            before = baseline.get(name, {}).get(operation)
+            if not before:
+                continue
+            floor = before["ops_per_sec"] * (1 - tolerance)
+            if metrics["ops_per_sec"] < floor:
+                found.append(f"{name}.{operation}: "
+                             f"{metrics['ops_per_sec']} ops/sec < "
+                             f"{before['ops_per_sec']} baseline")
+    return found
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the benchmarks and exit non-zero on throughput regressions."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--records", type=int, default=100000,
+                        help="records per workload")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="timed runs per measurement")
+    parser.add_argument("--baseline",
+                        help="JSON results to compare throughput with")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed relative throughput drop")
+    parser.add_argument("--output", help="also write results to this file")
+    args = parser.parse_args(argv)
+
+    report = {
+        "records": args.records,
+        "python": sys.version.split()[0],
+        "results": run_benchmarks(args.records, args.repeat)
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = _regressions(report["results"], baseline,
+                                   args.tolerance)
+        for regression in regressions:
+            print(f"FAIL: {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Stream Dispatcher
+
+Process a mixed feed of (stream_id, batch) pairs with every stream handled
+concurrently. The feed is grouped by stream id; each group is one task, so
+batches of a stream keep their order while independent streams run side
+by side on a thread or process pool.
+
+Thread workers update the registry streams directly. Process workers get
+a pickled copy of a stream with empty statistics and send back the merged
+summary of their batches, which is folded into the registry stream; use
+them for CPU-bound feeds, as threads share one interpreter lock.
+
+Classes:
+    StreamDispatcher:
+        Group a mixed feed by stream and process the groups in parallel.
+
+Functions:
+    main():
+        Serve as entry point for demo execution.
+"""
+
+import os
+import random
+import time
+from concurrent.futures import (Executor, ProcessPoolExecutor,
+                                ThreadPoolExecutor)
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from data_stream import DataStream, StreamRegistry, STREAM_REGISTRY
+
+STREAM_NOT_FOUND = "ERROR: stream not found"
+
+
+def _process_group(stream: DataStream, batches: List[Any]) -> List[str]:
+    """Process the batches of one stream in order.
+
+    Args:
+        stream: Stream handling the batches.
+        batches: Batches of the stream, in feed order.
+
+    Returns:
+        Summary string per batch.
+    """
+    return [stream.process_batch(batch) for batch in batches]
+
+
+def _process_group_remote(stream: DataStream,
+                          batches: List[Any]) -> Tuple[List[str], Any]:
+    """Process the batches of a pickled stream copy in a worker process.
+
+    Args:
+        stream: Copy of the stream, with empty statistics.
+        batches: Batches of the stream, in feed order.
+
+    Returns:
+        Summary string per batch and the merged summary of the batches.
+    """
+    return _process_group(stream, batches), stream.stats.merged()
+
+
+class StreamDispatcher:
+    """Process a mixed (stream_id, batch) feed on a worker pool.
+
+    Attributes:
+        THREAD: Mode running groups on a thread pool.
+        PROCESS: Mode running groups on a process pool.
+        registry: Registry resolving stream ids.
+        workers: Maximum number of concurrent groups.
+        mode: THREAD or PROCESS.
+    """
+
+    THREAD = "thread"
+    PROCESS = "process"
+
+    def __init__(self, registry: Optional[StreamRegistry] = None,
+                 workers: Optional[int] = None,
+                 mode: str = THREAD) -> None:
+        """Initialize StreamDispatcher.
+
+        Args:
+            registry: Registry resolving streams; defaults to
+                `STREAM_REGISTRY`.
+            workers: Maximum number of concurrent groups; defaults to the
+                number of CPUs.
+            mode: THREAD or PROCESS; process mode needs picklable batches.
+        """
+        if mode not in (self.THREAD, self.PROCESS):
+            raise ValueError(f"Unknown dispatch mode: {mode}")
+        if workers is not None and workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.registry = registry if registry is not None else STREAM_REGISTRY
+        self.workers = workers or os.cpu_count() or 1
+        self.mode = mode
+
+    @staticmethod
+    def group(feed: Iterable[Tuple[str, Any]]) -> Dict[str, List[Any]]:
+        """Group a feed by stream id, keeping the order of each stream.
+
+        Args:
+            feed: (stream_id, batch) pairs.
+
+        Returns:
+            Batches per stream id, streams in order of first appearance.
+        """
+        groups: Dict[str, List[Any]] = {}
+        for stream_id, batch in feed:
+            groups.setdefault(stream_id, []).append(batch)
+        return groups
+
+    def _executor(self, tasks: int) -> Executor:
+        """Return a pool sized for `tasks` groups."""
+        workers = max(1, min(self.workers, tasks))
+        if self.mode == self.PROCESS:
+            return ProcessPoolExecutor(workers)
+        return ThreadPoolExecutor(workers)
+
+    def dispatch(self, feed: Iterable[Tuple[str, Any]]
+                 ) -> Dict[str, Dict[str, Any]]:
+        """Process a mixed feed and return per-stream results.
+
+        Args:
+            feed: (stream_id, batch) pairs.
+
+        Returns:
+            Dictionary mapping each stream id to its "batches" summaries,
+            in feed order, and its merged "stats".
+        """
+        groups = self.group(feed)
+        report: Dict[str, Dict[str, Any]] = {}
+        streams: Dict[str, DataStream] = {}
+        for stream_id, batches in groups.items():
+            stream = self.registry.get(stream_id)
+            if stream is None:
+                report[stream_id] = {
+                    "batches": [STREAM_NOT_FOUND] * len(batches),
+                    "stats": {}
+                }
+            else:
+                streams[stream_id] = stream
+
+        if streams:
+            remote = self.mode == self.PROCESS
+            task = _process_group_remote if remote else _process_group
+            with self._executor(len(streams)) as pool:
+                futures = {
+                    stream_id: pool.submit(task, stream, groups[stream_id])
+                    for stream_id, stream in streams.items()
+                }
+                for stream_id, future in futures.items():
+                    results = future.result()
+                    if remote:
+                        results, summary = results
+                        streams[stream_id].stats.add(summary)
+                    report[stream_id] = {"batches": results}
+            for stream_id, stream in streams.items():
+                report[stream_id]["stats"] = stream.get_stats()
+        return {stream_id: report[stream_id] for stream_id in groups}
+
+
+def _demo_feed(batches: int, size: int) -> List[Tuple[str, Any]]:
+    """Build a shuffled mixed feed of sensor, transaction and event batches.
+
+    Args:
+        batches: Number of batches per stream.
+        size: Records per batch.
+
+    Returns:
+        (stream_id, batch) pairs.
+    """
+    rng = random.Random(42)
+    makers = {
+        "SENSOR_001": lambda: [{"temp": rng.gauss(22, 2)}
+                               for _ in range(size)],
+        "TRANS_001": lambda: [{rng.choice(("buy", "sell")):
+                               rng.randint(1, 1000)} for _ in range(size)],
+        "EVENT_001": lambda: [rng.choice(("login", "logout", "error"))
+                              for _ in range(size)]
+    }
+    feed = [(stream_id, make()) for stream_id, make in makers.items()
+            for _ in range(batches)]
+    rng.shuffle(feed)
+    return feed
+
+
+def main() -> None:
+    """Dispatch the same feed sequentially, on threads and on processes."""
+    print("=== CODE NEXUS - PARALLEL STREAM DISPATCH ===\n")
+    feed = _demo_feed(batches=40, size=5000)
+    for mode, workers in ((StreamDispatcher.THREAD, 1),
+                          (StreamDispatcher.THREAD, 3),
+                          (StreamDispatcher.PROCESS, 3)):
+        dispatcher = StreamDispatcher(StreamRegistry(), workers, mode)
+        start = time.perf_counter()
+        report = dispatcher.dispatch(feed)
+        elapsed = time.perf_counter() - start
+        print(f"{mode} x{workers}: {elapsed:.2f}s")
+        for stream_id, result in report.items():
+            print(f"- {stream_id}: {len(result['batches'])} batches, "
+                  f"{result['stats']['processed']} processed")
+        print()
+
+
+if __name__ == "__main__":
+    main()
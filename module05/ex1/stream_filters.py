@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Stream Filter Expressions
+
+A small expression language for `DataStream.filter_data` criteria, such
+as `pressure > 1020 and temp < 30` or `key == "sell" and value >= 500`.
+An expression is parsed once, compiled into nested closures and cached by
+its text, so filtering runs without re-parsing per record or per batch.
+
+Grammar:
+    expr       := and_expr ("or" and_expr)*
+    and_expr   := not_expr ("and" not_expr)*
+    not_expr   := "not" not_expr | "(" expr ")" | comparison
+    comparison := operand ("==" | "!=" | "<" | "<=" | ">" | ">=") operand
+    operand    := name | number | string | "true" | "false"
+
+Names read a field of a dict record. Two names are special: `key` is the
+key of a single-key record and `value` its value, or the message of a
+string event. A comparison with a missing field or mismatched types is
+false rather than an error, so `not` also matches records lacking the
+field.
+
+Classes:
+    FilterSyntaxError:
+        Raised for an expression that cannot be parsed.
+
+Functions:
+    compile_filter:
+        Compile an expression into a cached record predicate.
+"""
+
+import ast
+import operator
+import re
+from functools import lru_cache
+from typing import Any, Callable, List, Tuple
+
+Predicate = Callable[[Any], bool]
+Getter = Callable[[Any], Any]
+
+MISSING = object()
+KEYWORDS = {"and", "or", "not", "true", "false"}
+COMPARISONS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge
+}
+TOKEN_NAMES = {
+    "name": "field name",
+    "literal": "value",
+    "op": "comparison operator",
+    "paren": "parenthesis"
+}
+TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<number>-?\d+(?:\.\d*)?(?:[eE][+-]?\d+)?)
+      | (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+      | (?P<op>==|!=|<=|>=|<|>)
+      | (?P<paren>[()])
+      | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+    )""", re.VERBOSE)
+
+
+class FilterSyntaxError(ValueError):
+    """Raised for a filter expression that cannot be parsed."""
+
+
+def _tokenize(expression: str) -> List[Tuple[str, Any]]:
+    """Split an expression into (kind, value) tokens.
+
+    Raises:
+        FilterSyntaxError: An unexpected character is found.
+    """
+    tokens = []
+    position = 0
+    end = len(expression.rstrip())
+    while position < end:
+        match = TOKEN.match(expression, position)
+        if match is None:
+            raise FilterSyntaxError(
+                f"Unexpected character at {position}: "
+                f"{expression[position:position + 10]!r}")
+        kind = match.lastgroup
+        text = match.group(kind)
+        if kind in ("number", "string"):
+            tokens.append(("literal", ast.literal_eval(text)))
+        elif kind == "name" and text in ("true", "false"):
+            tokens.append(("literal", text == "true"))
+        elif kind == "name" and text in KEYWORDS:
+            tokens.append((text, text))
+        else:
+            tokens.append((kind, text))
+        position = match.end()
+    return tokens
+
+
+def _field(name: str) -> Getter:
+    """Return a getter reading `name` from dict records."""
+    def get(record: Any) -> Any:
+        if isinstance(record, dict):
+            return record.get(name, MISSING)
+        return MISSING
+    return get
+
+
+def _key(record: Any) -> Any:
+    """Return the key of a single-key record."""
+    if isinstance(record, dict) and len(record) == 1:
+        return next(iter(record))
+    return MISSING
+
+
+def _value(record: Any) -> Any:
+    """Return the value of a single-key record or a string event."""
+    if isinstance(record, dict):
+        if len(record) == 1:
+            return next(iter(record.values()))
+        return MISSING
+    if isinstance(record, str):
+        return record
+    return MISSING
+
+
+def _comparison(left: Tuple[str, Any], op: str,
+                right: Tuple[str, Any]) -> Predicate:
+    """Compile a comparison of two operands into a predicate."""
+    compare = COMPARISONS[op]
+    getters = []
+    for kind, value in (left, right):
+        if kind == "literal":
+            getters.append(None)
+        elif value == "key":
+            getters.append(_key)
+        elif value == "value":
+            getters.append(_value)
+        else:
+            getters.append(_field(value))
+    get_left, get_right = getters
+
+    if get_right is None and get_left is not None:
+        constant = right[1]
+
+        def predicate(record: Any) -> bool:
+            found = get_left(record)
+            if found is MISSING:
+                return False
+            try:
+                return bool(compare(found, constant))
+            except TypeError:
+                return False
+        return predicate
+
+    if get_left is None and get_right is None:
+        try:
+            outcome = bool(compare(left[1], right[1]))
+        except TypeError:
+            outcome = False
+        return lambda record: outcome
+
+    def general(record: Any) -> bool:
+        a = left[1] if get_left is None else get_left(record)
+        b = right[1] if get_right is None else get_right(record)
+        if a is MISSING or b is MISSING:
+            return False
+        try:
+            return bool(compare(a, b))
+        except TypeError:
+            return False
+    return general
+
+
+def _both(first: Predicate, second: Predicate) -> Predicate:
+    """Return a predicate true when both predicates are."""
+    return lambda record: first(record) and second(record)
+
+
+def _either(first: Predicate, second: Predicate) -> Predicate:
+    """Return a predicate true when either predicate is."""
+    return lambda record: first(record) or second(record)
+
+
+class _Parser:
+    """Recursive-descent parser building predicates while parsing."""
+
+    def __init__(self, expression: str) -> None:
+        """Tokenize `expression`."""
+        self.tokens = _tokenize(expression)
+        self.index = 0
+
+    def peek(self) -> str:
+        """Return the kind of the next token, or "" at the end."""
+        if self.index < len(self.tokens):
+            return self.tokens[self.index][0]
+        return ""
+
+    def take(self, *kinds: str) -> Tuple[str, Any]:
+        """Consume the next token, which must be of one of `kinds`."""
+        if self.peek() not in kinds:
+            found = TOKEN_NAMES.get(self.peek(), self.peek())
+            expected = " or ".join(TOKEN_NAMES.get(kind, kind)
+                                   for kind in kinds)
+            raise FilterSyntaxError(
+                f"Expected {expected}, found {found or 'end of expression'}")
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def parse(self) -> Predicate:
+        """Parse the whole expression."""
+        predicate = self.expr()
+        if self.peek():
+            raise FilterSyntaxError(
+                f"Unexpected {TOKEN_NAMES.get(self.peek(), self.peek())}")
+        return predicate
+
+    def expr(self) -> Predicate:
+        """Parse a disjunction."""
+        predicate = self.and_expr()
+        while self.peek() == "or":
+            self.take("or")
+            predicate = _either(predicate, self.and_expr())
+        return predicate
+
+    def and_expr(self) -> Predicate:
+        """Parse a conjunction."""
+        predicate = self.not_expr()
+        while self.peek() == "and":
+            self.take("and")
+            predicate = _both(predicate, self.not_expr())
+        return predicate
+
+    def not_expr(self) -> Predicate:
+        """Parse a negation, a parenthesized expression or a comparison."""
+        if self.peek() == "not":
+            self.take("not")
+            inner = self.not_expr()
+            return lambda record: not inner(record)
+        if self.peek() == "paren":
+            if self.take("paren")[1] != "(":
+                raise FilterSyntaxError("Unexpected )")
+            predicate = self.expr()
+            if self.take("paren")[1] != ")":
+                raise FilterSyntaxError("Expected )")
+            return predicate
+        left = self.take("name", "literal")
+        op = self.take("op")[1]
+        right = self.take("name", "literal")
+        return _comparison(left, op, right)
+
+
+@lru_cache(maxsize=256)
+def compile_filter(expression: str) -> Predicate:
+    """Compile a filter expression into a record predicate.
+
+    Compiled predicates are cached by expression text.
+
+    Args:
+        expression: Expression such as "pressure > 1020 and temp < 30".
+
+    Returns:
+        Predicate returning True for matching records.
+
+    Raises:
+        FilterSyntaxError: The expression cannot be parsed.
+    """
+    return _Parser(expression).parse()
@@ -0,0 +1,641 @@
+#!/usr/bin/env python3
+"""
+Stream Sketches
+
+Bounded-memory, mergeable summaries of unbounded streams. A sketch built
+by each worker can be merged into one without revisiting the data.
+
+Items are hashed with BLAKE2b rather than `hash()`, so sketches built in
+different processes agree and can be merged. Every sketch converts to
+and from a JSON-serializable dictionary with `to_dict`/`from_dict`.
+
+Classes:
+    QuantileSketch:
+        Estimate quantiles (p50/p95/p99...) with a KLL sketch.
+    CountMinSketch:
+        Estimate item frequencies in fixed memory.
+    SpaceSaving:
+        Track the top-k most frequent items.
+    HyperLogLog:
+        Estimate the number of distinct items.
+
+Functions:
+    hash64:
+        Return a stable 64-bit hash of an item.
+"""
+
+import base64
+import math
+import operator
+import random
+import sys
+import zlib
+from array import array
+from collections import Counter
+from hashlib import blake2b
+from typing import (Any, Dict, Hashable, Iterable, List, Optional, Sequence,
+                    Tuple, Union)
+
+Number = Union[int, float]
+MASK64 = (1 << 64) - 1
+_COIN = random.Random()
+
+
+def _encode_array(values: Union[array, bytearray]) -> str:
+    """Return the compressed little-endian bytes of an array as base64.
+
+    Counters and registers are mostly zeros, so compression keeps
+    snapshots small.
+    """
+    if isinstance(values, array) and sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return base64.b64encode(zlib.compress(bytes(values))).decode("ascii")
+
+
+def _decode_array(typecode: str, text: str) -> array:
+    """Rebuild an array from `_encode_array` output."""
+    values = array(typecode)
+    values.frombytes(zlib.decompress(base64.b64decode(text)))
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def hash64(item: Any) -> int:
+    """Return a 64-bit hash of an item that is stable across processes.
+
+    Args:
+        item: Item to hash; non-strings are hashed by their `repr`.
+
+    Returns:
+        Unsigned 64-bit hash.
+    """
+    if not isinstance(item, str):
+        item = repr(item)
+    digest = blake2b(item.encode("utf-8", "surrogatepass"), digest_size=8)
+    return int.from_bytes(digest.digest(), "little")
+
+
+class QuantileSketch:
+    """Estimate quantiles of a stream with a KLL sketch.
+
+    Values are kept in a hierarchy of compactors; a full compactor sorts
+    its items and promotes every other one, at a random offset, to the
+    next level where each item weighs twice as much. Memory stays around
+    3 * k items whatever the stream length, and the rank error of a
+    quantile is about 1.7 / k with high probability.
+
+    Attributes:
+        k: Size parameter; larger means more accurate and more memory.
+        n: Number of values seen.
+    """
+
+    DEPTH_FACTOR = 2 / 3
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None) -> None:
+        """Initialize QuantileSketch.
+
+        Args:
+            k: Size parameter (at least 8).
+            seed: Optional seed for the compaction coin flips.
+        """
+        if k < 8:
+            raise ValueError("k must be at least 8")
+        self.k = k
+        self.n = 0
+        self._levels: List[List[Number]] = [[]]
+        self._size = 0
+        self._capacities: List[int] = []
+        self._max_size = 0
+        self._resize()
+        self._seed = seed
+        self._rng: Optional[random.Random] = None
+
+    @staticmethod
+    def k_for_error(epsilon: float) -> int:
+        """Return the k achieving a rank error of about `epsilon`.
+
+        Args:
+            epsilon: Target rank error, e.g. 0.01 for 1%.
+
+        Returns:
+            Size parameter for the sketch.
+        """
+        if not 0 < epsilon < 1:
+            raise ValueError("epsilon must be between 0 and 1")
+        return max(8, math.ceil(1.7 / epsilon))
+
+    def _capacity(self, level: int) -> int:
+        """Return the number of items a level may hold."""
+        depth = len(self._levels) - level - 1
+        return max(2, math.ceil(self.k * self.DEPTH_FACTOR ** depth))
+
+    def _resize(self) -> None:
+        """Cache the level capacities after the number of levels changed."""
+        self._capacities = [self._capacity(h)
+                            for h in range(len(self._levels))]
+        self._max_size = sum(self._capacities)
+
+    def _coin(self) -> int:
+        """Flip a compaction coin.
+
+        Seeding a generator from the OS entropy pool costs more than
+        summarizing a small batch, so unseeded sketches share `_COIN`
+        and a seeded generator is only built on the first compaction.
+        """
+        if self._rng is None:
+            self._rng = (_COIN if self._seed is None
+                         else random.Random(self._seed))
+        return self._rng.getrandbits(1)
+
+    def _compress(self) -> None:
+        """Compact levels until the sketch fits its memory budget."""
+        while self._size >= self._max_size:
+            for level, items in enumerate(self._levels):
+                if len(items) < self._capacities[level]:
+                    continue
+                if level + 1 == len(self._levels):
+                    self._levels.append([])
+                    self._resize()
+                items.sort()
+                keep = [items.pop()] if len(items) % 2 else []
+                offset = self._coin()
+                self._levels[level + 1].extend(items[offset::2])
+                self._size -= len(items) // 2
+                items[:] = keep
+                break
+
+    def update(self, value: Number) -> None:
+        """Add a single value.
+
+        Args:
+            value: Number to add.
+        """
+        self._levels[0].append(value)
+        self.n += 1
+        self._size += 1
+        if self._size >= self._max_size:
+            self._compress()
+
+    def update_many(self, values: Sequence[Number]) -> None:
+        """Add a batch of values.
+
+        Large batches are added in slices of `k` values so compaction
+        never has to sort more than a few compactors' worth of items.
+
+        Args:
+            values: Numbers to add.
+        """
+        step = self.k
+        for start in range(0, len(values), step):
+            part = values[start:start + step]
+            self._levels[0].extend(part)
+            self.n += len(part)
+            self._size += len(part)
+            if self._size >= self._max_size:
+                self._compress()
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Fold another sketch into this one.
+
+        Args:
+            other: Sketch of another part of the stream.
+
+        Returns:
+            The sketch itself.
+        """
+        if not other.n:
+            return self
+        if len(self._levels) < len(other._levels):
+            self._levels.extend(
+                [] for _ in range(len(other._levels) - len(self._levels)))
+            self._resize()
+        for level, items in enumerate(other._levels):
+            self._levels[level].extend(items)
+        self.n += other.n
+        self._size += other._size
+        if self._size >= self._max_size:
+            self._compress()
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the sketch as a JSON-serializable dictionary."""
+        return {"k": self.k, "n": self.n,
+                "levels": [list(items) for items in self._levels]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QuantileSketch":
+        """Rebuild a sketch saved by `to_dict`.
+
+        Args:
+            data: Dictionary produced by `to_dict`.
+
+        Returns:
+            The restored sketch.
+        """
+        sketch = cls(data["k"])
+        sketch._levels = [list(items) for items in data["levels"]] or [[]]
+        sketch.n = data["n"]
+        sketch._size = sum(len(items) for items in sketch._levels)
+        sketch._resize()
+        return sketch
+
+    def _weighted(self) -> List[List[Number]]:
+        """Return sorted [value, cumulative weight] pairs."""
+        pairs = sorted((value, 1 << level)
+                       for level, items in enumerate(self._levels)
+                       for value in items)
+        cumulative = 0
+        result = []
+        for value, weight in pairs:
+            cumulative += weight
+            result.append([value, cumulative])
+        return result
+
+    def quantiles(self, qs: Iterable[float]) -> List[Optional[Number]]:
+        """Estimate several quantiles at once.
+
+        Args:
+            qs: Quantiles between 0 and 1, e.g. (0.5, 0.95, 0.99).
+
+        Returns:
+            Estimated value per quantile, or None for an empty sketch.
+        """
+        qs = list(qs)
+        if not all(0 <= q <= 1 for q in qs):
+            raise ValueError("quantiles must be between 0 and 1")
+        weighted = self._weighted()
+        if not weighted:
+            return [None for _ in qs]
+        total = weighted[-1][1]
+        result: List[Optional[Number]] = []
+        for q in qs:
+            target = q * total
+            result.append(next((value for value, cumulative in weighted
+                                if cumulative >= target),
+                               weighted[-1][0]))
+        return result
+
+    def quantile(self, q: float) -> Optional[Number]:
+        """Estimate a single quantile.
+
+        Args:
+            q: Quantile between 0 and 1.
+
+        Returns:
+            Estimated value, or None for an empty sketch.
+        """
+        return self.quantiles((q,))[0]
+
+    def percentiles(self) -> Dict[str, Any]:
+        """Return the p50, p95 and p99 estimates.
+
+        Returns:
+            Dictionary with "p50", "p95" and "p99" keys.
+        """
+        p50, p95, p99 = self.quantiles((0.5, 0.95, 0.99))
+        return {"p50": p50, "p95": p95, "p99": p99}
+
+
+class CountMinSketch:
+    """Estimate item frequencies with a Count-Min sketch.
+
+    Each item increments one counter per row; its frequency is the
+    smallest of those counters. Estimates never undercount and overcount
+    by at most `e / width` of the total with probability
+    `1 - exp(-depth)`.
+
+    Attributes:
+        width: Counters per row.
+        depth: Number of rows.
+        total: Sum of all added counts.
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4) -> None:
+        """Initialize CountMinSketch.
+
+        Args:
+            width: Counters per row.
+            depth: Number of rows.
+        """
+        if width < 1 or depth < 1:
+            raise ValueError("width and depth must be positive")
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self._rows = [array("q", bytes(8 * width)) for _ in range(depth)]
+
+    @classmethod
+    def from_error(cls, epsilon: float,
+                   delta: float = 0.01) -> "CountMinSketch":
+        """Build a sketch for a given error bound.
+
+        Args:
+            epsilon: Overcount bound as a fraction of the total.
+            delta: Probability of exceeding the bound.
+
+        Returns:
+            Empty sketch sized for the bound.
+        """
+        if not 0 < epsilon < 1 or not 0 < delta < 1:
+            raise ValueError("epsilon and delta must be between 0 and 1")
+        return cls(math.ceil(math.e / epsilon),
+                   math.ceil(math.log(1 / delta)))
+
+    def _indexes(self, hashed: int) -> Iterable[int]:
+        """Yield the counter index of a hash in every row."""
+        low = hashed & 0xFFFFFFFF
+        high = hashed >> 32
+        width = self.width
+        for row in range(self.depth):
+            yield (low + row * high) % width
+
+    def add_hash(self, hashed: int, count: int = 1) -> None:
+        """Add an item given its `hash64`.
+
+        Args:
+            hashed: Hash of the item.
+            count: Number of occurrences.
+        """
+        for row, index in zip(self._rows, self._indexes(hashed)):
+            row[index] += count
+        self.total += count
+
+    def add(self, item: Hashable, count: int = 1) -> None:
+        """Add occurrences of an item.
+
+        Args:
+            item: Item to count.
+            count: Number of occurrences.
+        """
+        self.add_hash(hash64(item), count)
+
+    def estimate(self, item: Hashable) -> int:
+        """Estimate how often an item was added.
+
+        Args:
+            item: Item to look up.
+
+        Returns:
+            Estimated frequency, never lower than the true one.
+        """
+        return min(row[index] for row, index
+                   in zip(self._rows, self._indexes(hash64(item))))
+
+    def merge(self, other: "CountMinSketch") -> "CountMinSketch":
+        """Fold another sketch of the same shape into this one.
+
+        Args:
+            other: Sketch of another part of the stream.
+
+        Returns:
+            The sketch itself.
+        """
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError("Count-Min sketches differ in shape")
+        if not other.total:
+            return self
+        if not self.total:
+            self._rows = [array("q", row) for row in other._rows]
+        else:
+            for mine, theirs in zip(self._rows, other._rows):
+                mine[:] = array("q", map(operator.add, mine, theirs))
+        self.total += other.total
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the sketch as a JSON-serializable dictionary."""
+        return {"width": self.width, "depth": self.depth,
+                "total": self.total,
+                "rows": [_encode_array(row) for row in self._rows]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CountMinSketch":
+        """Rebuild a sketch saved by `to_dict`.
+
+        Args:
+            data: Dictionary produced by `to_dict`.
+
+        Returns:
+            The restored sketch.
+        """
+        sketch = cls(data["width"], data["depth"])
+        sketch.total = data["total"]
+        sketch._rows = [_decode_array("q", row) for row in data["rows"]]
+        return sketch
+
+
+class SpaceSaving:
+    """Track the most frequent items with the Space-Saving algorithm.
+
+    At most `k` items are monitored; a new item replaces the least
+    frequent one and inherits its count as overestimation error, so any
+    item more frequent than `total / k` is guaranteed to be monitored.
+
+    Attributes:
+        k: Number of monitored items.
+        total: Sum of all added counts.
+        counts: Estimated count per monitored item.
+        errors: Maximum overestimation per monitored item.
+    """
+
+    def __init__(self, k: int = 32) -> None:
+        """Initialize SpaceSaving.
+
+        Args:
+            k: Number of monitored items.
+        """
+        if k < 1:
+            raise ValueError("k must be positive")
+        self.k = k
+        self.total = 0
+        self.counts: Dict[Hashable, int] = {}
+        self.errors: Dict[Hashable, int] = {}
+
+    def add(self, item: Hashable, count: int = 1) -> None:
+        """Add occurrences of an item.
+
+        Args:
+            item: Item to count.
+            count: Number of occurrences.
+        """
+        self.total += count
+        counts = self.counts
+        if item in counts:
+            counts[item] += count
+        elif len(counts) < self.k:
+            counts[item] = count
+            self.errors[item] = 0
+        else:
+            victim = min(counts, key=counts.__getitem__)
+            floor = counts.pop(victim)
+            del self.errors[victim]
+            counts[item] = floor + count
+            self.errors[item] = floor
+
+    def _floor(self) -> int:
+        """Return the count an unmonitored item may at most have."""
+        if len(self.counts) < self.k:
+            return 0
+        return min(self.counts.values())
+
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        """Fold another summary into this one.
+
+        Args:
+            other: Summary of another part of the stream.
+
+        Returns:
+            The summary itself.
+        """
+        mine, theirs = self._floor(), other._floor()
+        counts: Dict[Hashable, int] = {}
+        errors: Dict[Hashable, int] = {}
+        for item in dict.fromkeys([*self.counts, *other.counts]):
+            counts[item] = (self.counts.get(item, mine)
+                            + other.counts.get(item, theirs))
+            errors[item] = (self.errors.get(item, mine)
+                            + other.errors.get(item, theirs))
+        keep = sorted(counts, key=counts.__getitem__, reverse=True)
+        keep = keep[:max(self.k, other.k)]
+        self.k = max(self.k, other.k)
+        self.counts = {item: counts[item] for item in keep}
+        self.errors = {item: errors[item] for item in keep}
+        self.total += other.total
+        return self
+
+    def top(self, n: Optional[int] = None) -> List[Tuple[Hashable, int]]:
+        """Return the most frequent items.
+
+        Args:
+            n: Number of items; all monitored items by default.
+
+        Returns:
+            (item, estimated count) pairs, most frequent first.
+        """
+        ranked = sorted(self.counts.items(), key=lambda pair: pair[1],
+                        reverse=True)
+        return ranked if n is None else ranked[:n]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the summary as a JSON-serializable dictionary."""
+        return {"k": self.k, "total": self.total,
+                "items": [[item, count, self.errors[item]]
+                          for item, count in self.counts.items()]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SpaceSaving":
+        """Rebuild a summary saved by `to_dict`.
+
+        Args:
+            data: Dictionary produced by `to_dict`.
+
+        Returns:
+            The restored summary.
+        """
+        summary = cls(data["k"])
+        summary.total = data["total"]
+        for item, count, error in data["items"]:
+            summary.counts[item] = count
+            summary.errors[item] = error
+        return summary
+
+
+class HyperLogLog:
+    """Estimate the number of distinct items with HyperLogLog.
+
+    Uses `2 ** precision` one-byte registers; the relative standard error
+    is about `1.04 / sqrt(2 ** precision)` (1.6% at precision 12).
+
+    Attributes:
+        precision: Number of hash bits selecting a register.
+    """
+
+    def __init__(self, precision: int = 12) -> None:
+        """Initialize HyperLogLog.
+
+        Args:
+            precision: Register index bits, between 4 and 18.
+        """
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self._registers = bytearray(1 << precision)
+
+    def add_hash(self, hashed: int) -> None:
+        """Add an item given its `hash64`.
+
+        Args:
+            hashed: Hash of the item.
+        """
+        p = self.precision
+        index = hashed >> (64 - p)
+        rest = (hashed << p) & MASK64
+        rank = min(65 - rest.bit_length(), 65 - p)
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def add(self, item: Hashable) -> None:
+        """Add an item.
+
+        Args:
+            item: Item to count.
+        """
+        self.add_hash(hash64(item))
+
+    def estimate(self) -> int:
+        """Estimate the number of distinct items added.
+
+        Returns:
+            Estimated cardinality.
+        """
+        m = len(self._registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        histogram = Counter(self._registers)
+        raw = alpha * m * m / sum(count * 2.0 ** -rank
+                                  for rank, count in histogram.items())
+        zeros = histogram[0]
+        if raw <= 2.5 * m and zeros:
+            return round(m * math.log(m / zeros))
+        return round(raw)
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """Fold another counter of the same precision into this one.
+
+        Args:
+            other: Counter of another part of the stream.
+
+        Returns:
+            The counter itself.
+        """
+        if self.precision != other.precision:
+            raise ValueError("HyperLogLog precisions differ")
+        if not any(other._registers):
+            return self
+        if not any(self._registers):
+            self._registers = bytearray(other._registers)
+        else:
+            self._registers = bytearray(map(max, self._registers,
+                                            other._registers))
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the counter as a JSON-serializable dictionary."""
+        return {"precision": self.precision,
+                "registers": _encode_array(self._registers)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HyperLogLog":
+        """Rebuild a counter saved by `to_dict`.
+
+        Args:
+            data: Dictionary produced by `to_dict`.
+
+        Returns:
+            The restored counter.
+        """
+        counter = cls(data["precision"])
+        counter._registers = bytearray(
+            zlib.decompress(base64.b64decode(data["registers"])))
+        return counter
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Stream Wire Format
+
+Compact binary encoding of stream batches. A batch of single-key records
+such as `[{"buy": 100}, {"sell": 150}]` or events such as `["login"]` is
+stored as a key dictionary and packed arrays instead of one dict or
+string per record:
+
+    header      magic "DSWB", version, code and value typecodes,
+                key count, record count (little-endian)
+    keys        per key: 2-byte length + UTF-8 text
+    codes       one unsigned integer per record, indexing the keys
+    values      one number per record (absent for event batches)
+
+Integer codes and values use the narrowest array type that fits, so a
+million transactions take about 5 MB on the wire and in memory.
+
+Classes:
+    PackedBatch:
+        Hold a batch as a key dictionary and packed arrays.
+
+Functions:
+    encode_batch:
+        Encode records into the binary format.
+    decode_batch:
+        Decode the binary format into a PackedBatch.
+"""
+
+import struct
+import sys
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+MAGIC = b"DSWB"
+VERSION = 1
+HEADER = struct.Struct("<4sBccII")
+KEY_LENGTH = struct.Struct("<H")
+NO_VALUES = b"\0"
+INT32_MIN, INT32_MAX = -2 ** 31, 2 ** 31 - 1
+
+
+def _to_little_endian(values: array) -> bytes:
+    """Return the bytes of an array in little-endian order."""
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _code_type(keys: int) -> str:
+    """Return the narrowest unsigned typecode indexing `keys` keys."""
+    if keys <= 1 << 8:
+        return "B"
+    if keys <= 1 << 16:
+        return "H"
+    return "I"
+
+
+def _value_type(values: Sequence[Any]) -> str:
+    """Return the narrowest typecode holding every value.
+
+    Raises:
+        ValueError: A value is not a number.
+    """
+    if not all(isinstance(value, (int, float)) for value in values):
+        raise ValueError("Only numeric values can be packed")
+    if any(isinstance(value, float) for value in values):
+        return "d"
+    if values and (min(values) < INT32_MIN or max(values) > INT32_MAX):
+        return "q"
+    return "i"
+
+
+class PackedBatch:
+    """Hold a stream batch as a key dictionary and packed arrays.
+
+    Attributes:
+        keys: Distinct record keys (or event messages), by code.
+        codes: Key code per record.
+        values: Value per record, or None for event batches.
+    """
+
+    __slots__ = ("keys", "codes", "values")
+
+    def __init__(self, keys: Sequence[str], codes: array,
+                 values: Optional[array] = None) -> None:
+        """Initialize PackedBatch.
+
+        Args:
+            keys: Distinct record keys (or event messages), by code.
+            codes: Key code per record.
+            values: Value per record, or None for event batches.
+        """
+        if values is not None and len(values) != len(codes):
+            raise ValueError("codes and values differ in length")
+        self.keys = tuple(keys)
+        self.codes = codes
+        self.values = values
+
+    def __len__(self) -> int:
+        """Return the number of records."""
+        return len(self.codes)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Any]) -> "PackedBatch":
+        """Pack single-key dicts or event strings.
+
+        Args:
+            records: Single-key dicts with numeric values, or strings.
+
+        Returns:
+            Packed batch.
+
+        Raises:
+            ValueError: Records are mixed, multi-key or non-numeric.
+        """
+        index: Dict[str, int] = {}
+        codes: List[int] = []
+        values: List[Any] = []
+        events = None
+        for record in records:
+            if isinstance(record, str):
+                key = record
+                is_event = True
+            elif isinstance(record, dict) and len(record) == 1:
+                (key, value), = record.items()
+                values.append(value)
+                is_event = False
+            else:
+                raise ValueError(f"Cannot pack record: {record!r}")
+            if events is None:
+                events = is_event
+            elif events != is_event:
+                raise ValueError("Cannot pack events with key/value records")
+            code = index.get(key)
+            if code is None:
+                code = index[key] = len(index)
+            codes.append(code)
+        keys = list(index)
+        packed_values = None if events else array(_value_type(values),
+                                                  values)
+        return cls(keys, array(_code_type(len(keys)), codes), packed_values)
+
+    def encode(self) -> bytes:
+        """Return the binary encoding of the batch."""
+        value_type = (NO_VALUES if self.values is None
+                      else self.values.typecode.encode())
+        parts = [HEADER.pack(MAGIC, VERSION, self.codes.typecode.encode(),
+                             value_type, len(self.keys), len(self.codes))]
+        for key in self.keys:
+            text = key.encode("utf-8")
+            parts.append(KEY_LENGTH.pack(len(text)))
+            parts.append(text)
+        parts.append(_to_little_endian(self.codes))
+        if self.values is not None:
+            parts.append(_to_little_endian(self.values))
+        return b"".join(parts)
+
+    @classmethod
+    def decode(cls, data: bytes) -> "PackedBatch":
+        """Parse a binary batch without building per-record objects.
+
+        Args:
+            data: Bytes produced by `encode`.
+
+        Returns:
+            Packed batch.
+
+        Raises:
+            ValueError: The data is not a valid batch.
+        """
+        view = memoryview(data)
+        try:
+            magic, version, code_type, value_type, key_count, count = (
+                HEADER.unpack_from(view))
+        except struct.error:
+            raise ValueError("Truncated batch header")
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a stream batch")
+        offset = HEADER.size
+        keys = []
+        try:
+            for _ in range(key_count):
+                length, = KEY_LENGTH.unpack_from(view, offset)
+                offset += KEY_LENGTH.size
+                keys.append(str(view[offset:offset + length], "utf-8"))
+                offset += length
+        except struct.error:
+            raise ValueError("Truncated key dictionary")
+        arrays = []
+        for typecode in (code_type, value_type):
+            if typecode == NO_VALUES:
+                arrays.append(None)
+                continue
+            packed = array(typecode.decode())
+            end = offset + count * packed.itemsize
+            if end > len(view):
+                raise ValueError("Truncated batch data")
+            packed.frombytes(view[offset:end])
+            if sys.byteorder == "big":
+                packed.byteswap()
+            arrays.append(packed)
+            offset = end
+        codes, values = arrays
+        if codes and max(codes) >= key_count:
+            raise ValueError("Key code out of range")
+        return cls(keys, codes, values)
+
+    def lookup(self, table: Sequence[int], typecode: str = "b") -> array:
+        """Map every record code through a per-key table.
+
+        Args:
+            table: Output value per key code.
+            typecode: Array typecode of the output.
+
+        Returns:
+            Array holding `table[code]` per record.
+        """
+        return array(typecode, map(table.__getitem__, self.codes))
+
+    def __iter__(self) -> Iterator[Any]:
+        """Yield the records as single-key dicts or event strings."""
+        keys = self.keys
+        if self.values is None:
+            for code in self.codes:
+                yield keys[code]
+        else:
+            for code, value in zip(self.codes, self.values):
+                yield {keys[code]: value}
+
+
+def encode_batch(records: Iterable[Any]) -> bytes:
+    """Encode single-key dicts or event strings into the wire format.
+
+    Args:
+        records: Batch to encode.
+
+    Returns:
+        Binary batch.
+    """
+    return PackedBatch.from_records(records).encode()
+
+
+def decode_batch(data: bytes) -> PackedBatch:
+    """Decode a binary batch.
+
+    Args:
+        data: Bytes produced by `encode_batch`.
+
+    Returns:
+        Packed batch.
+    """
+    return PackedBatch.decode(data)
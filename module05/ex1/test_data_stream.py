@@ -0,0 +1,263 @@
+"""Tests for the data streams, their registry and cumulative statistics."""
+
+import json
+import pickle
+import threading
+from collections import deque
+
+import pytest
+
+import data_stream
+from data_stream import (BUY, SELL, EventStream, SensorStream,
+                         StreamProcessor, StreamRegistry, TransactionStream)
+
+
+def test_registry_parses_prefix_of_any_length():
+    assert StreamRegistry.parse_prefix("SENSOR_001") == "SENSOR"
+    assert StreamRegistry.parse_prefix("SENSOR_EU_0042") == "SENSOR"
+    assert StreamRegistry.parse_prefix("TRANS") == "TRANS"
+
+
+def test_registry_reuses_stream_per_id():
+    registry = StreamRegistry()
+    stream = registry.get("SENSOR_001")
+    assert isinstance(stream, SensorStream)
+    assert registry.get("SENSOR_001") is stream
+    assert registry.get("SENSOR_002") is not stream
+    assert isinstance(registry.get("TRANS_1"), TransactionStream)
+    assert isinstance(registry.get("EVENT_1"), EventStream)
+
+
+def test_registry_returns_none_for_unknown_prefix():
+    registry = StreamRegistry()
+    assert registry.get("UNKNOWN_1") is None
+    assert "UNKNOWN_1" not in registry.streams
+
+
+def test_registry_accepts_custom_types():
+    registry = StreamRegistry({})
+    assert registry.get("SENSOR_1") is None
+    registry.register_type("ENV", SensorStream)
+    assert isinstance(registry.get("ENV_1"), SensorStream)
+
+
+def test_processors_share_state_through_registry():
+    registry = StreamRegistry()
+    StreamProcessor("SENSOR_1", registry).process_batch([{"temp": 20}])
+    processor = StreamProcessor("SENSOR_1", registry)
+    processor.process_batch([{"temp": 30}])
+    assert processor.get_stats() == {"stream_id": "SENSOR_1",
+                                     "processed": 2, "average": 25.0}
+
+
+def test_processor_reports_unknown_stream():
+    processor = StreamProcessor("UNKNOWN_1", StreamRegistry())
+    assert processor.process_batch([1]) == "ERROR: stream not found"
+    assert processor.filter_data([1]) == []
+    assert processor.process_and_filter([1]) == ("ERROR: stream not found",
+                                                 [])
+    assert processor.get_stats() == {}
+
+
+def test_transaction_batch_reports_net_flow():
+    stream = TransactionStream("TRANS_1")
+    batch = [{"buy": 100}, {"sell": 150}, {"buy": 75}]
+    assert stream.process_batch(batch) == ("3 operations processed, "
+                                           "net flow: +25 units")
+    assert stream.process_batch([{"sell": 40}]) == (
+        "1 operations processed, net flow: -40 units")
+
+
+def test_transaction_batch_aggregates_every_side_of_a_record():
+    stream = TransactionStream("TRANS_1")
+    stream.process_batch([{"buy": 600, "sell": 10}, {"sell": 700},
+                          {"hold": 5}, "noise"])
+    stats = stream.get_stats()
+    assert stats["processed"] == 4
+    assert stats["net flow"] == -110
+    assert stats["total flow"] == 1310
+    assert stats["large"] == 2
+
+
+def test_invalid_transaction_batch_reports_no_flow():
+    stream = TransactionStream("TRANS_1")
+    batch = [{"buy": 100}, {"sell": "x"}]
+    assert stream.process_batch(batch) == "2 operations processed"
+    assert stream.net_flow == 0
+    assert stream.processed == 2
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_columns_aggregate_with_and_without_numpy(monkeypatch, vectorized):
+    if vectorized:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(data_stream, "_numpy", lambda: None)
+    sides = [BUY, SELL, BUY, 0, SELL]
+    amounts = [100, 150, 700, 999, 20]
+    stream = TransactionStream("TRANS_1")
+    assert stream.process_columns(sides, amounts) == (
+        "5 operations processed, net flow: +630 units")
+    assert stream.total_flow == 970
+    assert stream.large == 1
+
+
+def test_columns_reject_mismatched_lengths():
+    with pytest.raises(ValueError):
+        TransactionStream("TRANS_1").process_columns([BUY], [1, 2])
+    assert TransactionStream("TRANS_1").process_columns([], []) == (
+        "0 operations processed")
+
+
+@pytest.mark.parametrize("stream_class, batch, criteria", [
+    (SensorStream, [{"temp": 22}, {"pressure": 1030}, "x"], "High-priority"),
+    (TransactionStream, [{"buy": 100}, {"sell": 900}], "High-priority"),
+    (EventStream, ["login", "error", 3], "High-priority"),
+    (SensorStream, [{"temp": 22}, {"temp": 35}], "temp > 30"),
+    (SensorStream, [{"temp": 22}, 5], None),
+])
+def test_process_and_filter_matches_separate_calls(stream_class, batch,
+                                                   criteria):
+    expected = (stream_class("A_1").process_batch(batch),
+                stream_class("A_1").filter_data(batch, criteria))
+    fused = stream_class("A_1")
+    assert fused.process_and_filter(batch, criteria) == expected
+    assert fused.processed == len(batch)
+
+
+def test_process_and_filter_scans_iterators_once():
+    stream = SensorStream("SENSOR_1")
+    records = iter([{"temp": 20}, {"pressure": 1030}, {"temp": 24}])
+    summary, filtered = stream.process_and_filter(records, "High-priority")
+    assert summary == "3 readings processed, avg temp: 22.0°C"
+    assert filtered == [{"pressure": 1030}]
+
+
+def test_process_and_filter_rejects_single_records():
+    stream = SensorStream("SENSOR_1")
+    assert stream.process_and_filter({"temp": 20}) == (
+        "0 readings processed", [])
+
+
+def test_batches_may_be_any_iterable():
+    readings = [{"temp": float(value)} for value in range(3000)]
+    expected = SensorStream("SENSOR_1").process_batch(readings)
+    assert SensorStream("SENSOR_1").process_batch(
+        reading for reading in readings) == expected
+    assert SensorStream("SENSOR_1").process_batch(
+        deque(readings)) == expected
+    assert expected == "3000 readings processed, avg temp: 1499.5°C"
+
+
+@pytest.mark.parametrize("batch", [5, None, "temp", b"temp", {"temp": 1}])
+def test_non_batches_are_rejected(batch):
+    stream = EventStream("EVENT_1")
+    assert stream.process_batch(batch) == "0 events processed"
+    assert stream.filter_data(batch, "High-priority") == []
+    assert stream.processed == 0
+
+
+def test_iter_filter_is_lazy():
+    pulled = []
+
+    def records():
+        for event in ("login", "error", "logout", "error"):
+            pulled.append(event)
+            yield event
+
+    matches = EventStream("EVENT_1").iter_filter(records(), "High-priority")
+    assert pulled == []
+    assert next(matches) == "error"
+    assert pulled == ["login", "error"]
+
+
+def test_stats_accumulate_over_batches():
+    stream = SensorStream("SENSOR_1")
+    stream.process_batch([{"temp": 20}])
+    stream.process_batch([{"temp": 30}, {"humidity": 60}])
+    assert stream.get_stats() == {"stream_id": "SENSOR_1", "processed": 3,
+                                  "average": 25.0}
+    assert stream.avg == 25.0
+
+
+def test_stats_lose_no_update_under_threads():
+    stream = EventStream("EVENT_1")
+
+    def run():
+        for _ in range(50):
+            stream.process_batch(["login", "error"] * 10)
+
+    threads = [threading.Thread(target=run) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert stream.processed == 8000
+    assert stream.error == 4000
+
+
+def test_stats_include_batches_in_flight():
+    stream = SensorStream("SENSOR_1")
+    seen = []
+
+    def records():
+        for _ in range(data_stream.CHUNK_SIZE):
+            yield {"temp": 10}
+        seen.append(stream.processed)
+        yield {"temp": 20}
+
+    stream.process_batch(records())
+    assert seen == [data_stream.CHUNK_SIZE]
+    assert stream.processed == data_stream.CHUNK_SIZE + 1
+
+
+def test_snapshot_restores_statistics():
+    stream = TransactionStream("TRANS_1")
+    stream.process_batch([{"buy": 100}, {"sell": 30}])
+    copy = TransactionStream("TRANS_1")
+    copy.restore(json.loads(json.dumps(stream.snapshot())))
+    assert copy.get_stats() == stream.get_stats()
+
+
+def test_pickled_stream_starts_with_empty_stats():
+    stream = SensorStream("SENSOR_1")
+    stream.process_batch([{"temp": 20}])
+    copy = pickle.loads(pickle.dumps(stream))
+    assert copy.processed == 0
+    copy.process_batch([{"temp": 30}])
+    assert copy.avg == 30.0
+
+
+def test_readings_route_to_their_channels():
+    stream = SensorStream("SENSOR_1")
+    stream.process_batch([{"temp": 20, "humidity": 60}, {"temp": 30},
+                          {"pressure": 1000}, {"wind": 5}, "noise"])
+    channels = stream.channel_stats()
+    assert list(channels) == ["temp", "humidity", "pressure"]
+    assert channels["temp"]["count"] == 2
+    assert channels["temp"]["mean"] == 25.0
+    assert (channels["temp"]["min"], channels["temp"]["max"]) == (20, 30)
+    assert channels["humidity"]["mean"] == 60.0
+    assert channels["pressure"]["count"] == 1
+
+
+def test_non_numeric_readings_are_rejected():
+    stream = SensorStream("SENSOR_1")
+    assert stream.process_batch([{"temp": "n/a"}]) == "1 readings processed"
+    assert stream.stats.merged().rejected == 1
+    assert stream.channel_stats()["temp"]["mean"] is None
+    assert "average" not in stream.get_stats()
+
+
+def test_registered_channel_is_aggregated_and_restored():
+    stream = SensorStream("SENSOR_1", channels=["temp"])
+    stream.register_channel("co2")
+    stream.register_channel("co2")
+    stream.process_batch([{"co2": 400}, {"co2": 500}, {"temp": 21}])
+    assert stream.channels == ["temp", "co2"]
+    assert stream.channel_stats()["co2"]["mean"] == 450.0
+
+    copy = SensorStream("SENSOR_1", channels=["temp"])
+    copy.restore(stream.snapshot())
+    assert copy.channels == ["temp", "co2"]
+    assert copy.channel_stats() == stream.channel_stats()
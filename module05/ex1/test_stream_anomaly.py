@@ -0,0 +1,90 @@
+"""Tests for the online anomaly detectors of sensor streams."""
+
+import pickle
+import random
+import statistics
+from functools import partial
+
+import pytest
+
+from stream_anomaly import (AnomalyMonitor, EWMADetector, WindowDetector)
+
+
+def noisy(count, seed=0, drift=0.0):
+    rng = random.Random(seed)
+    return [20.0 + drift * i + rng.gauss(0, 0.5) for i in range(count)]
+
+
+@pytest.mark.parametrize("factory", [
+    partial(EWMADetector, threshold=4.0),
+    partial(WindowDetector, window=100),
+    partial(WindowDetector, window=100, method="mad", threshold=5.0),
+])
+def test_detectors_flag_injected_spikes(factory):
+    readings = noisy(1000, seed=3)
+    for index in (300, 700):
+        readings[index] += 10.0
+    flagged = AnomalyMonitor(factory).observe_many("temp", readings)
+    assert {300, 700} <= {anomaly.index for anomaly in flagged}
+
+
+def test_mad_spread_tracks_current_window_on_drifting_data():
+    detector = WindowDetector(window=50, method="mad")
+    for value in noisy(400, seed=1, drift=0.5):
+        detector.observe(value)
+        window = list(detector._ring)
+        if len(window) == 50:
+            median = statistics.median(window)
+            expected = statistics.median(abs(x - median) for x in window)
+            assert detector._mad_spread(median) == pytest.approx(expected)
+
+
+def test_mad_scores_spike_on_drifting_data():
+    readings = noisy(600, seed=2, drift=0.02)
+    readings[500] += 6.0
+    monitor = AnomalyMonitor(partial(WindowDetector, window=100,
+                                     method="mad", threshold=5.0))
+    flagged = monitor.observe_many("temp", readings)
+    assert [anomaly.index for anomaly in flagged] == [500]
+
+
+def test_window_zscore_matches_window_statistics():
+    detector = WindowDetector(window=20)
+    readings = noisy(100, seed=4)
+    for value in readings:
+        detector.observe(value)
+    window = readings[-20:]
+    assert detector._mean == pytest.approx(statistics.fmean(window))
+    assert detector._m2 / 19 == pytest.approx(statistics.variance(window))
+
+
+def test_detectors_validate_parameters():
+    with pytest.raises(ValueError):
+        EWMADetector(alpha=1.5)
+    with pytest.raises(ValueError):
+        WindowDetector(window=1)
+    with pytest.raises(ValueError):
+        WindowDetector(method="iqr")
+
+
+def test_monitor_counts_drains_and_calls_back():
+    seen = []
+    monitor = AnomalyMonitor(partial(EWMADetector, threshold=4.0),
+                             on_alert=seen.append)
+    readings = noisy(200, seed=5)
+    readings[150] += 20.0
+    records = [{"temp": value} for value in readings] + [{"temp": "n/a"}]
+    found = list(monitor.feed(records))
+    assert [anomaly.index for anomaly in found] == [150]
+    assert seen == found
+    assert monitor.counts == {"temp": 1}
+    assert monitor.drain() == found
+    assert monitor.drain() == []
+
+
+def test_monitor_pickles_without_its_lock():
+    monitor = AnomalyMonitor()
+    monitor.observe_many("temp", noisy(50))
+    clone = pickle.loads(pickle.dumps(monitor))
+    assert clone.detectors["temp"].count == 50
+    assert clone.observe("temp", 20.0) is None
@@ -0,0 +1,83 @@
+"""Tests for async chunking, ingestion and the async stream methods."""
+
+import asyncio
+
+import pytest
+
+from data_stream import EventStream, SensorStream, TransactionStream
+from stream_async import STREAM_END, StreamIngestor, achunks
+
+
+async def _aiter(records):
+    for record in records:
+        await asyncio.sleep(0)
+        yield record
+
+
+async def _collect(source, size):
+    return [chunk async for chunk in achunks(source, size)]
+
+
+def test_achunks_splits_every_source_kind():
+    async def run():
+        queue = asyncio.Queue()
+        for record in range(5):
+            queue.put_nowait(record)
+        queue.put_nowait(STREAM_END)
+        return (await _collect(queue, 2),
+                await _collect(_aiter(range(5)), 2),
+                await _collect(range(5), 2))
+
+    for chunks in asyncio.run(run()):
+        assert chunks == [[0, 1], [2, 3], [4]]
+
+
+def test_achunks_drains_queue_until_end():
+    async def run():
+        queue = asyncio.Queue()
+        reader = asyncio.ensure_future(_collect(queue, 100))
+        await queue.put(1)
+        await asyncio.sleep(0)
+        await queue.put(2)
+        await queue.put(STREAM_END)
+        return await reader, queue.qsize()
+
+    chunks, depth = asyncio.run(run())
+    assert [record for chunk in chunks for record in chunk] == [1, 2]
+    assert depth == 0
+
+
+def test_ingestor_processes_every_producer():
+    readings = [{"temp": 20}, {"temp": 30}] * 50
+    ingestor = StreamIngestor(SensorStream("SENSOR_1"), maxsize=8,
+                              chunk_size=16)
+    stats = asyncio.run(ingestor.ingest(_aiter(readings), readings))
+    assert stats["processed"] == 200
+    assert stats["average"] == 25.0
+    metrics = ingestor.metrics()
+    assert metrics["consumed"] == 200
+    assert metrics["depth"] == 0
+    assert metrics["max_depth"] <= metrics["capacity"] == 8
+    assert metrics["put_waits"] > 0
+    assert metrics["batches"] >= 200 // 16
+
+
+def test_ingestor_rejects_empty_queue():
+    with pytest.raises(ValueError):
+        StreamIngestor(EventStream("EVENT_1"), maxsize=0)
+
+
+def test_async_methods_match_sync_methods():
+    operations = [{"buy": 100}, {"sell": 900}, {"buy": 75}]
+    expected = TransactionStream("TRANS_1")
+    stream = TransactionStream("TRANS_1")
+
+    async def run():
+        return (await stream.aprocess_batch(_aiter(operations)),
+                await stream.afilter_data(_aiter(operations),
+                                          "High-priority"))
+
+    summary, filtered = asyncio.run(run())
+    assert summary == expected.process_batch(operations)
+    assert filtered == expected.filter_data(operations, "High-priority")
+    assert stream.get_stats() == expected.get_stats()
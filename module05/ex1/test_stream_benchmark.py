@@ -0,0 +1,69 @@
+"""Tests for the stream load generators and the benchmark harness."""
+
+import json
+from collections import Counter
+
+import pytest
+
+from stream_benchmark import (EVENT_TYPES, _regressions, event_load, main,
+                              measure, run_benchmarks, sensor_load,
+                              transaction_load)
+
+
+def test_loads_are_reproducible():
+    assert list(sensor_load(200, seed=4)) == list(sensor_load(200, seed=4))
+    assert list(transaction_load(200)) != list(transaction_load(200, 1))
+
+
+def test_loads_produce_the_requested_shapes():
+    readings = list(sensor_load(5000))
+    assert len(readings) == 5000
+    assert all(len(reading) == 1 for reading in readings)
+    operations = list(transaction_load(700))
+    assert len(operations) == 700
+    assert {key for op in operations for key in op} == {"buy", "sell"}
+    events = Counter(event_load(5000))
+    assert sum(events.values()) == 5000
+    assert set(events) <= set(EVENT_TYPES)
+    assert events.most_common(1)[0][0] == EVENT_TYPES[0]
+
+
+def test_measure_reports_throughput_and_memory():
+    calls = []
+    result = measure(lambda: calls.append(bytearray(64 * 1024)), 10,
+                     repeat=2)
+    assert len(calls) == 3
+    assert result["ops_per_sec"] > 0
+    assert result["peak_kib"] >= 64
+
+
+def test_run_benchmarks_covers_every_stream():
+    results = run_benchmarks(records=300, repeat=1)
+    assert list(results) == ["SensorStream", "TransactionStream",
+                             "EventStream"]
+    for section in results.values():
+        assert {"process_batch", "generator_feed", "summary.update",
+                "process_packed", "filter_data[None]",
+                "filter_data[High-priority]",
+                "StreamProcessor.process_and_filter"} == set(section)
+
+
+def test_regressions_respect_tolerance():
+    baseline = {"EventStream": {"process_batch": {"ops_per_sec": 1000}}}
+    slower = {"EventStream": {"process_batch": {"ops_per_sec": 850},
+                              "new_operation": {"ops_per_sec": 1}}}
+    assert _regressions(slower, baseline, 0.2) == []
+    found = _regressions(slower, baseline, 0.1)
+    assert found == ["EventStream.process_batch: 850 ops/sec < "
+                     "1000 baseline"]
+
+
+def test_main_fails_on_regression(tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+    section = {"process_batch": {"ops_per_sec": 10 ** 12}}
+    baseline.write_text(json.dumps({"results": {"EventStream": section}}))
+    with pytest.raises(SystemExit) as exit_info:
+        main(["--records", "100", "--repeat", "1",
+              "--baseline", str(baseline)])
+    assert exit_info.value.code == 1
+    assert "FAIL: EventStream.process_batch" in capsys.readouterr().err
@@ -0,0 +1,56 @@
+"""Tests for the parallel dispatch of mixed stream feeds."""
+
+import pytest
+
+from data_stream import StreamRegistry
+from stream_dispatcher import STREAM_NOT_FOUND, StreamDispatcher
+
+FEED = [
+    ("SENSOR_1", [{"temp": 20}]),
+    ("TRANS_1", [{"buy": 100}, {"sell": 40}]),
+    ("SENSOR_1", [{"temp": 30}, {"humidity": 50}]),
+    ("EVENT_1", ["login", "error"]),
+    ("UNKNOWN_1", [1]),
+]
+
+
+def test_group_keeps_stream_order():
+    groups = StreamDispatcher.group(FEED)
+    assert list(groups) == ["SENSOR_1", "TRANS_1", "EVENT_1", "UNKNOWN_1"]
+    assert groups["SENSOR_1"] == [[{"temp": 20}],
+                                  [{"temp": 30}, {"humidity": 50}]]
+
+
+@pytest.mark.parametrize("mode", [StreamDispatcher.THREAD,
+                                  StreamDispatcher.PROCESS])
+def test_dispatch_matches_sequential_processing(mode):
+    sequential = StreamRegistry()
+    expected = {}
+    for stream_id, batch in FEED:
+        stream = sequential.get(stream_id)
+        if stream is not None:
+            expected.setdefault(stream_id, []).append(
+                stream.process_batch(batch))
+
+    registry = StreamRegistry()
+    report = StreamDispatcher(registry, workers=2, mode=mode).dispatch(FEED)
+    assert list(report) == ["SENSOR_1", "TRANS_1", "EVENT_1", "UNKNOWN_1"]
+    for stream_id, batches in expected.items():
+        assert report[stream_id]["batches"] == batches
+        assert report[stream_id]["stats"] == (
+            sequential.get(stream_id).get_stats())
+    assert registry.get("SENSOR_1").processed == 3
+
+
+def test_unknown_streams_are_reported():
+    report = StreamDispatcher(StreamRegistry()).dispatch([("NOPE_1", [1]),
+                                                          ("NOPE_1", [2])])
+    assert report == {"NOPE_1": {"batches": [STREAM_NOT_FOUND] * 2,
+                                 "stats": {}}}
+
+
+def test_dispatcher_validates_arguments():
+    with pytest.raises(ValueError):
+        StreamDispatcher(mode="fiber")
+    with pytest.raises(ValueError):
+        StreamDispatcher(workers=0)
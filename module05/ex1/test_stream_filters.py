@@ -0,0 +1,90 @@
+"""Tests for the filter expression language and its use by streams."""
+
+from collections import OrderedDict
+
+import pytest
+
+from data_stream import EventStream, SensorStream, TransactionStream
+from stream_filters import FilterSyntaxError, compile_filter
+
+
+@pytest.mark.parametrize("expression, record, expected", [
+    ("temp > 30", {"temp": 31}, True),
+    ("temp > 30", {"temp": 30}, False),
+    ("temp >= 30 and temp <= 40", {"temp": 35}, True),
+    ("temp < 0 or pressure > 1020", {"pressure": 1030}, True),
+    ("not (temp < 30)", {"temp": 40}, True),
+    ('key == "sell" and value >= 500', {"sell": 600}, True),
+    ('key == "sell" and value >= 500', {"buy": 600}, False),
+    ('value == "error"', "error", True),
+    ("flag == true", {"flag": True}, True),
+    ("1 < 2", None, True),
+])
+def test_expressions_evaluate(expression, record, expected):
+    assert compile_filter(expression)(record) is expected
+
+
+def test_missing_fields_and_type_mismatches_are_false():
+    predicate = compile_filter("temp > 30")
+    assert predicate({"humidity": 50}) is False
+    assert predicate({"temp": "n/a"}) is False
+    assert predicate("temp") is False
+
+
+def test_dict_subclasses_are_records():
+    assert compile_filter("temp > 30")(OrderedDict(temp=35)) is True
+    assert compile_filter('key == "temp"')(OrderedDict(temp=1)) is True
+    assert compile_filter("value == 1")(OrderedDict(temp=1)) is True
+
+
+def test_compiled_filters_are_cached():
+    assert compile_filter("temp > 1") is compile_filter("temp > 1")
+
+
+@pytest.mark.parametrize("expression", [
+    "temp >", "temp > 30 and", "(temp > 30", "temp > 30)", "temp ~ 3",
+    "temp 30",
+])
+def test_malformed_expressions_raise(expression):
+    with pytest.raises(FilterSyntaxError):
+        compile_filter(expression)
+
+
+def test_negated_expression_skips_malformed_records():
+    stream = SensorStream("SENSOR_TEST")
+    batch = [{"temp": 40}, "x", {"temp": 20, "humidity": 5}, {"temp": 20}]
+    assert stream.filter_data(batch, "not temp < 30") == [{"temp": 40}]
+
+
+def test_named_and_expression_criteria():
+    trades = TransactionStream("TRANS_TEST")
+    batch = [{"buy": 10}, {"sell": 900}, {"buy": 2000}, 7]
+    assert trades.filter_data(batch, "High-priority") == [{"sell": 900},
+                                                          {"buy": 2000}]
+    assert trades.filter_data(batch, 'key == "buy"') == [{"buy": 10},
+                                                         {"buy": 2000}]
+
+
+def test_multi_field_expression_matches_multi_channel_readings():
+    stream = SensorStream("SENSOR_TEST")
+    batch = [{"pressure": 1030, "temp": 25}, {"pressure": 1030},
+             {"pressure": 1000, "temp": 25}, {"pressure": 1030, "temp": 35}]
+    assert stream.filter_data(batch, "pressure > 1020 and temp < 30") == [
+        {"pressure": 1030, "temp": 25}]
+    assert stream.filter_data(batch, "pressure > 1020") == [
+        {"pressure": 1030, "temp": 25}, {"pressure": 1030},
+        {"pressure": 1030, "temp": 35}]
+
+
+def test_unknown_label_keeps_well_formed_records():
+    events = EventStream("EVENT_TEST")
+    assert events.filter_data(["login", 3, "error"], "recent") == [
+        "login", "error"]
+    sensors = SensorStream("SENSOR_TEST")
+    assert sensors.filter_data([{"temp": 1}, {"temp": 1, "humidity": 2}],
+                               "low priority") == [{"temp": 1}]
+
+
+def test_stream_rejects_malformed_expression():
+    with pytest.raises(FilterSyntaxError):
+        SensorStream("SENSOR_TEST").filter_data([{"temp": 1}], "temp >")
@@ -0,0 +1,178 @@
+"""Tests for the streaming sketches and the stream statistics built on them."""
+
+import json
+import random
+
+import pytest
+
+import data_stream
+from data_stream import EventStream, SensorStream, TransactionStream
+from stream_sketches import (CountMinSketch, HyperLogLog, QuantileSketch,
+                             SpaceSaving)
+from stream_wire import encode_batch
+
+
+def _rank_error(sketch: QuantileSketch, values, q: float) -> float:
+    ordered = sorted(values)
+    estimate = sketch.quantile(q)
+    return abs(ordered.index(estimate) / len(ordered) - q)
+
+
+def test_quantiles_stay_within_rank_error():
+    values = list(range(20000))
+    random.Random(1).shuffle(values)
+    sketch = QuantileSketch(k=200, seed=1)
+    sketch.update_many(values)
+    assert sketch.n == 20000
+    assert sketch._size < 3 * 200 * 2
+    for q in (0.5, 0.95, 0.99):
+        assert _rank_error(sketch, values, q) < 0.02
+
+
+def test_small_sketch_is_exact():
+    sketch = QuantileSketch()
+    for value in (5, 1, 3):
+        sketch.update(value)
+    assert sketch.quantiles((0, 0.5, 1)) == [1, 3, 5]
+
+
+def test_merged_sketches_cover_both_streams():
+    left, right = QuantileSketch(seed=1), QuantileSketch(seed=2)
+    left.update_many(range(0, 5000))
+    right.update_many(range(5000, 10000))
+    merged = left.merge(right)
+    assert merged.n == 10000
+    assert abs(merged.quantile(0.5) - 5000) < 200
+
+
+def test_seeded_sketches_flip_coins_lazily():
+    values = [random.Random(5).random() for _ in range(10000)]
+    first, second = QuantileSketch(k=50, seed=7), QuantileSketch(k=50, seed=7)
+    for sketch in (first, second):
+        sketch.update_many(values[:10])
+        assert sketch._rng is None
+        sketch.update_many(values[10:])
+    assert first._rng is not None
+    assert first.to_dict() == second.to_dict()
+    empty = QuantileSketch()
+    assert first.merge(empty).n == 10000
+    assert empty.merge(first).to_dict()["n"] == 10000
+
+
+def test_sketch_survives_json_round_trip():
+    sketch = QuantileSketch(seed=3)
+    sketch.update_many(range(1000))
+    copy = QuantileSketch.from_dict(json.loads(json.dumps(sketch.to_dict())))
+    assert copy.n == sketch.n
+    assert copy.percentiles() == sketch.percentiles()
+
+
+def test_empty_sketch_has_no_quantiles():
+    assert QuantileSketch().percentiles() == {"p50": None, "p95": None,
+                                              "p99": None}
+
+
+@pytest.mark.parametrize("factory", [
+    lambda: QuantileSketch(k=4),
+    lambda: QuantileSketch.k_for_error(0),
+    lambda: QuantileSketch().quantile(1.5),
+])
+def test_sketch_rejects_bad_parameters(factory):
+    with pytest.raises(ValueError):
+        factory()
+
+
+def test_streams_report_percentiles():
+    sensors = SensorStream("SENSOR_1")
+    sensors.process_batch([{"temp": float(value)} for value in range(101)])
+    temp = sensors.channel_stats()["temp"]
+    assert abs(temp["p50"] - 50) <= 2
+    assert abs(temp["p99"] - 99) <= 2
+
+    transactions = TransactionStream("TRANS_1")
+    transactions.process_batch([{"buy": value} for value in range(1, 101)])
+    stats = transactions.get_stats()
+    assert abs(stats["size p95"] - 95) <= 2
+
+
+def test_space_saving_keeps_heavy_hitters():
+    summary = SpaceSaving(k=4)
+    stream = ["a"] * 50 + ["b"] * 30 + [f"noise{i}" for i in range(40)]
+    random.Random(2).shuffle(stream)
+    for item in stream:
+        summary.add(item)
+    top = summary.top(2)
+    assert [item for item, _ in top] == ["a", "b"]
+    assert top[0][1] >= 50 and top[1][1] >= 30
+    assert summary.total == 120
+
+
+def test_count_min_never_underestimates():
+    sketch = CountMinSketch(width=64, depth=4)
+    for value in range(500):
+        sketch.add(value % 50)
+    assert all(sketch.estimate(value) >= 10 for value in range(50))
+
+
+def test_hyperloglog_estimates_distinct_items():
+    counter = HyperLogLog(precision=12)
+    for value in range(20000):
+        counter.add(value % 10000)
+    assert abs(counter.estimate() - 10000) < 500
+
+
+def test_sketches_reject_bad_shapes():
+    with pytest.raises(ValueError):
+        CountMinSketch(width=8).merge(CountMinSketch(width=16))
+    with pytest.raises(ValueError):
+        HyperLogLog(precision=10).merge(HyperLogLog(precision=12))
+    with pytest.raises(ValueError):
+        SpaceSaving(k=0)
+
+
+def test_event_stream_tracks_top_and_distinct_events():
+    stream = EventStream("EVENT_1")
+    stream.process_batch(["login", "error", "login"])
+    stream.process_batch(["logout", "login", "error"])
+    assert stream.top_events(2) == [("login", 3), ("error", 2)]
+    assert stream.event_frequency("login") >= 3
+    assert stream.distinct_events() == 3
+    stats = stream.get_stats()
+    assert stats["top event"] == "login"
+    assert stats["distinct"] == 3
+
+
+def test_event_statistics_survive_snapshot():
+    stream = EventStream("EVENT_1")
+    stream.process_batch(["login", "error", "login"])
+    copy = EventStream("EVENT_1")
+    copy.restore(json.loads(json.dumps(stream.snapshot())))
+    assert copy.top_events() == stream.top_events()
+    assert copy.distinct_events() == stream.distinct_events()
+
+
+def test_event_batches_do_not_build_sketches():
+    stream = EventStream("EVENT_1")
+    summary = stream.new_summary().update(["login", "error", {"x": 1}, 3])
+    assert summary._sketches is None
+    assert dict(summary.tally) == {"login": 1, "error": 1}
+    assert (summary.count, summary.errors) == (4, 1)
+    stream.process_batch(["login", "error"])
+    assert stream.stats.shard().totals._sketches is None
+
+
+def test_event_tally_is_flushed_past_its_limit():
+    summary = EventStream("EVENT_1").new_summary()
+    summary.update(f"event{i}" for i in range(data_stream.TALLY_LIMIT))
+    assert summary._sketches is not None
+    assert not summary.tally
+    assert abs(summary.distinct.estimate() - data_stream.TALLY_LIMIT) < 200
+    assert summary.frequencies.estimate("event7") >= 1
+
+
+def test_packed_events_count_errors():
+    stream = EventStream("EVENT_1")
+    stream.process_packed(encode_batch(["error", "login", "error"]))
+    stream.process_batch(["error"])
+    assert stream.error == 3
+    assert stream.top_events(1) == [("error", 3)]
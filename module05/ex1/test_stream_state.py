@@ -0,0 +1,142 @@
+"""Tests for the stream state snapshot log."""
+
+import json
+
+import pytest
+
+from data_stream import StreamRegistry
+from stream_state import StreamStateStore
+
+
+def stats_of(registry):
+    return {stream_id: stream.get_stats()
+            for stream_id, stream in registry.streams.items()}
+
+
+def test_save_and_restore_round_trip(tmp_path):
+    path = str(tmp_path / "state.jsonl")
+    registry = StreamRegistry()
+    registry.get("SENSOR_001").process_batch([{"temp": 21.5}])
+    registry.get("TRANS_001").process_batch([{"buy": 100}, {"sell": 40}])
+    registry.get("EVENT_001").process_batch(["login", "error"])
+    store = StreamStateStore(path)
+    assert store.save(registry) == 3
+    assert store.save(registry) == 0
+
+    fresh = StreamRegistry()
+    restored = StreamStateStore(path).restore(fresh)
+    assert sorted(restored) == ["EVENT_001", "SENSOR_001", "TRANS_001"]
+    assert stats_of(fresh) == stats_of(registry)
+
+
+def test_log_is_compacted_to_one_line_per_stream(tmp_path):
+    path = tmp_path / "state.jsonl"
+    registry = StreamRegistry()
+    store = StreamStateStore(str(path), compact_ratio=2)
+    for step in range(5):
+        registry.get("TRANS_001").process_batch([{"buy": step}])
+        store.save(registry)
+    assert store.compactions >= 1
+    assert len(path.read_text().splitlines()) <= 2
+
+
+def test_append_after_torn_line_keeps_new_snapshot(tmp_path):
+    path = tmp_path / "state.jsonl"
+    registry = StreamRegistry()
+    stream = registry.get("TRANS_001")
+    stream.process_batch([{"buy": 1}])
+    StreamStateStore(str(path)).save(registry)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"stream_id": "TRANS_001", "sta')
+
+    stream.process_batch([{"buy": 1000}])
+    store = StreamStateStore(str(path))
+    with pytest.warns(RuntimeWarning):
+        store.save(registry)
+    assert store.truncated == 1
+    assert path.read_text().endswith("\n")
+
+    fresh = StreamRegistry()
+    StreamStateStore(str(path)).restore(fresh)
+    assert fresh.get("TRANS_001").get_stats() == stream.get_stats()
+
+
+def test_unreadable_lines_are_counted(tmp_path):
+    path = tmp_path / "state.jsonl"
+    path.write_text('not json\n{"no_stream_id": 1}\n', encoding="utf-8")
+    store = StreamStateStore(str(path))
+    with pytest.warns(RuntimeWarning):
+        assert store.restore(StreamRegistry()) == []
+    assert store.skipped == 2
+
+
+def test_restore_skips_unknown_stream_types(tmp_path):
+    path = tmp_path / "state.jsonl"
+    entry = {"stream_id": "OTHER_001", "time": 0, "state": {}}
+    path.write_text(json.dumps(entry) + "\n", encoding="utf-8")
+    assert StreamStateStore(str(path)).restore(StreamRegistry()) == []
+
+
+def test_compact_ratio_is_validated(tmp_path):
+    with pytest.raises(ValueError):
+        StreamStateStore(str(tmp_path / "state.jsonl"), compact_ratio=1)
+
+
+def test_later_saves_append_deltas(tmp_path):
+    path = tmp_path / "state.jsonl"
+    registry = StreamRegistry()
+    stream = registry.get("TRANS_001")
+    store = StreamStateStore(str(path), compact_ratio=100)
+    stream.process_batch([{"buy": 100}, {"sell": 40}])
+    store.save(registry)
+    stream.process_batch([{"buy": 7}])
+    store.save(registry)
+    first, second = map(json.loads, path.read_text().splitlines())
+    assert first["state"]["count"] == 2
+    assert second["delta"]["count"] == 1 and "state" not in second
+
+    fresh = StreamRegistry()
+    StreamStateStore(str(path)).restore(fresh)
+    assert stats_of(fresh) == stats_of(registry)
+
+
+def test_compaction_folds_deltas_into_snapshots(tmp_path):
+    path = tmp_path / "state.jsonl"
+    registry = StreamRegistry()
+    store = StreamStateStore(str(path), compact_ratio=100)
+    for step in range(4):
+        registry.get("SENSOR_001").process_batch([{"temp": 20 + step}])
+        registry.get("EVENT_001").process_batch(["login", "error"])
+        store.save(registry)
+    store.compact(registry)
+    entries = [json.loads(line) for line in path.read_text().splitlines()]
+    assert sorted(entry["stream_id"] for entry in entries) == [
+        "EVENT_001", "SENSOR_001"]
+    assert all("state" in entry for entry in entries)
+
+    fresh = StreamRegistry()
+    StreamStateStore(str(path)).restore(fresh)
+    assert stats_of(fresh) == stats_of(registry)
+
+
+def test_failed_append_keeps_the_delta(tmp_path, monkeypatch):
+    path = tmp_path / "state.jsonl"
+    registry = StreamRegistry()
+    stream = registry.get("TRANS_001")
+    store = StreamStateStore(str(path), compact_ratio=100)
+    stream.process_batch([{"buy": 1}])
+    store.save(registry)
+    stream.process_batch([{"buy": 2}])
+
+    def fail():
+        raise OSError("disk full")
+
+    monkeypatch.setattr(store, "_repair", fail)
+    with pytest.raises(OSError):
+        store.save(registry)
+    monkeypatch.undo()
+    assert store.save(registry) == 1
+
+    fresh = StreamRegistry()
+    StreamStateStore(str(path)).restore(fresh)
+    assert stats_of(fresh) == stats_of(registry)
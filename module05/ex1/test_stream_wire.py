@@ -0,0 +1,67 @@
+"""Tests for the binary wire format of stream batches."""
+
+import pytest
+
+from data_stream import EventStream, SensorStream, TransactionStream
+from stream_wire import MAGIC, PackedBatch, decode_batch, encode_batch
+
+TRANSACTIONS = [{"buy": 100}, {"sell": 150}, {"buy": 75}]
+EVENTS = ["login", "error", "login"]
+
+
+@pytest.mark.parametrize("records", [
+    TRANSACTIONS,
+    [{"temp": 22.5}, {"humidity": 65.25}],
+    [{"buy": 2 ** 40}, {"sell": -3}],
+    EVENTS,
+    [],
+])
+def test_batches_round_trip(records):
+    data = encode_batch(records)
+    assert data.startswith(MAGIC)
+    assert list(decode_batch(data)) == records
+    assert len(PackedBatch.from_records(records)) == len(records)
+
+
+def test_integer_values_use_narrow_arrays():
+    small = [{"buy": value} for value in range(1000)]
+    large = [{"buy": value + 2 ** 40} for value in range(1000)]
+    assert len(encode_batch(small)) < 5 * len(small) + 64
+    assert len(encode_batch(large)) > 9 * len(large)
+
+
+@pytest.mark.parametrize("records", [
+    [{"buy": 1, "sell": 2}],
+    [{"buy": "x"}],
+    ["login", {"buy": 1}],
+    [3],
+])
+def test_unpackable_records_raise(records):
+    with pytest.raises(ValueError):
+        encode_batch(records)
+
+
+@pytest.mark.parametrize("data", [
+    b"",
+    b"NOPE" + bytes(12),
+    encode_batch(TRANSACTIONS)[:-1],
+    encode_batch(EVENTS)[:20],
+])
+def test_malformed_data_raises(data):
+    with pytest.raises(ValueError):
+        decode_batch(data)
+
+
+@pytest.mark.parametrize("stream_class, records", [
+    (TransactionStream, TRANSACTIONS),
+    (SensorStream, [{"temp": 20}, {"pressure": 1030}, {"temp": 25}]),
+    (EventStream, EVENTS),
+])
+def test_packed_batches_match_record_batches(stream_class, records):
+    expected = stream_class("A_1")
+    packed = stream_class("A_1")
+    assert packed.process_packed(encode_batch(records)) == (
+        expected.process_batch(records))
+    assert packed.process_packed(PackedBatch.from_records(records)) == (
+        expected.process_batch(records))
+    assert packed.get_stats() == expected.get_stats()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Nexus Pipeline Benchmarks
+
+Measure cold-start and throughput of `nexus_pipeline` and fail when the
+import time exceeds a fixed budget, so startup regressions of short-lived
+CLI invocations are caught early.
+
+The gated import time excludes the standard-library modules in
+`PRELOADED`, which are imported first in the same interpreter. `typing`
+alone costs several times the module body and varies more between runs
+than the whole budget, so only the module body and any import added
+later are gated; the full cold import is reported alongside.
+
+Functions:
+    measure_import_time:
+        Return the best cumulative `-X importtime` cost of a module.
+    measure_throughput:
+        Return payloads per second for each demo pipeline.
+    main:
+        Run the benchmarks and enforce the import-time budget.
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from typing import Any, Dict, Sequence
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+# Standard-library modules nexus_pipeline imports at load time on purpose.
+PRELOADED = ("typing", "threading")
+# The module body takes 1 to 1.3 ms on a slow runner, so the budget
+# leaves about 2x headroom while importing json at load time (about
+# 2 ms more) still fails the gate.
+IMPORT_BUDGET_US = 2500
+
+
+def measure_import_time(module: str = "nexus_pipeline", runs: int = 5,
+                        preload: Sequence[str] = ()) -> int:
+    """Measure the import cost of `module` in fresh interpreters.
+
+    A first untimed run writes the bytecode cache, so only the import
+    itself is measured. The best of `runs` samples is returned to filter
+    out scheduling noise.
+
+    Args:
+        module: Name of the module to import.
+        runs: Number of timed interpreter launches.
+        preload: Modules imported first, excluded from the cost.
+
+    Returns:
+        Cumulative import time in microseconds.
+    """
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    pattern = re.compile(
+        rf"import time:\s+\d+ \|\s+(\d+) \| {re.escape(module)}$"
+    )
+    samples = []
+    for _ in range(runs + 1):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c",
+             "; ".join(f"import {name}" for name in (*preload, module))],
+            cwd=BENCH_DIR, env=env, capture_output=True, text=True,
+            check=True
+        )
+        for line in proc.stderr.splitlines():
+            match = pattern.match(line)
+            if match:
+                samples.append(int(match.group(1)))
+    if len(samples) < 2:
+        raise RuntimeError(f"No import time reported for {module}")
+    return min(samples[1:])
+
+
+def measure_throughput(records: int = 10000) -> Dict[str, float]:
+    """Measure payloads per second through the demo pipelines.
+
+    Args:
+        records: Number of payloads sent through each pipeline.
+
+    Returns:
+        Dictionary mapping pipeline id to payloads per second.
+    """
+    import nexus_pipeline as nexus
+
+    manager = nexus.NexusManager()
+    inputs: Dict[str, Any] = {
+        "JSON_001": {"sensor": "temp", "value": 23.5, "unit": "C"},
+        "CSV_001": "user,action,timestamp",
+        "Stream_001": [
+            {"sensor": "temp", "value": 22.0 + i * 0.1, "unit": "C"}
+            for i in range(5)
+        ]
+    }
+    adapters = [nexus.JSONAdapter, nexus.CSVAdapter, nexus.StreamAdapter]
+    for adapter, p_id in zip(adapters, inputs):
+        pipeline = adapter(p_id)
+        for stage in (nexus.InputStage, nexus.TransformStage,
+                      nexus.OutputStage):
+            pipeline.add_stage(stage)
+        manager.add_pipeline(pipeline)
+
+    results = {}
+    for p_id, data in inputs.items():
+        start = time.perf_counter()
+        for _ in range(records):
+            manager.process_data(p_id, data)
+        elapsed = time.perf_counter() - start
+        results[p_id] = records / elapsed
+    return results
+
+
+def main() -> None:
+    """Run the benchmarks and exit non-zero if over the import budget."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--runs", type=int, default=5,
+                        help="timed interpreter launches for import time")
+    parser.add_argument("--budget-us", type=int, default=IMPORT_BUDGET_US,
+                        help="maximum allowed import time in microseconds")
+    parser.add_argument("--records", type=int, default=10000,
+                        help="payloads per pipeline for throughput")
+    args = parser.parse_args()
+
+    if BENCH_DIR not in sys.path:
+        sys.path.insert(0, BENCH_DIR)
+    import_us = measure_import_time(runs=args.runs, preload=PRELOADED)
+    report = {
+        "import_time_us": import_us,
+        "import_budget_us": args.budget_us,
+        "cold_import_time_us": measure_import_time(runs=args.runs),
+        "throughput_per_sec": measure_throughput(args.records)
+    }
+    print(json.dumps(report, indent=2))
+    if import_us > args.budget_us:
+        print(f"FAIL: import time {import_us}us exceeds budget "
+              f"{args.budget_us}us", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
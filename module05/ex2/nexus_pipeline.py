@@ -17,6 +17,8 @@ Classes:
         Raise for transformation/enrichment failures.
     OutputStageError:
         Raise for output formatting failures.
+    CircuitOpenError:
+        Raise when a stage is skipped because its circuit is open.
     ProcessingStage:
         Describe the `process(data)` interface for a stage.
     InputStage:
@@ -25,6 +27,20 @@ Classes:
         Transform tagged input into enriched/aggregated structures.
     OutputStage:
         Format transformed data into user-facing strings.
+    RetryPolicy:
+        Retry a failing stage with jittered exponential backoff.
+    CircuitBreaker:
+        Short-circuit a repeatedly failing stage.
+    StagePolicy:
+        Bundle retry, circuit breaker and fallback of a stage.
+    PassthroughStage:
+        Forward data unchanged as a minimal backup processor.
+    CheckpointStore:
+        Persist pipeline progress atomically to a local file.
+    LazyStage:
+        Construct a stage on first use.
+    BatchSizeController:
+        Tune batch sizes towards a latency target (AIMD).
     ProcessingPipeline:
         Hold ordered stages and a pipeline id.
     JSONAdapter:
@@ -41,8 +57,21 @@ Functions:
         Serve as entry point for demo execution.
 """
 
+from __future__ import annotations
+
+import itertools
+import os
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Union, Dict, List, Protocol, Optional
+from typing import (Any, Union, Dict, List, Protocol, Optional, Tuple, Type,
+                    Iterable, Iterator, Callable)
+
+# Keep cold start cheap: heavier modules (json, random, tempfile, ...) are
+# imported on first use.
+
+
+_FAILED = object()
 
 
 class NotFoundPipeline(Exception):
@@ -70,6 +99,11 @@ class OutputStageError(StageError):
     pass
 
 
+class CircuitOpenError(StageError):
+    """Raise when a stage is skipped because its circuit is open."""
+    pass
+
+
 class ProcessingStage(Protocol):
     """Describe a single processing stage."""
 
@@ -310,8 +344,395 @@ class OutputStage:
         return result
 
 
+class RetryPolicy:
+    """Describe how a failing stage is retried.
+
+    Attributes:
+        attempts: Total attempts per payload, including the first one.
+        base_delay: Backoff ceiling before the first retry in seconds.
+        max_delay: Upper bound of a single backoff in seconds.
+        retry_on: Stage errors considered transient.
+    """
+
+    def __init__(self, attempts: int = 1, base_delay: float = 0.01,
+                 max_delay: float = 1.0,
+                 retry_on: Tuple[Type[StageError], ...] = (StageError,)
+                 ) -> None:
+        """Initialize RetryPolicy.
+
+        Args:
+            attempts: Total attempts per payload (1 disables retries).
+            base_delay: Backoff ceiling before the first retry in seconds.
+            max_delay: Upper bound of a single backoff in seconds.
+            retry_on: Stage errors considered transient.
+        """
+        if attempts < 1:
+            raise ValueError("attempts must be at least 1")
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_on = retry_on
+
+    def backoff(self, retry: int) -> float:
+        """Return a jittered delay before the given retry.
+
+        Uses "full jitter": a uniform draw below an exponential ceiling,
+        so concurrent callers do not retry in lockstep.
+
+        Args:
+            retry: Zero-based index of the retry.
+
+        Returns:
+            Delay in seconds.
+        """
+        import random
+
+        ceiling = min(self.max_delay, self.base_delay * (2 ** retry))
+        return random.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """Stop calling a stage after repeated failures.
+
+    The circuit opens after `failure_threshold` consecutive failures and
+    rejects calls for `reset_timeout` seconds. Then a single trial call
+    is let through (half-open) and every other call is rejected until
+    it ends: success closes the circuit, failure reopens it. State
+    changes are guarded by a lock, so one breaker can protect a stage
+    shared by concurrent workers.
+
+    Attributes:
+        state: One of "closed", "open" or "half-open".
+        failures: Consecutive failures seen while closed.
+        trips: Number of times the circuit opened.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int = 5,
+                 reset_timeout: float = 30.0) -> None:
+        """Initialize CircuitBreaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit.
+            reset_timeout: Seconds to wait before a half-open trial call.
+        """
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self._opened_at = 0.0
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Return True if the protected stage may be called now.
+
+        While half-open, only the caller admitted as the trial gets True;
+        it must report back with `record_success`, `record_failure` or
+        `release`.
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+            if self._trial:
+                return False
+            self._trial = True
+            return True
+
+    def release(self) -> None:
+        """End a trial call that neither succeeded nor failed."""
+        with self._lock:
+            self._trial = False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        with self._lock:
+            self.failures = 0
+            self.state = self.CLOSED
+            self._trial = False
+
+    def record_failure(self) -> bool:
+        """Count a failed call and open the circuit if needed.
+
+        Returns:
+            True if this failure tripped the circuit.
+        """
+        with self._lock:
+            self.failures += 1
+            self._trial = False
+            if (self.state == self.HALF_OPEN
+                    or self.failures >= self.failure_threshold):
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self.failures = 0
+                self.trips += 1
+                return True
+            return False
+
+
+class StagePolicy:
+    """Bundle the resilience settings of one pipeline stage.
+
+    Attributes:
+        retry: Retry policy applied to the stage.
+        breaker: Optional circuit breaker guarding the stage.
+        fallback: Optional stage used when the stage fails or is open.
+    """
+
+    def __init__(self, retry: Optional[RetryPolicy] = None,
+                 breaker: Optional[CircuitBreaker] = None,
+                 fallback: Optional[ProcessingStage] = None) -> None:
+        """Initialize StagePolicy.
+
+        Args:
+            retry: Retry policy; defaults to a single attempt.
+            breaker: Optional circuit breaker guarding the stage.
+            fallback: Optional backup stage.
+        """
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.breaker = breaker
+        self.fallback = fallback
+
+
+class PassthroughStage:
+    """Forward data unchanged; a minimal backup processor."""
+
+    def process(self, data: Any) -> Any:
+        """Return `data` as is.
+
+        Args:
+            data: Payload from the previous stage.
+
+        Returns:
+            The same payload.
+        """
+        return data
+
+
+class CheckpointStore:
+    """Persist pipeline progress to a local JSON file.
+
+    Writes go to a temporary file in the same directory which is then
+    renamed over the checkpoint, so a crash never leaves a torn file.
+
+    Attributes:
+        path: Location of the checkpoint file.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize CheckpointStore.
+
+        Args:
+            path: Location of the checkpoint file.
+        """
+        self.path = path
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Read the last checkpoint.
+
+        Returns:
+            Saved state, or None if no checkpoint exists yet.
+        """
+        import json
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, state: Dict[str, Any]) -> None:
+        """Atomically replace the checkpoint with `state`.
+
+        Args:
+            state: JSON-serializable pipeline state.
+        """
+        import json
+        import tempfile
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".checkpoint-",
+                                        dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def clear(self) -> None:
+        """Remove the checkpoint, e.g. after a feed completed."""
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class LazyStage:
+    """Construct a stage on first use.
+
+    Attributes:
+        factory: Zero-argument callable building the real stage.
+    """
+
+    def __init__(self, factory: Callable[[], ProcessingStage]) -> None:
+        """Initialize LazyStage.
+
+        Args:
+            factory: Zero-argument callable (usually a stage class).
+        """
+        self.factory = factory
+        self._stage: Optional[ProcessingStage] = None
+
+    @property
+    def stage(self) -> ProcessingStage:
+        """Return the real stage, building it if needed."""
+        if self._stage is None:
+            self._stage = self.factory()
+        return self._stage
+
+    def process(self, data: Any) -> Any:
+        """Run the real stage.
+
+        The first call binds the real stage's `process` on the instance,
+        so later calls go straight to it.
+
+        Args:
+            data: Input payload for the stage.
+
+        Returns:
+            Output of the real stage.
+        """
+        process = self.stage.process
+        self.process = process
+        return process(data)
+
+    def __getattr__(self, name: str) -> Any:
+        """Forward other attributes to the real stage."""
+        if name in ("factory", "_stage"):
+            raise AttributeError(name)
+        return getattr(self.stage, name)
+
+
+class BatchSizeController:
+    """Tune the batch size of a pipeline for throughput under a latency cap.
+
+    A batch slower than `target_latency` shrinks the next batch by
+    `backoff` (multiplicative decrease). A full batch within the target
+    grows it by `step` payloads (additive increase) as long as throughput
+    keeps up with its moving average; once a larger batch processes
+    payloads more slowly than that average minus `tolerance`, the size
+    steps back, so it settles around the fastest batch size. Payload
+    sizes can differ wildly between pipelines, so each pipeline gets its
+    own controller.
+
+    Attributes:
+        target_latency: Latency objective per batch in seconds.
+        size: Current batch size.
+        metrics: Decisions and observations of the controller.
+    """
+
+    def __init__(self, target_latency: float = 0.05, initial_size: int = 16,
+                 min_size: int = 1, max_size: int = 4096, step: int = 8,
+                 backoff: float = 0.5, smoothing: float = 0.2,
+                 tolerance: float = 0.1) -> None:
+        """Initialize BatchSizeController.
+
+        Args:
+            target_latency: Latency objective per batch in seconds.
+            initial_size: Size of the first batch.
+            min_size: Smallest batch size.
+            max_size: Largest batch size.
+            step: Additive increase after a fast batch.
+            backoff: Multiplicative decrease after a slow batch.
+            smoothing: Weight of the newest sample in moving averages.
+            tolerance: Relative throughput drop that stops the growth.
+        """
+        if not 1 <= min_size <= initial_size <= max_size:
+            raise ValueError("expected 1 <= min_size <= initial_size "
+                             "<= max_size")
+        if not 0 < backoff < 1:
+            raise ValueError("backoff must be between 0 and 1")
+        self.target_latency = target_latency
+        self.min_size = min_size
+        self.max_size = max_size
+        self.step = step
+        self.backoff = backoff
+        self.smoothing = smoothing
+        self.tolerance = tolerance
+        self.size = initial_size
+        self.metrics: Dict[str, float] = {
+            "batch_size": initial_size,
+            "batches": 0,
+            "records": 0,
+            "increases": 0,
+            "decreases": 0,
+            "last_latency_ms": 0.0,
+            "avg_latency_ms": 0.0,
+            "throughput_per_sec": 0.0
+        }
+
+    def record(self, count: int, elapsed: float) -> int:
+        """Feed back the measurement of one batch.
+
+        Args:
+            count: Number of payloads in the batch.
+            elapsed: Processing time of the batch in seconds.
+
+        Returns:
+            Batch size to use next.
+        """
+        metrics = self.metrics
+        alpha = self.smoothing if metrics["batches"] else 1.0
+        latency_ms = elapsed * 1000
+        average = metrics["throughput_per_sec"]
+        throughput = count / elapsed if elapsed > 0 else average
+        metrics["batches"] += 1
+        metrics["records"] += count
+        metrics["last_latency_ms"] = latency_ms
+        metrics["avg_latency_ms"] += alpha * (latency_ms
+                                              - metrics["avg_latency_ms"])
+        metrics["throughput_per_sec"] += alpha * (throughput - average)
+
+        if elapsed > self.target_latency:
+            new_size = max(self.min_size, int(self.size * self.backoff))
+        elif count < self.size:
+            new_size = self.size
+        elif throughput < average * (1 - self.tolerance):
+            new_size = max(self.min_size, self.size - self.step)
+        else:
+            new_size = min(self.max_size, self.size + self.step)
+        if new_size > self.size:
+            metrics["increases"] += 1
+        elif new_size < self.size:
+            metrics["decreases"] += 1
+        self.size = new_size
+        metrics["batch_size"] = new_size
+        return new_size
+
+
 class ProcessingPipeline(ABC):
-    """Coordinate ordered processing stages in an abstract pipeline."""
+    """Coordinate ordered processing stages in an abstract pipeline.
+
+    A pipeline may be run by several threads at once (see
+    `nexus_scheduler`); its metrics are updated under a lock.
+    """
 
     def __init__(self, pipeline_id: str) -> None:
         """Initialize pipeline with identifier and empty stage list.
@@ -321,6 +742,20 @@ class ProcessingPipeline(ABC):
         """
         self.pipeline_id: str = pipeline_id
         self.stages: List[ProcessingStage] = []
+        self.policies: List[StagePolicy] = []
+        self.metrics: Dict[str, int] = {
+            "retries": 0,
+            "failures": 0,
+            "trips": 0,
+            "fallbacks": 0,
+            "short_circuits": 0
+        }
+        self._lock = threading.Lock()
+
+    def _count(self, name: str) -> None:
+        """Increment one pipeline metric."""
+        with self._lock:
+            self.metrics[name] += 1
 
     @abstractmethod
     def process(self, data: Any) -> Any:
@@ -334,13 +769,236 @@ class ProcessingPipeline(ABC):
         """
         raise NotImplementedError
 
-    def add_stage(self, stage: ProcessingStage) -> None:
+    def add_stage(self, stage: ProcessingStage,
+                  retry: Optional[RetryPolicy] = None,
+                  breaker: Optional[CircuitBreaker] = None,
+                  fallback: Optional[ProcessingStage] = None) -> None:
         """Append a stage to the pipeline.
 
+        A stage class is wrapped in a `LazyStage` and only instantiated
+        when the first payload reaches it.
+
         Args:
-            stage: Stage instance implementing `process`.
+            stage: Stage instance implementing `process`, or stage class.
+            retry: Optional retry policy for the stage.
+            breaker: Optional circuit breaker guarding the stage.
+            fallback: Optional backup stage run on failure.
         """
+        if isinstance(stage, type):
+            stage = LazyStage(stage)
         self.stages.append(stage)
+        self.policies.append(StagePolicy(retry, breaker, fallback))
+
+    def run_stages(self, data: Any) -> Any:
+        """Run data through every stage, recovering through fallbacks.
+
+        A stage whose circuit is open is skipped straight to its fallback
+        without paying for the failing call. Otherwise failures are retried
+        per policy, then handed to the fallback if one is registered.
+
+        Args:
+            data: Input payload for the first stage.
+
+        Returns:
+            Final output, or None if a stage failed without a fallback.
+        """
+        for i, stage in enumerate(self.stages):
+            policy = self.policies[i]
+            try:
+                data = self._run_stage(stage, policy, data)
+            except StageError as e:
+                data = self._recover(i, policy, data, e)
+                if data is _FAILED:
+                    return None
+        return data
+
+    def _recover(self, i: int, policy: StagePolicy, data: Any,
+                 error: StageError) -> Any:
+        """Hand a payload that failed a stage to the stage's fallback.
+
+        Args:
+            i: Index of the failed stage, for messages.
+            policy: Resilience settings of the stage.
+            data: Input payload of the stage.
+            error: Error raised by `_run_stage`.
+
+        Returns:
+            Output of the fallback, or `_FAILED` if there is none or it
+            failed too.
+        """
+        if isinstance(error, CircuitOpenError):
+            self._count("short_circuits")
+            if policy.fallback is None:
+                return _FAILED
+            try:
+                data = policy.fallback.process(data)
+            except StageError:
+                return _FAILED
+            self._count("fallbacks")
+            return data
+        print(f"Error detected in Stage {i+1}: {error}")
+        if policy.fallback is None:
+            print("Recovery failed: No backup processor registered")
+            return _FAILED
+        print("Recovery initiated: Switching to backup processor")
+        try:
+            data = policy.fallback.process(data)
+        except StageError as e:
+            print(f"Recovery failed: {e}")
+            return _FAILED
+        self._count("fallbacks")
+        print("Recovery successful: Pipeline restored, "
+              "processing resumed")
+        return data
+
+    def _run_stage(self, stage: ProcessingStage, policy: StagePolicy,
+                   data: Any) -> Any:
+        """Call one stage under its retry policy and circuit breaker.
+
+        Args:
+            stage: Stage to call.
+            policy: Resilience settings of the stage.
+            data: Input payload for the stage.
+
+        Returns:
+            Output of the stage.
+
+        Raises:
+            CircuitOpenError: The circuit of the stage is open.
+            StageError: The stage failed on every allowed attempt.
+        """
+        breaker = policy.breaker
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpenError("Circuit open")
+        retry = policy.retry
+        attempt = 1
+        while True:
+            try:
+                result = stage.process(data)
+            except StageError as e:
+                if (attempt >= retry.attempts
+                        or not isinstance(e, retry.retry_on)):
+                    self._count("failures")
+                    if breaker is not None and breaker.record_failure():
+                        self._count("trips")
+                    raise
+                time.sleep(retry.backoff(attempt - 1))
+                self._count("retries")
+                attempt += 1
+            except BaseException:
+                if breaker is not None:
+                    breaker.release()
+                raise
+            else:
+                if breaker is not None:
+                    breaker.record_success()
+                return result
+
+    def metrics_snapshot(self) -> Dict[str, int]:
+        """Return a consistent copy of the pipeline metrics."""
+        with self._lock:
+            return dict(self.metrics)
+
+    def process_batch(self, batch: List[Any]) -> List[Any]:
+        """Run a batch through the stages, one stage at a time.
+
+        Every stage handles the whole batch before the next stage starts,
+        so its code stays hot and the per-stage bookkeeping is paid once
+        per batch. Batches that are too large lose this advantage again
+        as intermediate results pile up, which is what
+        `BatchSizeController` tunes for. Resilience works per payload: a
+        failing payload is retried, recovered or dropped on its own.
+
+        Args:
+            batch: Payloads to process.
+
+        Returns:
+            Outputs in the order of `batch`; None for payloads that
+            failed without a fallback.
+        """
+        outputs = list(batch)
+        failed = set()
+        run_stage = self._run_stage
+        for i, stage in enumerate(self.stages):
+            policy = self.policies[i]
+            for index, data in enumerate(outputs):
+                if index in failed:
+                    continue
+                try:
+                    outputs[index] = run_stage(stage, policy, data)
+                except StageError as e:
+                    data = self._recover(i, policy, data, e)
+                    if data is _FAILED:
+                        failed.add(index)
+                        data = None
+                    outputs[index] = data
+        return outputs
+
+    def process_feed(self, feed: Iterable[Any], checkpoint: CheckpointStore,
+                     interval: int = 100) -> Iterator[Any]:
+        """Process a long feed of payloads, checkpointing progress.
+
+        Every `interval` payloads the input offset and pipeline metrics
+        are saved. On restart the last checkpoint is restored and already
+        processed payloads are skipped, so `feed` must replay from the
+        beginning. A payload counts as done once the caller asked for the
+        next one. The checkpoint is cleared once the feed is exhausted,
+        so the next feed of this pipeline starts from its beginning.
+
+        Args:
+            feed: Iterable of payloads, replayed from the start.
+            checkpoint: Store holding the progress of this pipeline.
+            interval: Number of payloads between checkpoints.
+
+        Yields:
+            Output of the pipeline for each newly processed payload.
+
+        Raises:
+            ValueError: `interval` is below 1, or `checkpoint` holds the
+                progress of another pipeline, which is left untouched.
+        """
+        if interval < 1:
+            raise ValueError("interval must be at least 1")
+        offset = 0
+        state = checkpoint.load()
+        if state is not None:
+            owner = state.get("pipeline_id")
+            if owner != self.pipeline_id:
+                raise ValueError(f"Checkpoint {checkpoint.path} belongs to "
+                                 f"pipeline {owner}, not {self.pipeline_id}")
+            offset = state["offset"]
+            self._restore_state(state)
+
+        for data in itertools.islice(feed, offset, None):
+            yield self.run_stages(data)
+            offset += 1
+            if offset % interval == 0:
+                checkpoint.save(self._checkpoint_state(offset))
+        checkpoint.clear()
+
+    def _checkpoint_state(self, offset: int) -> Dict[str, Any]:
+        """Collect the resumable state of the pipeline.
+
+        Args:
+            offset: Number of feed payloads fully processed.
+
+        Returns:
+            JSON-serializable checkpoint state.
+        """
+        return {
+            "pipeline_id": self.pipeline_id,
+            "offset": offset,
+            "metrics": self.metrics_snapshot()
+        }
+
+    def _restore_state(self, state: Dict[str, Any]) -> None:
+        """Restore metrics from a checkpoint.
+
+        Args:
+            state: State previously built by `_checkpoint_state`.
+        """
+        with self._lock:
+            self.metrics.update(state.get("metrics", {}))
 
 
 class JSONAdapter(ProcessingPipeline):
@@ -361,18 +1019,9 @@ class JSONAdapter(ProcessingPipeline):
             data: Payload to process.
 
         Returns:
-            Final result string or None if recovery was triggered.
+            Final result string or None if the pipeline could not recover.
         """
-        for i, stage in enumerate(self.stages):
-            try:
-                data = stage.process(data)
-            except StageError as e:
-                print(f"Error detected in Stage {i+1}: {e}")
-                print("Recovery initiated: Switching to backup processor")
-                print("Recovery successful: Pipeline restored, "
-                      "processing resumed")
-                return None
-        return data
+        return self.run_stages(data)
 
 
 class CSVAdapter(ProcessingPipeline):
@@ -393,18 +1042,9 @@ class CSVAdapter(ProcessingPipeline):
             data: Payload to process.
 
         Returns:
-            Final result string or None if recovery was triggered.
+            Final result string or None if the pipeline could not recover.
         """
-        for i, stage in enumerate(self.stages):
-            try:
-                data = stage.process(data)
-            except StageError as e:
-                print(f"Error detected in Stage {i+1}: {e}")
-                print("Recovery initiated: Switching to backup processor")
-                print("Recovery successful: Pipeline restored, "
-                      "processing resumed")
-                return None
-        return data
+        return self.run_stages(data)
 
 
 class StreamAdapter(ProcessingPipeline):
@@ -425,18 +1065,9 @@ class StreamAdapter(ProcessingPipeline):
             data: Payload to process.
 
         Returns:
-            Final result string or None if recovery was triggered.
+            Final result string or None if the pipeline could not recover.
         """
-        for i, stage in enumerate(self.stages):
-            try:
-                data = stage.process(data)
-            except StageError as e:
-                print(f"Error detected in Stage {i+1}: {e}")
-                print("Recovery initiated: Switching to backup processor")
-                print("Recovery successful: Pipeline restored, "
-                      "processing resumed")
-                return None
-        return data
+        return self.run_stages(data)
 
 
 class NexusManager:
@@ -445,6 +1076,7 @@ class NexusManager:
     def __init__(self) -> None:
         """Initialize with empty pipeline collection."""
         self.pipelines: List[ProcessingPipeline] = []
+        self.batch_controllers: Dict[str, BatchSizeController] = {}
 
     def add_pipeline(self, pipeline: ProcessingPipeline) -> None:
         """Register a pipeline with the manager.
@@ -464,14 +1096,65 @@ class NexusManager:
         Returns:
             Pipeline output or None if a stage triggered recovery.
         """
+        return self.get_pipeline(p_id).process(data)
+
+    def process_records(self, p_id: str,
+                        records: Iterable[Any]) -> Iterator[Any]:
+        """Dispatch records to a pipeline in adaptively sized batches.
+
+        Each batch runs through `ProcessingPipeline.process_batch`. The
+        batch size of each pipeline is tuned by its `BatchSizeController`
+        (created with defaults on first use; see `batch_controllers`)
+        from the measured latency and throughput of every batch.
+
+        Args:
+            p_id: Identifier of the pipeline to execute.
+            records: Payloads to process, consumed lazily.
+
+        Yields:
+            Pipeline output for each record, in order.
+        """
+        pipeline = self.get_pipeline(p_id)
+        controller = self.batch_controllers.get(p_id)
+        if controller is None:
+            controller = BatchSizeController()
+            self.batch_controllers[p_id] = controller
+        records = iter(records)
+        while True:
+            batch = list(itertools.islice(records, controller.size))
+            if not batch:
+                return
+            start = time.perf_counter()
+            outputs = pipeline.process_batch(batch)
+            controller.record(len(batch), time.perf_counter() - start)
+            yield from outputs
+
+    def batch_metrics(self) -> Dict[str, Dict[str, float]]:
+        """Report the batch sizing decisions of every pipeline.
+
+        Returns:
+            Dictionary mapping pipeline id to controller metrics.
+        """
+        return {p_id: dict(controller.metrics)
+                for p_id, controller in self.batch_controllers.items()}
+
+    def get_pipeline(self, p_id: str) -> ProcessingPipeline:
+        """Return the registered pipeline with the given id.
+
+        Args:
+            p_id: Identifier of the pipeline.
+
+        Returns:
+            The matching pipeline.
+
+        Raises:
+            NotFoundPipeline: No pipeline is registered under `p_id`.
+        """
         try:
-            pipeline = next(p for p in self.pipelines
-                            if p_id == p.pipeline_id)
-            result = pipeline.process(data)
+            return next(p for p in self.pipelines if p_id == p.pipeline_id)
         except StopIteration:
             err_msg = "Error: Pipeline not found"
             raise NotFoundPipeline(err_msg)
-        return result
 
 
 def main() -> None:
@@ -486,7 +1169,9 @@ def main() -> None:
     print("Stage 1: Input validation and parsing")
     print("Stage 2: Data transformation and enrichment")
     print("Stage 3: Output formatting and delivery\n")
-    stages = [InputStage(), TransformStage(), OutputStage()]
+    stages = [LazyStage(InputStage), LazyStage(TransformStage),
+              LazyStage(OutputStage)]
+    backups = [None, LazyStage(PassthroughStage), None]
 
     # Initializes Pipelines
     line_ids = ["JSON_001", "CSV_001", "Stream_001"]
@@ -496,8 +1181,9 @@ def main() -> None:
     pipelines = [json_pipeline, csv_pipeline, stream_pipeline]
 
     for pipeline in pipelines:
-        for stage in stages:
-            pipeline.add_stage(stage)
+        for stage, backup in zip(stages, backups):
+            pipeline.add_stage(stage, breaker=CircuitBreaker(),
+                               fallback=backup)
         manager.add_pipeline(pipeline)
 
     print("=== Multi-Format Data Processing ===\n")
@@ -0,0 +1,289 @@
+"""Tests for the Nexus pipeline stages, resilience and batching."""
+
+import threading
+
+import pytest
+
+from nexus_pipeline import (BatchSizeController, CheckpointStore,
+                            CircuitBreaker, InputStage, JSONAdapter,
+                            LazyStage, NexusManager, NotFoundPipeline,
+                            OutputStage,
+                            PassthroughStage, ProcessingStage, RetryPolicy,
+                            StageError, TransformStage, TransformStageError)
+
+READING = {"sensor": "temp", "value": 23.5, "unit": "C"}
+BAD_READING = {"sensor": "temp", "value": "missing", "unit": "C"}
+
+
+class FailingStage:
+    """Stage failing a fixed number of times before succeeding."""
+
+    def __init__(self, failures: int = 10 ** 9) -> None:
+        self.failures = failures
+        self.calls = 0
+
+    def process(self, data):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise TransformStageError("bad")
+        return data
+
+
+def json_pipeline(**policy) -> JSONAdapter:
+    pipeline = JSONAdapter("JSON_TEST")
+    pipeline.add_stage(InputStage)
+    pipeline.add_stage(TransformStage, **policy)
+    pipeline.add_stage(OutputStage)
+    return pipeline
+
+
+def test_pipeline_processes_reading():
+    output = json_pipeline().process(READING)
+    assert output == "Processed temperature reading: 23.5°C (Normal range)"
+
+
+def test_failure_without_fallback_returns_none(capsys):
+    assert json_pipeline().process(BAD_READING) is None
+    assert "No backup processor registered" in capsys.readouterr().out
+
+
+def test_retry_recovers_transient_failure():
+    pipeline = JSONAdapter("RETRY")
+    stage = FailingStage(failures=2)
+    pipeline.add_stage(stage, retry=RetryPolicy(attempts=3, base_delay=0))
+    assert pipeline.process("payload") == "payload"
+    assert stage.calls == 3
+    assert pipeline.metrics["retries"] == 2
+    assert pipeline.metrics["failures"] == 0
+
+
+def test_retry_policy_rejects_zero_attempts():
+    with pytest.raises(ValueError):
+        RetryPolicy(attempts=0)
+
+
+def test_circuit_opens_and_short_circuits():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    stage = FailingStage()
+    pipeline = JSONAdapter("BREAKER")
+    pipeline.add_stage(stage, breaker=breaker, fallback=PassthroughStage())
+    for _ in range(4):
+        assert pipeline.process("payload") == "payload"
+    assert breaker.state == CircuitBreaker.OPEN
+    assert stage.calls == 2
+    assert pipeline.metrics["trips"] == 1
+    assert pipeline.metrics["short_circuits"] == 2
+    assert pipeline.metrics["fallbacks"] == 4
+
+
+def test_circuit_half_open_trial_closes_on_success():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    assert breaker.record_failure()
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_circuit_admits_a_single_trial():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+    assert breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_callers_fall_back_while_the_trial_runs():
+    entered, proceed = threading.Event(), threading.Event()
+
+    class SlowStage:
+        def process(self, data):
+            entered.set()
+            proceed.wait(5)
+            return "trial"
+
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    pipeline = JSONAdapter("TRIAL")
+    pipeline.add_stage(SlowStage(), breaker=breaker,
+                       fallback=PassthroughStage())
+    results = []
+    trial = threading.Thread(
+        target=lambda: results.append(pipeline.process("payload")))
+    trial.start()
+    assert entered.wait(5)
+    assert pipeline.process("other") == "other"
+    proceed.set()
+    trial.join(5)
+    assert results == ["trial"]
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert pipeline.metrics["short_circuits"] == 1
+
+
+def test_open_circuit_with_failing_fallback_returns_none(capsys):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    pipeline = JSONAdapter("FALLBACK")
+    pipeline.add_stage(FailingStage(), breaker=breaker,
+                       fallback=FailingStage())
+    assert pipeline.process("payload") is None
+    assert pipeline.process("payload") is None
+    assert pipeline.metrics["short_circuits"] == 1
+    assert pipeline.metrics["fallbacks"] == 0
+    capsys.readouterr()
+
+
+def test_metrics_are_consistent_under_threads(capsys):
+    pipeline = JSONAdapter("THREADS")
+    pipeline.add_stage(FailingStage(), fallback=PassthroughStage())
+
+    def run():
+        for _ in range(200):
+            pipeline.process("payload")
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    capsys.readouterr()
+    assert pipeline.metrics_snapshot()["fallbacks"] == 800
+    assert pipeline.metrics_snapshot()["failures"] == 800
+
+
+def test_stage_errors_share_a_base_class():
+    assert issubclass(TransformStageError, StageError)
+
+
+def test_checkpoint_store_round_trip(tmp_path):
+    store = CheckpointStore(str(tmp_path / "state.json"))
+    assert store.load() is None
+    store.save({"offset": 3})
+    assert store.load() == {"offset": 3}
+    store.clear()
+    assert store.load() is None
+    store.clear()
+
+
+def test_feed_resumes_after_interruption(tmp_path):
+    store = CheckpointStore(str(tmp_path / "state.json"))
+    feed = [dict(READING, value=20 + i) for i in range(10)]
+    first = json_pipeline().process_feed(feed, store, interval=3)
+    done = [next(first) for _ in range(7)]
+    first.close()
+    assert store.load()["offset"] == 6
+
+    rest = list(json_pipeline().process_feed(feed, store, interval=3))
+    assert len(done) == 7 and len(rest) == 4
+    assert rest[0] == done[6]
+
+
+def test_completed_feed_clears_checkpoint(tmp_path):
+    store = CheckpointStore(str(tmp_path / "state.json"))
+    feed = [READING] * 5
+    assert len(list(json_pipeline().process_feed(feed, store, 2))) == 5
+    assert store.load() is None
+    assert len(list(json_pipeline().process_feed(feed, store, 2))) == 5
+
+
+def test_feed_keeps_checkpoint_of_other_pipeline(tmp_path):
+    store = CheckpointStore(str(tmp_path / "state.json"))
+    state = {"pipeline_id": "OTHER", "offset": 5, "metrics": {}}
+    store.save(state)
+    with pytest.raises(ValueError, match="OTHER"):
+        list(json_pipeline().process_feed([READING] * 3, store, 1))
+    assert store.load() == state
+
+
+def test_feed_rejects_bad_interval(tmp_path):
+    store = CheckpointStore(str(tmp_path / "state.json"))
+    with pytest.raises(ValueError):
+        list(json_pipeline().process_feed([READING], store, interval=0))
+
+
+def test_lazy_stage_builds_once_and_binds_process():
+    built = []
+
+    def factory():
+        built.append(1)
+        return PassthroughStage()
+
+    stage = LazyStage(factory)
+    assert not built
+    assert stage.process(1) == 1
+    assert stage.process(2) == 2
+    assert built == [1]
+    assert stage.process == stage.stage.process
+
+
+def test_add_stage_defers_construction_of_classes():
+    pipeline = json_pipeline()
+    assert all(isinstance(stage, LazyStage) for stage in pipeline.stages)
+    assert all(stage._stage is None for stage in pipeline.stages)
+
+
+def test_processing_stage_is_a_typing_protocol():
+    assert getattr(ProcessingStage, "_is_protocol", False)
+
+
+def test_process_batch_matches_per_payload_runs(capsys):
+    batch = [READING, BAD_READING, dict(READING, value=40)]
+    expected = [json_pipeline().process(data) for data in batch]
+    assert json_pipeline().process_batch(batch) == expected
+    assert expected[1] is None
+    capsys.readouterr()
+
+
+def test_process_batch_isolates_failures_and_uses_fallback(capsys):
+    pipeline = json_pipeline(fallback=PassthroughStage())
+    outputs = pipeline.process_batch([READING, BAD_READING, 42])
+    assert outputs[0].startswith("Processed temperature")
+    assert outputs[1] == "Processed sensor reading: temp"
+    assert outputs[2] is None
+    assert pipeline.metrics["failures"] == 2
+    assert pipeline.metrics["fallbacks"] == 1
+    capsys.readouterr()
+
+
+def test_controller_grows_while_throughput_holds():
+    controller = BatchSizeController(initial_size=16, step=8)
+    assert controller.record(16, 0.001) == 24
+    assert controller.record(24, 0.0015) == 32
+    assert controller.metrics["increases"] == 2
+
+
+def test_controller_steps_back_when_throughput_drops():
+    controller = BatchSizeController(initial_size=16, step=8)
+    controller.record(16, 0.001)
+    assert controller.record(24, 0.003) == 16
+    assert controller.metrics["decreases"] == 1
+
+
+def test_controller_backs_off_on_slow_batches():
+    controller = BatchSizeController(target_latency=0.01, initial_size=64)
+    assert controller.record(64, 0.02) == 32
+    assert controller.record(10, 0.001) == 32
+
+
+def test_controller_validates_bounds():
+    with pytest.raises(ValueError):
+        BatchSizeController(initial_size=0)
+    with pytest.raises(ValueError):
+        BatchSizeController(backoff=1.0)
+
+
+def test_manager_process_records_keeps_order():
+    manager = NexusManager()
+    manager.add_pipeline(json_pipeline())
+    records = [dict(READING, value=value) for value in range(100)]
+    outputs = list(manager.process_records("JSON_TEST", records))
+    assert outputs == [json_pipeline().process(data) for data in records]
+    metrics = manager.batch_metrics()["JSON_TEST"]
+    assert metrics["records"] == 100
+
+
+def test_manager_raises_for_unknown_pipeline():
+    with pytest.raises(NotFoundPipeline):
+        NexusManager().process_data("MISSING", READING)
@@ -0,0 +1,110 @@
+"""Tests for the priority-lane pipeline scheduler."""
+
+import threading
+
+import pytest
+
+from nexus_pipeline import JSONAdapter, NexusManager, NotFoundPipeline
+from nexus_scheduler import PipelineScheduler
+
+
+class RecordingStage:
+    """Stage logging every payload it processes."""
+
+    def __init__(self, log, lock) -> None:
+        self.log = log
+        self.lock = lock
+
+    def process(self, data):
+        if data == "boom":
+            raise RuntimeError("boom")
+        with self.lock:
+            self.log.append(data)
+        return data
+
+
+def scheduler_for(*p_ids, workers=1):
+    log, lock = [], threading.Lock()
+    manager = NexusManager()
+    for p_id in p_ids:
+        pipeline = JSONAdapter(p_id)
+        pipeline.add_stage(RecordingStage(log, lock))
+        manager.add_pipeline(pipeline)
+    return PipelineScheduler(manager, workers=workers), log
+
+
+def test_critical_lane_is_served_first():
+    scheduler, log = scheduler_for("BULK", "LIVE")
+    scheduler.register("BULK", PipelineScheduler.BULK)
+    scheduler.register("LIVE", PipelineScheduler.CRITICAL)
+    futures = [scheduler.submit("BULK", f"b{i}") for i in range(3)]
+    futures += [scheduler.submit("LIVE", f"l{i}") for i in range(3)]
+    with scheduler:
+        pass
+    assert log == ["l0", "l1", "l2", "b0", "b1", "b2"]
+    assert [future.result() for future in futures] == [
+        "b0", "b1", "b2", "l0", "l1", "l2"]
+
+
+def test_weights_share_workers_within_a_class():
+    scheduler, log = scheduler_for("HEAVY", "LIGHT")
+    scheduler.register("HEAVY", weight=2.0)
+    scheduler.register("LIGHT", weight=1.0)
+    for i in range(6):
+        scheduler.submit("HEAVY", f"h{i}")
+        scheduler.submit("LIGHT", f"l{i}")
+    with scheduler:
+        pass
+    first = log[:6]
+    assert sum(item.startswith("h") for item in first) == 4
+
+
+def test_serial_lane_keeps_submission_order():
+    scheduler, log = scheduler_for("ORDERED", workers=4)
+    scheduler.register("ORDERED", concurrency=1)
+    with scheduler:
+        futures = [scheduler.submit("ORDERED", i) for i in range(50)]
+    assert log == list(range(50))
+    assert [future.result() for future in futures] == list(range(50))
+    stats = scheduler.lane_stats()["ORDERED"]
+    assert stats["submitted"] == stats["completed"] == 50
+    assert stats["queued"] == 0
+
+
+def test_stage_exceptions_reach_the_future():
+    scheduler, _ = scheduler_for("P")
+    scheduler.register("P")
+    with scheduler:
+        future = scheduler.submit("P", "boom")
+        with pytest.raises(RuntimeError):
+            future.result(timeout=5)
+
+
+def test_scheduler_rejects_bad_usage():
+    scheduler, _ = scheduler_for("P")
+    with pytest.raises(ValueError):
+        PipelineScheduler(scheduler.manager, workers=0)
+    with pytest.raises(ValueError):
+        scheduler.register("P", weight=0)
+    with pytest.raises(NotFoundPipeline):
+        scheduler.register("MISSING")
+    with pytest.raises(KeyError):
+        scheduler.submit("P", 1)
+    scheduler.register("P")
+    scheduler.start()
+    scheduler.shutdown()
+    with pytest.raises(RuntimeError):
+        scheduler.submit("P", 1)
+
+
+def test_duplicate_lane_keeps_its_queue():
+    scheduler, log = scheduler_for("P")
+    scheduler.register("P", PipelineScheduler.BULK)
+    future = scheduler.submit("P", "queued")
+    with pytest.raises(ValueError):
+        scheduler.register("P", PipelineScheduler.CRITICAL)
+    with scheduler:
+        pass
+    assert future.result(timeout=5) == "queued"
+    assert log == ["queued"]
+    assert scheduler.lane_stats()["P"]["priority"] == PipelineScheduler.BULK